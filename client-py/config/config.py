@@ -21,4 +21,65 @@ class Config:
         self.albion_executable = "Albion-Online.exe"
         self.albion_path = "C:\\Program Files (x86)\\AlbionOnline"
 
+        # Configurações de log
+        self.log_async = True  # Escreve os logs em uma thread em segundo plano
+        self.log_json_path = None  # Arquivo JSON-lines rotativo (None desativa)
+        self.log_detection_rate = 10.0  # Logs de detecção por segundo, por tipo (0 desativa o limite)
+        self.photon_stats_interval = 0.0  # Intervalo, em segundos, do relatório de tráfego Photon por (tipo, código) (0 desativa)
 
+        # Journal binário de detecções (None desativa)
+        self.journal_path = None
+
+        # Banco SQLite local com o histórico de detecções (None desativa)
+        self.database_path = None
+
+        # Cache local dos catálogos de itens e mobs do servidor (None desativa)
+        self.catalog_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "catalog")
+
+        # Intervalo, em segundos, em que as posições são agrupadas por entidade
+        self.coalesce_tick = 0.05
+
+        # Capacidade da fila do barramento dos consumidores de estado (eventos excedentes são descartados)
+        self.world_queue_size = 50000
+
+        # Intervalo, em segundos, sem eventos de combate até uma luta ser encerrada
+        self.fight_gap = 10.0
+
+        # Agregação de mercado: duração das janelas e intervalo entre lotes delta, em segundos
+        self.market_window = 300.0
+        self.market_flush_interval = 5.0
+
+        # Envio das detecções ao servidor em lotes gzip: intervalo máximo entre lotes em segundos (None desativa),
+        # detecções por lote e envios simultâneos
+        self.upload_interval = 1.0
+        self.upload_batch_size = 2000
+        self.upload_concurrency = 4
+
+        # Tipos de detecção não enviados ao servidor por já serem resumidos por um agregador
+        # ("market" é substituído pelos lotes "market_delta" do MarketAggregator)
+        self.upload_exclude_kinds = ("market",)
+
+        # Sessão de streaming para dados ao vivo: intervalo entre lotes em segundos (None desativa).
+        # Quando ativa, substitui o envio em lotes acima (sem spool)
+        self.stream_interval = None
+
+        # Spool em disco dos lotes não enviados (servidor lento ou fora do ar) e seu tamanho máximo (None desativa)
+        self.upload_spool_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "spool")
+        self.upload_spool_bytes = 256 * 1024 * 1024
+
+        # Dicionário de compressão dos lotes, gerado por scripts/train_dictionary.py (None ou arquivo ausente usa gzip)
+        self.upload_dictionary_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "upload.zdict")
+
+        # Métricas do pipeline de captura: intervalo, em segundos, da linha de resumo no log (None desativa as métricas)
+        # e endpoint local no formato Prometheus ("127.0.0.1:9108", "unix:/tmp/tanakai-metrics.sock" ou None)
+        self.metrics_interval = 60.0
+        self.metrics_address = None
+
+        # Diretório dos perfis de CPU (SIGUSR1) e memória (SIGUSR2) gravados sob demanda (None desativa)
+        self.profile_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "profiles")
+
+        # Cache da verificação das bibliotecas de captura, refeita só quando o interpretador ou as bibliotecas mudam (None desativa)
+        self.capability_cache_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "capabilities.json")
+
+        # Antecedência, em segundos, do aviso de respawn de mobs e recursos (requer catalog_path)
+        self.respawn_warn_before = 30.0
@@ -3,17 +3,31 @@ Módulo core - Componentes centrais do cliente Tanakai.
 """
 
 from .base import BaseComponent
-from .logger import Logger
+from .logger import Logger, configure_logging, shutdown_logging
 from .manager import ComponentManager
 from .handlers import SignalHandler
+from .profiler import Profiler
+from .bus import EventBus
+from .metrics import MetricsRegistry, MetricsReporter
+from .guard import ProcessorGuard
+from .registry import ProcessorRegistry, ProcessorEntry
 from .sniffer import BaseSniffer, UDPSniffer, ScapySniffer
 from .system import SystemUtils, check_and_prompt_npcap
 
 __all__ = [
     "BaseComponent",
     "Logger",
+    "configure_logging",
+    "shutdown_logging",
     "ComponentManager",
     "SignalHandler",
+    "Profiler",
+    "EventBus",
+    "MetricsRegistry",
+    "MetricsReporter",
+    "ProcessorGuard",
+    "ProcessorRegistry",
+    "ProcessorEntry",
     "BaseSniffer",
     "UDPSniffer",
     "ScapySniffer",
@@ -7,6 +7,10 @@ class BaseComponent(ABC):
     Fornece funcionalidades comuns como logging e gerenciamento de estado.
     """
     
+    # Componentes cujo start()/stop() precisa rodar na thread principal (ex.: registro de sinais);
+    # os demais são iniciados e parados pelo ComponentManager em threads próprias
+    requires_main_thread = False
+    
     def __init__(self, name: str):
         """
         Inicializa o componente base.
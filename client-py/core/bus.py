@@ -0,0 +1,284 @@
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+
+from .base import BaseComponent
+
+
+class SubscriberStats:
+    """
+    Contadores de execução de um assinante do barramento.
+    """
+
+    __slots__ = ("calls", "errors", "total_time", "max_time")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Retorna os contadores em formato de dicionário.
+
+        Returns:
+            Dict[str, Any]: Chamadas, erros e tempos total/médio/máximo em segundos
+        """
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "total_time": self.total_time,
+            "mean_time": self.total_time / self.calls if self.calls else 0.0,
+            "max_time": self.max_time
+        }
+
+
+class Subscriber(NamedTuple):
+    """
+    Assinante registrado no barramento.
+    """
+    name: str
+    kind: str
+    handler: Callable
+    stats: SubscriberStats
+
+
+class EventBus(BaseComponent):
+    """
+    Barramento de eventos de detecção de longa duração.
+
+    Os assinantes são registrados por tipo de detecção (o campo "type" do resultado)
+    e executados na ordem de registro. Assinantes do tipo "*" recebem todos os eventos
+    e os do tipo EventBus.UNHANDLED recebem apenas os eventos sem assinante específico.
+
+    O método publish tem a mesma assinatura do callback dos sniffers, então pode ser
+    passado diretamente como callback. Com async_dispatch=True os eventos são
+    enfileirados e entregues por uma thread de trabalho, liberando a thread de captura;
+    é o modo a usar quando várias threads publicam no mesmo barramento, pois no modo
+    síncrono cada assinante roda na thread de quem publicou.
+    """
+
+    ALL = "*"
+    UNHANDLED = "__unhandled__"
+
+    def __init__(self, async_dispatch: bool = False, queue_size: int = 10000, name: str = "EventBus"):
+        """
+        Inicializa o barramento.
+
+        Args:
+            async_dispatch (bool): Entrega os eventos em uma thread de trabalho
+            queue_size (int): Capacidade da fila no modo assíncrono (eventos excedentes são descartados)
+            name (str): Nome do componente
+        """
+        super().__init__(name)
+        self.async_dispatch = async_dispatch
+        self.published = 0
+        self.dropped = 0
+
+        # Protege os contadores: publish pode ser chamado por várias threads
+        self._count_lock = threading.Lock()
+
+        # Tabela tipo -> assinantes, trocada por inteiro a cada alteração (copy-on-write)
+        self._lock = threading.Lock()
+        self._routes: Dict[str, Tuple[Subscriber, ...]] = {}
+
+        self._queue: "queue.Queue[Optional[Tuple]]" = queue.Queue(maxsize=queue_size)
+        self._worker = None
+
+        # No modo assíncrono, serializa a entrega da thread de trabalho e as entregas
+        # síncronas feitas depois do stop(): os assinantes nunca rodam em paralelo
+        self._dispatch_lock = threading.RLock()
+
+    def start(self) -> bool:
+        """
+        Inicia o barramento (e a thread de trabalho no modo assíncrono).
+
+        Returns:
+            bool: True se iniciado com sucesso
+        """
+        if self._running:
+            return True
+
+        self._running = True
+        if self.async_dispatch:
+            self._worker = threading.Thread(target=self._worker_loop, name=f"{self.name}-worker", daemon=True)
+            self._worker.start()
+        return True
+
+    def stop(self) -> bool:
+        """
+        Para o barramento, entregando os eventos que ainda estão na fila.
+        A thread de trabalho só deixa de receber eventos depois de esvaziar a fila;
+        até lá, o que for publicado continua sendo enfileirado, e depois disso é entregue
+        de forma síncrona, na ordem, sem rodar ao mesmo tempo que a thread de trabalho.
+
+        Returns:
+            bool: True se parado com sucesso
+        """
+        if not self._running:
+            return True
+
+        self._running = False
+        worker = self._worker
+        if worker is not None:
+            self._queue.put(None)
+            worker.join(timeout=2.0)
+            if worker.is_alive():
+                self.logger.warning(f"Barramento '{self.name}' ainda entregando {self._queue.qsize()} eventos da fila")
+        return True
+
+    def subscribe(self, kind: str, handler: Callable, name: Optional[str] = None) -> str:
+        """
+        Registra um assinante para um tipo de detecção.
+
+        Args:
+            kind (str): Tipo de detecção ("player", "item", ...), "*" ou EventBus.UNHANDLED
+            handler (callable): Função chamada com (processor_name, result, data, addr)
+            name (str, optional): Nome do assinante (padrão: nome da função)
+
+        Returns:
+            str: Nome com que o assinante foi registrado
+        """
+        name = name or getattr(handler, "__qualname__", None) or repr(handler)
+        subscriber = Subscriber(name, kind, handler, SubscriberStats())
+
+        with self._lock:
+            routes = dict(self._routes)
+            routes[kind] = routes.get(kind, ()) + (subscriber,)
+            self._routes = routes
+
+        self.logger.info(f"Assinante '{name}' registrado para '{kind}'")
+        return name
+
+    def unsubscribe(self, name: str, kind: Optional[str] = None) -> bool:
+        """
+        Remove um assinante.
+
+        Args:
+            name (str): Nome do assinante
+            kind (str, optional): Remove apenas deste tipo de detecção
+
+        Returns:
+            bool: True se algum assinante foi removido
+        """
+        removed = False
+        with self._lock:
+            routes = {}
+            for route_kind, subscribers in self._routes.items():
+                kept = tuple(s for s in subscribers if s.name != name or (kind is not None and route_kind != kind))
+                removed = removed or len(kept) != len(subscribers)
+                if kept:
+                    routes[route_kind] = kept
+            self._routes = routes
+        return removed
+
+    def publish(self, processor_name: str, result: Dict[str, Any], data: bytes, addr: tuple) -> None:
+        """
+        Publica uma detecção no barramento.
+
+        Args:
+            processor_name (str): Nome do processador que identificou o pacote
+            result (dict): Resultado do processamento
+            data (bytes): Dados brutos do pacote
+            addr (tuple): Endereço de origem (IP, porta)
+        """
+        with self._count_lock:
+            self.published += 1
+            queued = self._worker is not None
+            if queued:
+                try:
+                    self._queue.put_nowait((processor_name, result, data, addr))
+                except queue.Full:
+                    self.dropped += 1
+        if queued:
+            return
+
+        if self.async_dispatch:
+            with self._dispatch_lock:
+                self._dispatch(processor_name, result, data, addr)
+        else:
+            self._dispatch(processor_name, result, data, addr)
+
+    def get_subscriber_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Retorna a latência e os contadores de cada assinante.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Chave "tipo:nome" -> estatísticas do assinante
+        """
+        return {
+            f"{subscriber.kind}:{subscriber.name}": subscriber.stats.as_dict()
+            for subscribers in self._routes.values()
+            for subscriber in subscribers
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retorna as estatísticas gerais do barramento.
+
+        Returns:
+            Dict[str, Any]: Eventos publicados, descartados, fila e assinantes
+        """
+        return {
+            "published": self.published,
+            "dropped": self.dropped,
+            "queued": self._queue.qsize(),
+            "subscribers": self.get_subscriber_stats()
+        }
+
+    def _dispatch(self, processor_name: str, result: Dict[str, Any], data: bytes, addr: tuple) -> None:
+        """
+        Entrega um evento aos assinantes do seu tipo e aos assinantes de todos os eventos.
+        """
+        routes = self._routes
+        subscribers = routes.get(result.get("type"))
+        if subscribers is None:
+            subscribers = routes.get(self.UNHANDLED, ())
+        wildcard = routes.get(self.ALL)
+        if wildcard:
+            subscribers = wildcard + subscribers
+
+        for subscriber in subscribers:
+            stats = subscriber.stats
+            start = time.perf_counter()
+            try:
+                subscriber.handler(processor_name, result, data, addr)
+            except Exception as e:
+                stats.errors += 1
+                self.logger.error(f"Erro no assinante '{subscriber.name}': {str(e)}")
+            elapsed = time.perf_counter() - start
+            stats.calls += 1
+            stats.total_time += elapsed
+            if elapsed > stats.max_time:
+                stats.max_time = elapsed
+
+    def _worker_loop(self) -> None:
+        """
+        Loop da thread de trabalho do modo assíncrono.
+        """
+        while True:
+            event = self._queue.get()
+            if event is not None:
+                with self._dispatch_lock:
+                    self._dispatch(*event)
+                continue
+
+            # Fim: entrega o que foi enfileirado depois do sinal de parada e passa ao modo
+            # síncrono; as entregas síncronas esperam o lock até a fila terminar
+            with self._dispatch_lock:
+                with self._count_lock:
+                    leftovers = []
+                    while True:
+                        try:
+                            leftover = self._queue.get_nowait()
+                        except queue.Empty:
+                            break
+                        if leftover is not None:
+                            leftovers.append(leftover)
+                    if self._worker is threading.current_thread():
+                        self._worker = None
+                for leftover in leftovers:
+                    self._dispatch(*leftover)
+            break
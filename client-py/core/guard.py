@@ -0,0 +1,252 @@
+import time
+from array import array
+from typing import Dict, Any, Optional
+
+
+class ProcessorGuard:
+    """
+    Mede o tempo de execução de um processador de pacotes e o desativa
+    automaticamente (circuit breaker) quando ele estoura o orçamento de tempo
+    ou a taxa de erros permitida.
+
+    Estados:
+        closed: o processador roda normalmente
+        open: o processador é ignorado até o fim do período de espera
+        half_open: o processador roda novamente em caráter de teste
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    # Valores padrão
+    DEFAULT_BUDGET = 0.002        # p99 máximo por chamada (segundos)
+    DEFAULT_ERROR_RATE = 0.5      # Fração máxima de chamadas com erro
+    DEFAULT_WINDOW = 1024         # Amostras de tempo mantidas para o p99
+    DEFAULT_CHECK_EVERY = 256     # Chamadas entre cada avaliação
+    DEFAULT_COOLDOWN = 10.0       # Espera inicial antes do half-open (segundos)
+    DEFAULT_MAX_COOLDOWN = 300.0  # Espera máxima após falhas repetidas (segundos)
+    DEFAULT_HALF_OPEN_CALLS = 32  # Chamadas de teste no estado half-open
+
+    def __init__(
+        self,
+        name: str,
+        budget: float = DEFAULT_BUDGET,
+        error_rate: float = DEFAULT_ERROR_RATE,
+        max_time: Optional[float] = None,
+        window: int = DEFAULT_WINDOW,
+        check_every: int = DEFAULT_CHECK_EVERY,
+        cooldown: float = DEFAULT_COOLDOWN,
+        max_cooldown: float = DEFAULT_MAX_COOLDOWN,
+        half_open_calls: int = DEFAULT_HALF_OPEN_CALLS
+    ):
+        """
+        Inicializa o guarda do processador.
+
+        Args:
+            name (str): Nome do processador protegido
+            budget (float): p99 máximo, em segundos, do tempo de execução
+            error_rate (float): Fração máxima de chamadas que podem lançar exceção
+            max_time (float, optional): Tempo máximo de uma única chamada antes de desativar imediatamente
+            window (int): Quantidade de amostras de tempo usadas no cálculo do p99
+            check_every (int): Quantidade de chamadas entre cada avaliação dos limites
+            cooldown (float): Tempo, em segundos, que o processador fica desativado após desarmar
+            max_cooldown (float): Limite do tempo de espera, que dobra a cada falha no half-open
+            half_open_calls (int): Chamadas de teste necessárias para voltar ao estado normal
+        """
+        self.name = name
+        self.budget = budget
+        self.error_rate = error_rate
+        self.max_time = max_time
+        self.check_every = check_every
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.half_open_calls = half_open_calls
+
+        self.state = self.CLOSED
+        self.calls = 0
+        self.errors = 0
+        self.skipped = 0
+        self.total_time = 0.0
+        self.trips = 0
+        self.last_trip_reason: Optional[str] = None
+        self.last_trip_at: Optional[float] = None
+
+        # Buffer circular com os tempos mais recentes
+        self._samples = array('d', bytes(8 * window))
+        self._window = window
+        self._sample_index = 0
+        self._sample_count = 0
+
+        # Contadores do período de avaliação atual
+        self._period_calls = 0
+        self._period_errors = 0
+
+        self._current_cooldown = cooldown
+        self._open_until = 0.0
+
+    def allow(self) -> bool:
+        """
+        Indica se o processador pode ser executado agora.
+
+        Returns:
+            bool: True se a chamada deve acontecer, False se o processador está desativado
+        """
+        if self.state == self.CLOSED or self.state == self.HALF_OPEN:
+            return True
+
+        if time.monotonic() >= self._open_until:
+            # Fim da espera: libera chamadas de teste
+            self.state = self.HALF_OPEN
+            self._period_calls = 0
+            self._period_errors = 0
+            return True
+
+        self.skipped += 1
+        return False
+
+    def record(self, elapsed: float, error: bool = False) -> Optional[str]:
+        """
+        Registra o resultado de uma chamada e avalia os limites.
+
+        Args:
+            elapsed (float): Duração da chamada em segundos
+            error (bool): True se a chamada lançou exceção
+
+        Returns:
+            Optional[str]: Motivo do desarme se o processador acabou de ser desativado, ou None
+        """
+        self.calls += 1
+        self.total_time += elapsed
+        self._period_calls += 1
+
+        samples = self._samples
+        samples[self._sample_index] = elapsed
+        self._sample_index = (self._sample_index + 1) % self._window
+        if self._sample_count < self._window:
+            self._sample_count += 1
+
+        if error:
+            self.errors += 1
+            self._period_errors += 1
+            if self.state == self.HALF_OPEN:
+                return self._trip("erro durante o teste (half-open)")
+
+        if self.max_time is not None and elapsed > self.max_time:
+            return self._trip(f"chamada de {elapsed * 1000:.2f} ms excedeu o limite de {self.max_time * 1000:.2f} ms")
+
+        if self.state == self.HALF_OPEN:
+            if self._period_calls >= self.half_open_calls:
+                reason = self._evaluate(self._period_calls)
+                if reason:
+                    return self._trip(reason)
+                self.state = self.CLOSED
+                self._current_cooldown = self.cooldown
+                self._period_calls = 0
+                self._period_errors = 0
+            return None
+
+        if self._period_calls >= self.check_every:
+            reason = self._evaluate(self._sample_count)
+            self._period_calls = 0
+            self._period_errors = 0
+            if reason:
+                return self._trip(reason)
+
+        return None
+
+    def reset(self) -> None:
+        """
+        Reativa manualmente o processador e zera o tempo de espera.
+        """
+        self.state = self.CLOSED
+        self._current_cooldown = self.cooldown
+        self._period_calls = 0
+        self._period_errors = 0
+
+    def percentile(self, fraction: float, count: Optional[int] = None) -> float:
+        """
+        Calcula um percentil dos tempos mais recentes.
+
+        Args:
+            fraction (float): Percentil desejado entre 0 e 1 (ex: 0.99)
+            count (int, optional): Quantidade de amostras mais recentes consideradas
+
+        Returns:
+            float: Tempo em segundos (0.0 se não houver amostras)
+        """
+        count = self._sample_count if count is None else min(count, self._sample_count)
+        if count <= 0:
+            return 0.0
+
+        end = self._sample_index
+        if count <= end:
+            recent = self._samples[end - count:end].tolist()
+        else:
+            recent = self._samples[self._window - (count - end):].tolist() + self._samples[:end].tolist()
+
+        recent.sort()
+        return recent[min(count - 1, int(count * fraction))]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retorna as estatísticas do processador.
+
+        Returns:
+            Dict[str, Any]: Estado, contadores, tempos acumulado/médio/p99 e último desarme
+        """
+        return {
+            "name": self.name,
+            "state": self.state,
+            "calls": self.calls,
+            "errors": self.errors,
+            "skipped": self.skipped,
+            "total_time": self.total_time,
+            "mean_time": self.total_time / self.calls if self.calls else 0.0,
+            "p99_time": self.percentile(0.99),
+            "trips": self.trips,
+            "last_trip_reason": self.last_trip_reason,
+            "last_trip_at": self.last_trip_at
+        }
+
+    def _evaluate(self, sample_count: int) -> Optional[str]:
+        """
+        Verifica se o período atual violou o orçamento de tempo ou a taxa de erros.
+
+        Args:
+            sample_count (int): Amostras de tempo usadas no cálculo do p99
+
+        Returns:
+            Optional[str]: Motivo da violação ou None
+        """
+        if self._period_calls and self._period_errors / self._period_calls > self.error_rate:
+            return f"taxa de erros de {self._period_errors / self._period_calls:.0%} (limite {self.error_rate:.0%})"
+
+        p99 = self.percentile(0.99, sample_count)
+        if p99 > self.budget:
+            return f"p99 de {p99 * 1000:.3f} ms (orçamento {self.budget * 1000:.3f} ms)"
+
+        return None
+
+    def _trip(self, reason: str) -> str:
+        """
+        Desativa o processador até o fim do tempo de espera.
+
+        Args:
+            reason (str): Motivo do desarme
+
+        Returns:
+            str: O próprio motivo, para registro pelo chamador
+        """
+        if self.state == self.HALF_OPEN:
+            # Falhou no teste: aumenta a espera até o limite
+            self._current_cooldown = min(self._current_cooldown * 2, self.max_cooldown)
+
+        self.state = self.OPEN
+        self.trips += 1
+        self.last_trip_reason = reason
+        self.last_trip_at = time.time()
+        self._open_until = time.monotonic() + self._current_cooldown
+        self._period_calls = 0
+        self._period_errors = 0
+        return reason
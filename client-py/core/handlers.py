@@ -1,5 +1,6 @@
 import sys
 import signal
+import threading
 from .base import BaseComponent
 
 class SignalHandler(BaseComponent):
@@ -7,15 +8,21 @@ class SignalHandler(BaseComponent):
     Componente responsável por gerenciar sinais do sistema.
     """
     
-    def __init__(self, sniffer = None):
+    # signal.signal só pode ser chamado na thread principal
+    requires_main_thread = True
+    
+    def __init__(self, sniffer = None, profiler = None):
         """
         Inicializa o manipulador de sinais.
         
         Args:
             sniffer: Instância do sniffer a ser gerenciada
+            profiler: Profiler ligado/desligado por SIGUSR1 (CPU) e SIGUSR2 (memória), opcional
         """
         super().__init__("SignalHandler")
         self.sniffer = sniffer
+        self.profiler = profiler
+        self._reload_lock = threading.Lock()
     
     def start(self) -> bool:
         """
@@ -27,6 +34,15 @@ class SignalHandler(BaseComponent):
         try:
             signal.signal(signal.SIGINT, self.sniffer_handler)
             signal.signal(signal.SIGTERM, self.sniffer_handler)
+            
+            # SIGHUP recarrega os processadores sem parar a captura (indisponível no Windows)
+            if hasattr(signal, "SIGHUP"):
+                signal.signal(signal.SIGHUP, self.reload_handler)
+            
+            # SIGUSR1/SIGUSR2 ligam e desligam os perfis de CPU e memória (indisponíveis no Windows)
+            if self.profiler and hasattr(signal, "SIGUSR1"):
+                signal.signal(signal.SIGUSR1, self.profile_handler)
+                signal.signal(signal.SIGUSR2, self.profile_handler)
             self._running = True
             self.logger.info("Handlers de sinal registrados")
             return True
@@ -45,6 +61,14 @@ class SignalHandler(BaseComponent):
             # Restaura os handlers padrão
             signal.signal(signal.SIGINT, signal.SIG_DFL)
             signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            if hasattr(signal, "SIGHUP"):
+                signal.signal(signal.SIGHUP, signal.SIG_DFL)
+            if self.profiler and hasattr(signal, "SIGUSR1"):
+                signal.signal(signal.SIGUSR1, signal.SIG_DFL)
+                signal.signal(signal.SIGUSR2, signal.SIG_DFL)
+                
+                # Grava os perfis que ainda estiverem ativos
+                self.profiler.stop()
             self._running = False
             self.logger.info("Handlers de sinal restaurados")
             return True
@@ -70,6 +94,51 @@ class SignalHandler(BaseComponent):
         # Encerra o programa
         sys.exit(0)
     
+    def reload_handler(self, signum, frame):
+        """
+        Manipulador de sinal que recarrega os módulos dos processadores do sniffer
+        
+        Args:
+            signum: Número do sinal recebido
+            frame: Frame atual da execução
+        """
+        # Reimportar módulos e gravar no log pode bloquear (locks de importação e do log):
+        # o trabalho sai da thread principal, que tratou o sinal
+        threading.Thread(target=self._reload, name="SignalHandler.reload", daemon=True).start()
+    
+    def _reload(self):
+        """
+        Recarrega os processadores do sniffer (fora do contexto do sinal, uma recarga por vez).
+        """
+        with self._reload_lock:
+            if not self.sniffer:
+                self.logger.warning("Sinal de recarga recebido, mas nenhum sniffer está registrado")
+                return
+            
+            self.logger.info("Sinal de recarga recebido, recarregando processadores...")
+            try:
+                replaced = self.sniffer.reload_processors()
+            except Exception as e:
+                self.logger.error(f"Erro ao recarregar processadores: {str(e)}")
+                return
+            self.logger.info(f"Processadores recarregados: {', '.join(replaced) if replaced else 'nenhum'}")
+    
+    def profile_handler(self, signum, frame):
+        """
+        Manipulador de sinal que liga ou desliga um perfil: SIGUSR1 para CPU e SIGUSR2 para memória
+        
+        Args:
+            signum: Número do sinal recebido
+            frame: Frame atual da execução
+        """
+        if not self.profiler:
+            self.logger.warning("Sinal de perfil recebido, mas nenhum profiler está registrado")
+            return
+        
+        # Gravar um perfil pode demorar: o trabalho sai da thread principal, que tratou o sinal
+        toggle = self.profiler.toggle_cpu if signum == signal.SIGUSR1 else self.profiler.toggle_memory
+        threading.Thread(target=toggle, name="SignalHandler.profile", daemon=True).start()
+    
     def register_sniffer(self, sniffer):
         """
         Registra um novo sniffer para ser gerenciado
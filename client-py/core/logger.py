@@ -1,4 +1,151 @@
+import json
+import time
+import queue
+import atexit
 import logging
+import threading
+import logging.handlers
+from typing import Any, Dict, Optional
+
+# Formatos padrão
+DEFAULT_FORMAT = '[%(asctime)s] [%(levelname)s] %(message)s'
+DEFAULT_DATEFMT = '%Y-%m-%d %H:%M:%S'
+
+# Estado do modo assíncrono (compartilhado por todos os Loggers)
+_lock = threading.Lock()
+_loggers: Dict[str, logging.Logger] = {}
+_queue_handler: Optional["DroppingQueueHandler"] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler que não formata a mensagem na thread chamadora e descarta
+    registros (contando-os) quando a fila está cheia, em vez de bloquear.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # A formatação (msg % args) fica para a thread do QueueListener
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """
+    Formata cada registro como um objeto JSON em uma única linha.
+    Campos estruturados passados em extra={"fields": {...}} são incluídos no objeto.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": record.created,
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "msg": record.getMessage()
+        }
+        fields = getattr(record, "fields", None)
+        if fields:
+            entry.update(fields)
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class LazyJson:
+    """
+    Adia a serialização JSON de um objeto até o momento em que a mensagem é formatada.
+    Uso: logger.info("Dados: %s", LazyJson(result))
+    """
+
+    __slots__ = ("value", "indent")
+
+    def __init__(self, value: Any, indent: Optional[int] = None):
+        self.value = value
+        self.indent = indent
+
+    def __str__(self) -> str:
+        return json.dumps(self.value, indent=self.indent, ensure_ascii=False, default=str)
+
+
+class LogRateLimiter:
+    """
+    Limitador de taxa por tipo de mensagem (token bucket), com amostragem opcional.
+    Conta quantas mensagens foram suprimidas em cada tipo.
+    """
+
+    def __init__(self, rate: float = 10.0, burst: int = 20, sample_every: int = 0):
+        """
+        Inicializa o limitador.
+
+        Args:
+            rate (float): Mensagens por segundo liberadas para cada tipo (0 desativa o limite)
+            burst (int): Quantidade de mensagens que pode ser liberada de uma vez
+            sample_every (int): Se maior que 0, libera apenas 1 a cada N mensagens do tipo
+        """
+        self.rate = rate
+        self.burst = burst
+        self.sample_every = sample_every
+        self.suppressed: Dict[str, int] = {}
+        self._pending: Dict[str, int] = {}
+        self._buckets: Dict[str, list] = {}
+        self._seen: Dict[str, int] = {}
+
+    def allow(self, kind: str) -> bool:
+        """
+        Verifica se uma mensagem do tipo pode ser registrada agora.
+
+        Args:
+            kind (str): Tipo da mensagem (ex: "player", "combat")
+
+        Returns:
+            bool: True se a mensagem deve ser registrada
+        """
+        allowed = True
+
+        if self.sample_every > 0:
+            seen = self._seen.get(kind, 0)
+            self._seen[kind] = seen + 1
+            allowed = seen % self.sample_every == 0
+
+        if allowed and self.rate > 0:
+            now = time.monotonic()
+            bucket = self._buckets.get(kind)
+            if bucket is None:
+                bucket = self._buckets[kind] = [float(self.burst), now]
+            tokens = min(float(self.burst), bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if tokens >= 1.0:
+                bucket[0] = tokens - 1.0
+            else:
+                bucket[0] = tokens
+                allowed = False
+
+        if not allowed:
+            self.suppressed[kind] = self.suppressed.get(kind, 0) + 1
+            self._pending[kind] = self._pending.get(kind, 0) + 1
+        return allowed
+
+    def pop_pending(self, kind: str) -> int:
+        """
+        Retorna e zera a quantidade de mensagens suprimidas desde a última liberada.
+
+        Args:
+            kind (str): Tipo da mensagem
+
+        Returns:
+            int: Mensagens suprimidas desde a última registrada
+        """
+        return self._pending.pop(kind, 0)
 
 
 class Logger:
@@ -10,10 +157,13 @@ class Logger:
         self.level = logging.INFO if level is None else level
 
         # Define o formato do logger
-        self.format = '[%(asctime)s] [%(levelname)s] %(message)s' if format is None else format
+        self.format = DEFAULT_FORMAT if format is None else format
 
         # Define o formato da data do logger
-        self.datefmt = '%Y-%m-%d %H:%M:%S' if datefmt is None else datefmt
+        self.datefmt = DEFAULT_DATEFMT if datefmt is None else datefmt
+
+        # Limitador das mensagens de caminho quente (ver Logger.hot)
+        self.rate_limiter = LogRateLimiter()
 
         # Cria o logger
         self.logger = logging.getLogger(self.name)
@@ -21,26 +171,164 @@ class Logger:
         # Configura o logger
         self.logger.setLevel(self.level)
 
-        # Cria o handler e formatter
+        with _lock:
+            # Remove handlers existentes para evitar duplicação
+            self.logger.handlers = [self._build_handler()]
+            _loggers[self.name] = self.logger
+
+    def _build_handler(self) -> logging.Handler:
+        """
+        Cria o handler do logger: o handler da fila no modo assíncrono
+        ou um StreamHandler síncrono caso contrário.
+        """
+        if _queue_handler is not None:
+            return _queue_handler
+
         handler = logging.StreamHandler()
         formatter = logging.Formatter(self.format, self.datefmt)
         handler.setFormatter(formatter)
+        return handler
+
+    def info(self, message, *args, **kwargs):
+        self.logger.info(message, *args, **kwargs)
+
+    def error(self, message, *args, **kwargs):
+        self.logger.error(message, *args, **kwargs)
+
+    def warning(self, message, *args, **kwargs):
+        self.logger.warning(message, *args, **kwargs)
+
+    def debug(self, message, *args, **kwargs):
+        self.logger.debug(message, *args, **kwargs)
+
+    def is_enabled(self, level = logging.INFO) -> bool:
+        return self.logger.isEnabledFor(level)
+
+    def hot(self, kind: str, message, *args, level = logging.INFO):
+        """
+        Registra uma mensagem de caminho quente, sujeita ao limitador de taxa do tipo.
+        A mensagem só é formatada se for de fato registrada, e informa quantas
+        mensagens do mesmo tipo foram suprimidas antes dela.
+
+        Args:
+            kind (str): Tipo da mensagem, usado pelo limitador (ex: "player")
+            message (str): Mensagem no formato %-style do logging
+            *args: Argumentos da mensagem
+            level (int): Nível do registro
+        """
+        if not self.logger.isEnabledFor(level) or not self.rate_limiter.allow(kind):
+            return
+
+        suppressed = self.rate_limiter.pop_pending(kind)
+        if suppressed:
+            message = f"{message} (+{suppressed} suprimidas)"
+        self.logger.log(level, message, *args, extra={"fields": {"kind": kind, "suppressed": suppressed}})
+
+    def get_suppressed(self) -> Dict[str, int]:
+        return dict(self.rate_limiter.suppressed)
+
+
+def configure_logging(
+    async_mode: bool = True,
+    console: bool = True,
+    json_path: Optional[str] = None,
+    max_bytes: int = 10 * 1024 * 1024,
+    backup_count: int = 5,
+    queue_size: int = 10000,
+    format: str = DEFAULT_FORMAT,
+    datefmt: str = DEFAULT_DATEFMT
+) -> bool:
+    """
+    Ativa o modo de log assíncrono: os loggers passam a apenas enfileirar registros
+    (QueueHandler) e uma thread em segundo plano (QueueListener) formata e escreve
+    no console e, opcionalmente, em arquivos JSON-lines rotativos.
+
+    Args:
+        async_mode (bool): False restaura o modo síncrono padrão
+        console (bool): Escreve os registros no console
+        json_path (str, optional): Caminho do arquivo JSON-lines (rotacionado por tamanho)
+        max_bytes (int): Tamanho máximo de cada arquivo JSON-lines
+        backup_count (int): Quantidade de arquivos rotacionados mantidos
+        queue_size (int): Capacidade da fila; registros excedentes são descartados
+        format (str): Formato das mensagens no console
+        datefmt (str): Formato da data no console
+
+    Returns:
+        bool: True se configurado com sucesso
+    """
+    global _queue_handler, _listener
+
+    shutdown_logging()
+    if not async_mode:
+        return True
+
+    handlers = []
+    if console:
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(logging.Formatter(format, datefmt))
+        handlers.append(stream_handler)
+
+    if json_path:
+        file_handler = logging.handlers.RotatingFileHandler(
+            json_path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+        )
+        file_handler.setFormatter(JsonLinesFormatter())
+        handlers.append(file_handler)
+
+    log_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    with _lock:
+        _queue_handler = DroppingQueueHandler(log_queue)
+        _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+
+        # Redireciona os loggers já criados para a fila
+        for logger in _loggers.values():
+            logger.handlers = [_queue_handler]
+    return True
+
+
+def shutdown_logging() -> None:
+    """
+    Encerra o modo assíncrono, escrevendo os registros pendentes, e devolve
+    os loggers ao modo síncrono.
+    """
+    global _queue_handler, _listener
+
+    with _lock:
+        if _listener is None:
+            return
+
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+
+        dropped = _queue_handler.dropped if _queue_handler else 0
+        _listener = None
+        _queue_handler = None
+
+        for logger in _loggers.values():
+            handler = logging.StreamHandler()
+            handler.setFormatter(logging.Formatter(DEFAULT_FORMAT, DEFAULT_DATEFMT))
+            logger.handlers = [handler]
 
-        # Remove handlers existentes para evitar duplicação
-        self.logger.handlers = []
-        
-        # Adiciona o handler ao logger
-        self.logger.addHandler(handler)
+    if dropped:
+        logging.getLogger("Logger").warning(f"{dropped} registros de log descartados por fila cheia")
 
-    def info(self, message):
-        self.logger.info(message)
 
-    def error(self, message):
-        self.logger.error(message)
+def get_logging_stats() -> Dict[str, Any]:
+    """
+    Retorna o estado do modo assíncrono de log.
 
-    def warning(self, message):
-        self.logger.warning(message)
+    Returns:
+        Dict[str, Any]: Se está ativo, registros na fila e registros descartados
+    """
+    handler = _queue_handler
+    return {
+        "async": handler is not None,
+        "queued": handler.queue.qsize() if handler else 0,
+        "dropped": handler.dropped if handler else 0
+    }
 
-    def debug(self, message):
-        self.logger.debug(message)
 
+# Garante que os registros pendentes sejam escritos ao encerrar
+atexit.register(shutdown_logging)
@@ -1,4 +1,7 @@
-from typing import Dict, Type
+import queue
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
 from .base import BaseComponent
 from .logger import Logger
 
@@ -6,99 +9,267 @@ class ComponentManager:
     """
     Gerenciador central de componentes do sistema Tanakai.
     Responsável por inicializar, gerenciar e encerrar componentes.
+
+    Cada componente pode declarar de quais outros depende. Os componentes cujas
+    dependências já iniciaram são iniciados ao mesmo tempo, cada um em sua thread;
+    o encerramento segue a ordem inversa (um componente só para depois de todos os que
+    dependem dele) e também é feito em paralelo. Cada início/parada tem tempo limite
+    e tem sua duração registrada.
     """
-    
-    def __init__(self):
+
+    # Tempos limite padrão, em segundos, de start() e stop() de cada componente
+    DEFAULT_START_TIMEOUT = 30.0
+    DEFAULT_STOP_TIMEOUT = 10.0
+
+    def __init__(self, start_timeout: float = DEFAULT_START_TIMEOUT, stop_timeout: float = DEFAULT_STOP_TIMEOUT):
         """
         Inicializa o gerenciador de componentes.
+
+        Args:
+            start_timeout (float): Tempo limite padrão, em segundos, do start() de cada componente
+            stop_timeout (float): Tempo limite padrão, em segundos, do stop() de cada componente
         """
         self.logger = Logger("ComponentManager")
+        self.start_timeout = start_timeout
+        self.stop_timeout = stop_timeout
         self._components: Dict[str, BaseComponent] = {}
-    
-    def register_component(self, component: BaseComponent) -> bool:
+        self._dependencies: Dict[str, Tuple[str, ...]] = {}
+        self._timeouts: Dict[str, Optional[float]] = {}
+        self.timings: Dict[str, Dict[str, float]] = {"start": {}, "stop": {}}
+
+    def register_component(
+        self,
+        component: BaseComponent,
+        depends_on: Iterable[Union[str, BaseComponent]] = (),
+        timeout: Optional[float] = None
+    ) -> bool:
         """
         Registra um novo componente no gerenciador.
-        
+
         Args:
             component (BaseComponent): Componente a ser registrado
-            
+            depends_on (Iterable): Componentes (ou seus nomes) que precisam iniciar antes deste
+            timeout (float, optional): Tempo limite, em segundos, do start() e do stop() deste componente
+
         Returns:
             bool: True se registrado com sucesso, False caso contrário
         """
         if component.name in self._components:
             self.logger.error(f"Componente '{component.name}' já registrado")
             return False
-        
+
         self._components[component.name] = component
+        self._dependencies[component.name] = tuple(
+            dependency if isinstance(dependency, str) else dependency.name
+            for dependency in depends_on if dependency is not None
+        )
+        self._timeouts[component.name] = timeout
         self.logger.info(f"Componente '{component.name}' registrado")
         return True
-    
+
     def get_component(self, name: str) -> BaseComponent:
         """
         Obtém um componente pelo nome.
-        
+
         Args:
             name (str): Nome do componente
-            
+
         Returns:
             BaseComponent: Componente solicitado
-            
+
         Raises:
             KeyError: Se o componente não for encontrado
         """
         if name not in self._components:
             raise KeyError(f"Componente '{name}' não encontrado")
         return self._components[name]
-    
+
     def start_all(self) -> bool:
         """
-        Inicia todos os componentes registrados.
-        
+        Inicia todos os componentes registrados, em paralelo respeitando as dependências.
+        Um componente que falha (ou estoura o tempo limite) impede o início dos que dependem dele.
+
         Returns:
             bool: True se todos iniciados com sucesso, False caso contrário
         """
-        success = True
-        for name, component in self._components.items():
-            try:
-                if component.start():
-                    self.logger.info(f"Componente '{name}' iniciado")
-                else:
-                    self.logger.error(f"Falha ao iniciar componente '{name}'")
-                    success = False
-            except Exception as e:
-                self.logger.error(f"Erro ao iniciar componente '{name}': {str(e)}")
-                success = False
-        return success
-    
+        if not self._validate():
+            return False
+
+        waits_for = {name: set(dependencies) for name, dependencies in self._dependencies.items()}
+        return self._run_graph("start", waits_for, self.start_timeout)
+
     def stop_all(self) -> bool:
         """
-        Para todos os componentes registrados.
-        
+        Para todos os componentes registrados, em paralelo e na ordem inversa das dependências.
+
         Returns:
             bool: True se todos parados com sucesso, False caso contrário
         """
+        waits_for: Dict[str, Set[str]] = {name: set() for name in self._components}
+        for name, dependencies in self._dependencies.items():
+            for dependency in dependencies:
+                if dependency in waits_for:
+                    waits_for[dependency].add(name)
+        return self._run_graph("stop", waits_for, self.stop_timeout)
+
+    def get_timings(self) -> Dict[str, Dict[str, float]]:
+        """
+        Retorna a duração, em segundos, do último start() e stop() de cada componente.
+
+        Returns:
+            Dict[str, Dict[str, float]]: "start"/"stop" -> nome do componente -> duração
+        """
+        return {action: dict(timings) for action, timings in self.timings.items()}
+
+    def _validate(self) -> bool:
+        """
+        Verifica se todas as dependências estão registradas e se não há ciclos.
+        """
+        valid = True
+        for name, dependencies in self._dependencies.items():
+            for dependency in dependencies:
+                if dependency not in self._components:
+                    self.logger.error(f"Componente '{name}' depende de '{dependency}', que não está registrado")
+                    valid = False
+        if not valid:
+            return False
+
+        # Ordenação topológica: o que sobrar está em um ciclo
+        remaining = {name: set(dependencies) for name, dependencies in self._dependencies.items()}
+        while True:
+            ready = [name for name, dependencies in remaining.items() if not dependencies]
+            if not ready:
+                break
+            for name in ready:
+                del remaining[name]
+            for dependencies in remaining.values():
+                dependencies.difference_update(ready)
+        if remaining:
+            self.logger.error(f"Dependência circular entre os componentes: {', '.join(sorted(remaining))}")
+            return False
+        return True
+
+    def _run_graph(self, action: str, waits_for: Dict[str, Set[str]], default_timeout: float) -> bool:
+        """
+        Executa start() ou stop() de todos os componentes: cada um roda em sua thread assim
+        que todos os componentes em waits_for[nome] terminarem. Componentes que exigem a
+        thread principal (requires_main_thread) rodam na thread que chamou.
+
+        Args:
+            action (str): "start" ou "stop"
+            waits_for (Dict[str, Set[str]]): Componente -> componentes que precisam terminar antes
+            default_timeout (float): Tempo limite padrão de cada componente
+
+        Returns:
+            bool: True se todos os componentes concluíram a ação com sucesso
+        """
+        starting = action == "start"
+        verb = "iniciar" if starting else "parar"
+        done_verb = "iniciado" if starting else "parado"
+
+        pending = {name: set(dependencies) for name, dependencies in waits_for.items()}
+        dependents: Dict[str, List[str]] = {name: [] for name in self._components}
+        for name in self._components:
+            for dependency in pending[name]:
+                dependents[dependency].append(name)
+
+        results: "queue.Queue[Tuple[str, bool, float]]" = queue.Queue()
+        ready = [name for name in self._components if not pending[name]]
+        running: Dict[str, float] = {}
+        finished: Set[str] = set()
+        timings = self.timings[action] = {}
         success = True
-        for name, component in self._components.items():
-            try:
-                if component.stop():
-                    self.logger.info(f"Componente '{name}' parado")
+        started = time.perf_counter()
+
+        def release(name: str, ok: bool) -> None:
+            finished.add(name)
+            for dependent in dependents[name]:
+                if dependent in finished:
+                    continue
+                if not ok and starting:
+                    # Sem a dependência o componente não é iniciado, nem os que dependem dele
+                    self.logger.error(f"Componente '{dependent}' não iniciado: dependência '{name}' falhou")
+                    release(dependent, False)
+                    continue
+                pending[dependent].discard(name)
+                if not pending[dependent]:
+                    ready.append(dependent)
+
+        while ready or running:
+            # As threads são disparadas antes de rodar os componentes da thread principal
+            inline = []
+            for name in ready:
+                running[name] = time.monotonic() + (self._timeouts[name] or default_timeout)
+                if getattr(self._components[name], "requires_main_thread", False):
+                    inline.append(name)
                 else:
-                    self.logger.error(f"Falha ao parar componente '{name}'")
+                    threading.Thread(
+                        target=lambda name=name: results.put(self._call(name, action, verb)),
+                        name=f"ComponentManager.{action}.{name}",
+                        daemon=True
+                    ).start()
+            for name in inline:
+                results.put(self._call(name, action, verb))
+            ready = []
+
+            try:
+                name, ok, elapsed = results.get(timeout=max(0.0, min(running.values()) - time.monotonic()))
+            except queue.Empty:
+                now = time.monotonic()
+                for name in [name for name, deadline in running.items() if deadline <= now]:
+                    del running[name]
+                    self.logger.error(f"Componente '{name}' não terminou de {verb} em {self._timeouts[name] or default_timeout:.1f} s")
                     success = False
-            except Exception as e:
-                self.logger.error(f"Erro ao parar componente '{name}': {str(e)}")
+                    release(name, False)
+                continue
+
+            # Resultado tardio de um componente que já estourou o tempo limite
+            if name not in running:
+                continue
+            del running[name]
+            timings[name] = elapsed
+            if ok:
+                self.logger.info(f"Componente '{name}' {done_verb} em {elapsed * 1000:.0f} ms")
+            else:
                 success = False
+            release(name, ok)
+
+        if len(finished) < len(self._components):
+            success = False
+
+        elapsed = time.perf_counter() - started
+        self.logger.info(
+            f"Componentes {'iniciados' if starting else 'parados'} em {elapsed * 1000:.0f} ms "
+            f"(soma dos tempos individuais: {sum(timings.values()) * 1000:.0f} ms)"
+        )
+        slowest = sorted(timings.items(), key=lambda item: item[1], reverse=True)[:3]
+        if slowest:
+            self.logger.info(f"Mais lentos para {verb}: " + ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in slowest))
         return success
-    
+
+    def _call(self, name: str, action: str, verb: str) -> Tuple[str, bool, float]:
+        """
+        Chama start() ou stop() de um componente, medindo a duração.
+        """
+        started = time.perf_counter()
+        try:
+            ok = bool(getattr(self._components[name], action)())
+            if not ok:
+                self.logger.error(f"Falha ao {verb} componente '{name}'")
+        except Exception as e:
+            self.logger.error(f"Erro ao {verb} componente '{name}': {str(e)}")
+            ok = False
+        return name, ok, time.perf_counter() - started
+
     def __enter__(self):
         """
         Suporte para uso com context manager (with statement)
         """
         self.start_all()
         return self
-    
+
     def __exit__(self, exc_type, exc_val, exc_tb):
         """
         Suporte para uso com context manager (with statement)
         """
-        self.stop_all() 
\ No newline at end of file
+        self.stop_all()
@@ -0,0 +1,391 @@
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from .base import BaseComponent
+
+# Histogramas com buckets em potências de 2 de nanossegundos: 1 ns até ~137 s (o último bucket acumula o excedente)
+HISTOGRAM_BUCKETS = 39
+
+
+class Counter:
+    """
+    Contador monotônico.
+
+    Não usa lock: cada contador é incrementado, na prática, por uma única thread (a de
+    captura) e a leitura de um inteiro é atômica sob o GIL. Incrementos simultâneos de
+    threads diferentes podem, raramente, perder uma unidade.
+    """
+
+    __slots__ = ("name", "labels", "value")
+
+    def __init__(self, name: str, labels: Tuple[Tuple[str, str], ...]):
+        self.name = name
+        self.labels = labels
+        self.value = 0
+
+    def inc(self, amount: int = 1) -> None:
+        """
+        Incrementa o contador.
+
+        Args:
+            amount (int): Quantidade a somar
+        """
+        self.value += amount
+
+
+class Histogram:
+    """
+    Histograma de latências com buckets logarítmicos (potências de 2 em nanossegundos).
+
+    O bucket de uma observação é o bit_length do tempo em nanossegundos, então registrar
+    custa uma multiplicação e dois incrementos, sem busca nem lock (o total de observações
+    é a soma dos buckets). Os quantis são aproximados por interpolação dentro do bucket
+    (erro máximo de 2x, tipicamente bem menor).
+
+    Nos laços mais quentes o registro pode ser feito em linha, sem a chamada de observe:
+    counts[min(int(seconds * 1e9).bit_length(), HISTOGRAM_BUCKETS - 1)] += 1 e sum += seconds.
+    """
+
+    __slots__ = ("name", "labels", "counts", "sum")
+
+    def __init__(self, name: str, labels: Tuple[Tuple[str, str], ...]):
+        self.name = name
+        self.labels = labels
+        self.counts = [0] * HISTOGRAM_BUCKETS
+        self.sum = 0.0
+
+    @property
+    def count(self) -> int:
+        """
+        Quantidade de observações.
+        """
+        return sum(self.counts)
+
+    def observe(self, seconds: float) -> None:
+        """
+        Registra uma duração.
+
+        Args:
+            seconds (float): Duração em segundos
+        """
+        index = int(seconds * 1e9).bit_length()
+        if index >= HISTOGRAM_BUCKETS:
+            index = HISTOGRAM_BUCKETS - 1
+        self.counts[index] += 1
+        self.sum += seconds
+
+    def snapshot(self) -> List[int]:
+        """
+        Copia as contagens dos buckets (para calcular quantis de um intervalo).
+
+        Returns:
+            List[int]: Contagem de cada bucket
+        """
+        return list(self.counts)
+
+    def quantile(self, q: float, counts: Optional[List[int]] = None) -> float:
+        """
+        Calcula um quantil aproximado.
+
+        Args:
+            q (float): Quantil entre 0 e 1
+            counts (List[int], optional): Contagens a usar (padrão: as acumuladas desde o início)
+
+        Returns:
+            float: Duração em segundos (0 sem observações)
+        """
+        counts = self.counts if counts is None else counts
+        total = sum(counts)
+        if not total:
+            return 0.0
+
+        rank = q * total
+        seen = 0
+        for index, count in enumerate(counts):
+            if count and seen + count >= rank:
+                lower = (1 << (index - 1)) if index else 0
+                upper = 1 << index
+                return (lower + (upper - lower) * (rank - seen) / count) / 1e9
+            seen += count
+        return (1 << (HISTOGRAM_BUCKETS - 1)) / 1e9
+
+
+class MetricsRegistry:
+    """
+    Registro dos contadores e histogramas do pipeline de captura.
+
+    As métricas são criadas (ou reaproveitadas) por nome e rótulos; os componentes
+    guardam a referência retornada e a atualizam diretamente no caminho quente.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], Any] = {}
+        self._help: Dict[str, Tuple[str, str]] = {}
+
+    def counter(self, name: str, help: str = "", **labels: str) -> Counter:
+        """
+        Retorna o contador com este nome e rótulos, criando-o se necessário.
+
+        Args:
+            name (str): Nome da métrica (formato Prometheus, terminado em _total)
+            help (str): Descrição da métrica
+            **labels: Rótulos da série
+
+        Returns:
+            Counter: Contador
+        """
+        return self._get(Counter, "counter", name, help, labels)
+
+    def histogram(self, name: str, help: str = "", **labels: str) -> Histogram:
+        """
+        Retorna o histograma com este nome e rótulos, criando-o se necessário.
+
+        Args:
+            name (str): Nome da métrica (formato Prometheus, terminado em _seconds)
+            help (str): Descrição da métrica
+            **labels: Rótulos da série
+
+        Returns:
+            Histogram: Histograma
+        """
+        return self._get(Histogram, "histogram", name, help, labels)
+
+    def collect(self) -> Dict[str, Tuple[str, str, List[Any]]]:
+        """
+        Agrupa as séries por nome.
+
+        Returns:
+            Dict[str, Tuple[str, str, List[Any]]]: Nome -> (tipo, descrição, séries)
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        grouped: Dict[str, Tuple[str, str, List[Any]]] = {}
+        for metric in metrics:
+            kind, help = self._help[metric.name]
+            grouped.setdefault(metric.name, (kind, help, []))[2].append(metric)
+        return grouped
+
+    def render_prometheus(self) -> str:
+        """
+        Gera as métricas no formato texto do Prometheus (versão 0.0.4).
+
+        Returns:
+            str: Métricas em formato texto
+        """
+        lines = []
+        for name, (kind, help, series) in sorted(self.collect().items()):
+            if help:
+                lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            for metric in series:
+                if kind == "counter":
+                    lines.append(f"{name}{_format_labels(metric.labels)} {metric.value}")
+                    continue
+                counts = metric.snapshot()
+                total = sum(counts)
+                cumulative = 0
+                for index, count in enumerate(counts[:-1]):
+                    cumulative += count
+                    le = f"{(1 << index) / 1e9:.9g}"
+                    lines.append(f"{name}_bucket{_format_labels(metric.labels + (('le', le),))} {cumulative}")
+                lines.append(f"{name}_bucket{_format_labels(metric.labels + (('le', '+Inf'),))} {total}")
+                lines.append(f"{name}_sum{_format_labels(metric.labels)} {metric.sum:.9g}")
+                lines.append(f"{name}_count{_format_labels(metric.labels)} {total}")
+        return "\n".join(lines) + "\n"
+
+    def _get(self, cls, kind: str, name: str, help: str, labels: Dict[str, str]):
+        key = (name, tuple(sorted((label, str(value)) for label, value in labels.items())))
+        metric = self._metrics.get(key)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(key)
+                if metric is None:
+                    registered = self._help.get(name)
+                    if registered is not None and registered[0] != kind:
+                        raise ValueError(f"Métrica '{name}' já registrada como {registered[0]}")
+                    if registered is None or (help and not registered[1]):
+                        self._help[name] = (kind, help)
+                    metric = cls(name, key[1])
+                    self._metrics[key] = metric
+        return metric
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    escape = lambda value: value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{label}="{escape(value)}"' for label, value in labels) + "}"
+
+
+class MetricsReporter(BaseComponent):
+    """
+    Publica as métricas do registro: uma linha de resumo no log a cada interval segundos
+    (taxas dos contadores e p50/p99 dos histogramas no intervalo) e, opcionalmente, um
+    endpoint local no formato texto do Prometheus, em "host:porta" ou "unix:/caminho".
+    """
+
+    def __init__(self, registry: MetricsRegistry, interval: Optional[float] = 60.0, address: Optional[str] = None):
+        """
+        Inicializa o publicador de métricas.
+
+        Args:
+            registry (MetricsRegistry): Registro de métricas
+            interval (float, optional): Intervalo, em segundos, entre linhas de resumo (None desativa)
+            address (str, optional): Endereço do endpoint Prometheus ("127.0.0.1:9108" ou "unix:/tmp/tanakai.sock")
+        """
+        super().__init__("Metrics")
+        self.registry = registry
+        self.interval = interval
+        self.address = address
+        self._server = None
+        self._server_thread = None
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._last_values: Dict[int, Any] = {}
+        self._last_time = time.monotonic()
+
+    def start(self) -> bool:
+        """
+        Inicia o endpoint e a thread de resumo.
+
+        Returns:
+            bool: True se iniciado com sucesso
+        """
+        if self._running:
+            return True
+
+        if self.address:
+            try:
+                self._server = self._create_server(self.address)
+            except Exception as e:
+                self.logger.error(f"Erro ao abrir o endpoint de métricas '{self.address}': {str(e)}")
+                return False
+            self._server.registry = self.registry
+            self._server_thread = threading.Thread(target=self._server.serve_forever, name="Metrics.http", daemon=True)
+            self._server_thread.start()
+            self.logger.info(f"Métricas Prometheus disponíveis em '{self.address}'")
+
+        self._running = True
+        self._stop_event.clear()
+        self._last_time = time.monotonic()
+        self.summary()
+        if self.interval:
+            self._thread = threading.Thread(target=self._summary_loop, name="Metrics", daemon=True)
+            self._thread.start()
+        return True
+
+    def stop(self) -> bool:
+        """
+        Encerra o endpoint e a thread de resumo.
+
+        Returns:
+            bool: True se parado com sucesso
+        """
+        if not self._running:
+            return True
+
+        self._running = False
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            if self.address.startswith("unix:"):
+                try:
+                    os.unlink(self._server.server_address)
+                except OSError:
+                    pass
+            self._server = None
+        return True
+
+    def summary(self) -> str:
+        """
+        Monta a linha de resumo do intervalo desde a chamada anterior: taxa por segundo
+        de cada contador e p50/p99 de cada histograma (somando os rótulos; o rótulo com
+        o maior p99 é indicado quando há mais de um).
+
+        Returns:
+            str: Linha de resumo (vazia no primeiro intervalo)
+        """
+        now = time.monotonic()
+        elapsed = now - self._last_time
+        self._last_time = now
+
+        parts = []
+        for name, (kind, _, series) in sorted(self.registry.collect().items()):
+            short = name.replace("tanakai_", "", 1)
+            if kind == "counter":
+                delta = 0
+                for metric in series:
+                    value = metric.value
+                    delta += value - self._last_values.get(id(metric), 0)
+                    self._last_values[id(metric)] = value
+                if elapsed > 0:
+                    parts.append(f"{short[:-6] if short.endswith('_total') else short} {delta / elapsed:.0f}/s")
+                continue
+
+            merged = [0] * HISTOGRAM_BUCKETS
+            worst = None
+            for metric in series:
+                counts = metric.snapshot()
+                previous = self._last_values.get(id(metric), [0] * HISTOGRAM_BUCKETS)
+                self._last_values[id(metric)] = counts
+                delta = [current - last for current, last in zip(counts, previous)]
+                if not any(delta):
+                    continue
+                merged = [total + value for total, value in zip(merged, delta)]
+                p99 = metric.quantile(0.99, delta)
+                if len(series) > 1 and (worst is None or p99 > worst[1]):
+                    worst = (",".join(value for _, value in metric.labels), p99)
+            if not any(merged):
+                continue
+            short = short[:-8] if short.endswith("_seconds") else short
+            text = (f"{short} p50 {_format_duration(series[0].quantile(0.5, merged))} "
+                    f"p99 {_format_duration(series[0].quantile(0.99, merged))}")
+            if worst is not None:
+                text += f" (pior: {worst[0]} {_format_duration(worst[1])})"
+            parts.append(text)
+
+        return " | ".join(parts)
+
+    def _create_server(self, address: str):
+        """
+        Abre o servidor HTTP do endpoint em TCP ("host:porta") ou Unix socket ("unix:/caminho").
+        O http.server só é importado aqui, já que o endpoint é opcional e a importação é cara.
+        """
+        from . import metrics_http
+
+        if address.startswith("unix:"):
+            if not hasattr(metrics_http, "UnixMetricsServer"):
+                raise OSError("Unix sockets não são suportados nesta plataforma")
+            path = address[5:]
+            if os.path.exists(path):
+                os.unlink(path)
+            return metrics_http.UnixMetricsServer(path, metrics_http.MetricsHandler)
+        host, _, port = address.rpartition(":")
+        return metrics_http.TCPMetricsServer((host or "127.0.0.1", int(port)), metrics_http.MetricsHandler)
+
+    def _summary_loop(self) -> None:
+        """
+        Loop que escreve periodicamente a linha de resumo no log.
+        """
+        while not self._stop_event.wait(self.interval):
+            try:
+                line = self.summary()
+                if line:
+                    self.logger.info(f"Pipeline: {line}")
+            except Exception as e:
+                self.logger.error(f"Erro ao gerar o resumo de métricas: {str(e)}")
+
+
+def _format_duration(seconds: float) -> str:
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.1f} us"
+    if seconds < 1.0:
+        return f"{seconds * 1e3:.1f} ms"
+    return f"{seconds:.2f} s"
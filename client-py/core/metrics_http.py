@@ -0,0 +1,37 @@
+import socketserver
+from http.server import BaseHTTPRequestHandler
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """
+    Responde GET /metrics com as métricas no formato texto do Prometheus.
+    """
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        data = self.server.registry.render_prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def address_string(self):
+        # Conexões por Unix socket não têm endereço IP
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TCPMetricsServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+# Unix sockets não existem em todas as plataformas (ex.: Windows)
+if hasattr(socketserver, "UnixStreamServer"):
+    class UnixMetricsServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
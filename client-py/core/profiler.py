@@ -0,0 +1,255 @@
+import gc
+import os
+import sys
+import time
+import threading
+import tracemalloc
+from collections import Counter
+from typing import Optional
+
+from .logger import Logger
+
+
+class Profiler:
+    """
+    Perfis de CPU e memória ligados e desligados com o cliente em execução.
+
+    CPU: uma thread de amostragem lê a pilha de todas as threads (sys._current_frames)
+    a cada interval segundos e conta as pilhas, sem instrumentar chamadas, então a
+    captura continua rodando normalmente. Ao parar, grava as pilhas no formato "folded"
+    (uma linha "thread;frame;...;frame contagem"), aceito por flamegraph.pl, speedscope
+    e inferno.
+
+    Memória: liga o tracemalloc e guarda um snapshot inicial, junto com a contagem de
+    objetos vivos por tipo; ao parar, grava as linhas de código que mais alocaram e os
+    tipos que mais cresceram desde o início e desliga o tracemalloc. Com o tracemalloc
+    ativo o processamento de pacotes fica várias vezes mais lento (a captura continua,
+    mas pode descartar pacotes), por isso o perfil de memória tem duração máxima menor.
+
+    Os perfis param sozinhos após max_duration (CPU) e max_memory_duration (memória) segundos.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        interval: float = 0.005,
+        max_duration: Optional[float] = 300.0,
+        max_memory_duration: Optional[float] = 60.0,
+        top: int = 50
+    ):
+        """
+        Inicializa o profiler.
+
+        Args:
+            directory (str): Diretório onde os perfis são gravados
+            interval (float): Intervalo, em segundos, entre amostras de pilha
+            max_duration (float, optional): Duração máxima do perfil de CPU em segundos (None desativa)
+            max_memory_duration (float, optional): Duração máxima do perfil de memória em segundos (None desativa)
+            top (int): Quantidade de linhas em cada seção do relatório de memória
+        """
+        self.directory = directory
+        self.interval = interval
+        self.max_duration = max_duration
+        self.max_memory_duration = max_memory_duration
+        self.top = top
+        self.logger = Logger("Profiler")
+
+        self._lock = threading.Lock()
+        self._cpu_thread: Optional[threading.Thread] = None
+        self._cpu_stop = threading.Event()
+        self._cpu_path = ""
+        self._memory_snapshot: Optional[tracemalloc.Snapshot] = None
+        self._memory_types: Counter = Counter()
+        self._memory_started = ""
+        self._memory_timer: Optional[threading.Timer] = None
+
+    @property
+    def cpu_running(self) -> bool:
+        """
+        Indica se o perfil de CPU está ativo.
+        """
+        return self._cpu_thread is not None
+
+    @property
+    def memory_running(self) -> bool:
+        """
+        Indica se o perfil de memória está ativo.
+        """
+        return self._memory_snapshot is not None
+
+    def toggle_cpu(self) -> None:
+        """
+        Inicia o perfil de CPU ou, se ele já estiver ativo, o encerra e grava.
+        """
+        if self.cpu_running:
+            self.stop_cpu()
+        else:
+            self.start_cpu()
+
+    def toggle_memory(self) -> None:
+        """
+        Inicia o perfil de memória ou, se ele já estiver ativo, o encerra e grava.
+        """
+        if self.memory_running:
+            self.stop_memory()
+        else:
+            self.start_memory()
+
+    def start_cpu(self) -> bool:
+        """
+        Inicia a amostragem de pilhas.
+
+        Returns:
+            bool: False se o perfil de CPU já estava ativo
+        """
+        with self._lock:
+            if self._cpu_thread is not None:
+                return False
+            self._cpu_stop.clear()
+            self._cpu_path = os.path.join(self.directory, f"cpu-{time.strftime('%Y%m%d-%H%M%S')}.folded")
+            self._cpu_thread = threading.Thread(target=self._sample_loop, args=(self._cpu_path,), name="Profiler", daemon=True)
+            self._cpu_thread.start()
+        self.logger.info(f"Perfil de CPU iniciado (amostra a cada {self.interval * 1000:.0f} ms)")
+        return True
+
+    def stop_cpu(self) -> Optional[str]:
+        """
+        Encerra a amostragem de pilhas; a thread de amostragem grava o arquivo ao sair.
+
+        Returns:
+            Optional[str]: Caminho do arquivo gravado ou None se o perfil não estava ativo
+        """
+        with self._lock:
+            thread, self._cpu_thread = self._cpu_thread, None
+        if thread is None:
+            return None
+        self._cpu_stop.set()
+        thread.join()
+        return self._cpu_path
+
+    def start_memory(self) -> bool:
+        """
+        Liga o tracemalloc e guarda o snapshot inicial.
+
+        Returns:
+            bool: False se o perfil de memória já estava ativo
+        """
+        with self._lock:
+            if self._memory_snapshot is not None:
+                return False
+            self._memory_types = _count_types()
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(1)
+            self._memory_started = time.strftime("%Y%m%d-%H%M%S")
+            self._memory_snapshot = tracemalloc.take_snapshot()
+            if self.max_memory_duration:
+                self._memory_timer = threading.Timer(self.max_memory_duration, self.stop_memory)
+                self._memory_timer.daemon = True
+                self._memory_timer.start()
+        self.logger.warning(
+            "Perfil de memória iniciado (tracemalloc): o processamento de pacotes fica mais lento até o perfil ser encerrado"
+        )
+        return True
+
+    def stop_memory(self) -> Optional[str]:
+        """
+        Compara um novo snapshot com o inicial, grava as maiores alocações e desliga o tracemalloc.
+
+        Returns:
+            Optional[str]: Caminho do arquivo gravado ou None se o perfil não estava ativo
+        """
+        with self._lock:
+            baseline, self._memory_snapshot = self._memory_snapshot, None
+            timer, self._memory_timer = self._memory_timer, None
+            if baseline is None:
+                return None
+            types = _count_types()
+            types.subtract(self._memory_types)
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        if timer is not None and timer is not threading.current_thread():
+            timer.cancel()
+
+        filters = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, "<frozen *>")]
+        differences = snapshot.filter_traces(filters).compare_to(baseline.filter_traces(filters), "lineno")
+        path = os.path.join(self.directory, f"memory-{self._memory_started}.txt")
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(f"# Memória rastreada: {current / 1024 / 1024:.1f} MiB (pico {peak / 1024 / 1024:.1f} MiB)\n")
+                file.write(f"# {self.top} linhas com maior crescimento desde o início do perfil\n")
+                for difference in differences[:self.top]:
+                    file.write(f"{difference}\n")
+                file.write(f"\n# {self.top} tipos com maior crescimento de objetos vivos\n")
+                for name, count in types.most_common(self.top):
+                    if count <= 0:
+                        break
+                    file.write(f"{name}: +{count}\n")
+        except OSError as e:
+            self.logger.error(f"Erro ao gravar o perfil de memória '{path}': {str(e)}")
+            return None
+        self.logger.info(f"Perfil de memória gravado em '{path}'")
+        return path
+
+    def stop(self) -> None:
+        """
+        Encerra e grava os perfis que estiverem ativos.
+        """
+        self.stop_cpu()
+        self.stop_memory()
+
+    def _sample_loop(self, path: str) -> None:
+        """
+        Loop da thread de amostragem: conta as pilhas de todas as threads e grava o
+        arquivo folded ao ser encerrado.
+        """
+        stacks: Counter = Counter()
+        names = {}
+        labels = {}
+        own_id = threading.get_ident()
+        samples = 0
+        started = time.monotonic()
+        deadline = started + self.max_duration if self.max_duration else None
+
+        while not self._cpu_stop.wait(self.interval):
+            names.update((thread.ident, thread.name) for thread in threading.enumerate() if thread.ident not in names)
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    label = labels.get(code)
+                    if label is None:
+                        label = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+                        labels[code] = label
+                    stack.append(label)
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, f"thread-{thread_id}"))
+                stacks[";".join(reversed(stack))] += 1
+            samples += 1
+            if deadline is not None and time.monotonic() >= deadline:
+                with self._lock:
+                    if self._cpu_thread is threading.current_thread():
+                        self._cpu_thread = None
+                break
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as file:
+                for stack, count in stacks.most_common():
+                    file.write(f"{stack} {count}\n")
+        except OSError as e:
+            self.logger.error(f"Erro ao gravar o perfil de CPU '{path}': {str(e)}")
+            return
+        self.logger.info(
+            f"Perfil de CPU gravado em '{path}' ({samples} amostras em {time.monotonic() - started:.1f} s)"
+        )
+
+
+def _count_types() -> Counter:
+    """
+    Conta os objetos rastreados pelo coletor de lixo por tipo.
+    """
+    return Counter(type(obj).__qualname__ for obj in gc.get_objects())
@@ -0,0 +1,171 @@
+import sys
+import importlib
+import threading
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from .guard import ProcessorGuard
+
+
+class ProcessorEntry(NamedTuple):
+    """
+    Processador registrado e o guarda que mede sua execução.
+    """
+    name: str
+    func: Callable
+    guard: ProcessorGuard
+
+
+class ProcessorRegistry:
+    """
+    Registro de processadores com cópia na escrita (copy-on-write).
+
+    Os leitores (thread de captura) apenas leem o atributo `entries`, uma tupla
+    imutável, sem nenhum lock. Os escritores montam uma nova tupla sob um lock
+    e a publicam com uma única atribuição, que é atômica no Python.
+    """
+
+    def __init__(self):
+        """
+        Inicializa o registro vazio.
+        """
+        self._lock = threading.Lock()
+        self.entries: Tuple[ProcessorEntry, ...] = ()
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, name: str) -> bool:
+        return self.get(name) is not None
+
+    def get(self, name: str) -> Optional[ProcessorEntry]:
+        """
+        Obtém um processador pelo nome.
+
+        Args:
+            name (str): Nome do processador
+
+        Returns:
+            Optional[ProcessorEntry]: Entrada registrada ou None
+        """
+        for entry in self.entries:
+            if entry.name == name:
+                return entry
+        return None
+
+    def register(self, name: str, func: Callable, guard: ProcessorGuard) -> None:
+        """
+        Registra (ou substitui) um processador.
+
+        Args:
+            name (str): Nome do processador
+            func (callable): Função de processamento
+            guard (ProcessorGuard): Guarda que mede e protege o processador
+        """
+        entry = ProcessorEntry(name, func, guard)
+        with self._lock:
+            entries = list(self.entries)
+            for index, current in enumerate(entries):
+                if current.name == name:
+                    entries[index] = entry
+                    break
+            else:
+                entries.append(entry)
+            self.entries = tuple(entries)
+
+    def unregister(self, name: str) -> bool:
+        """
+        Remove um processador.
+
+        Args:
+            name (str): Nome do processador
+
+        Returns:
+            bool: True se o processador existia
+        """
+        with self._lock:
+            entries = tuple(entry for entry in self.entries if entry.name != name)
+            removed = len(entries) != len(self.entries)
+            self.entries = entries
+        return removed
+
+    def replace(self, name: str, func: Callable) -> bool:
+        """
+        Troca a função de um processador, preservando seu guarda e estatísticas.
+
+        Args:
+            name (str): Nome do processador
+            func (callable): Nova função de processamento
+
+        Returns:
+            bool: True se o processador existia
+        """
+        with self._lock:
+            entries = list(self.entries)
+            for index, current in enumerate(entries):
+                if current.name == name:
+                    entries[index] = current._replace(func=func)
+                    self.entries = tuple(entries)
+                    return True
+        return False
+
+    def as_dict(self) -> Dict[str, Callable]:
+        """
+        Retorna uma cópia do registro no formato nome -> função.
+
+        Returns:
+            Dict[str, Callable]: Processadores registrados
+        """
+        return {entry.name: entry.func for entry in self.entries}
+
+    def reload_module(self, module_name: str) -> List[str]:
+        """
+        Reimporta um módulo e troca, de forma atômica, todas as funções registradas
+        que pertencem a ele pelas novas versões.
+
+        Args:
+            module_name (str): Nome do módulo (ex: "photon.processors")
+
+        Returns:
+            List[str]: Nomes dos processadores substituídos
+
+        Raises:
+            KeyError: Se o módulo não estiver importado
+            Exception: Qualquer erro levantado ao reimportar o módulo
+        """
+        module = sys.modules.get(module_name)
+        if module is None:
+            raise KeyError(f"Módulo '{module_name}' não está carregado")
+
+        # Reimporta antes de pegar o lock: um erro aqui mantém as funções atuais
+        module = importlib.reload(module)
+
+        replaced = []
+        with self._lock:
+            entries = list(self.entries)
+            for index, entry in enumerate(entries):
+                if getattr(entry.func, "__module__", None) != module_name:
+                    continue
+                new_func = getattr(module, getattr(entry.func, "__name__", ""), None)
+                if callable(new_func):
+                    entry.guard.reset()
+                    entries[index] = entry._replace(func=new_func)
+                    replaced.append(entry.name)
+            self.entries = tuple(entries)
+        return replaced
+
+    def modules(self) -> List[str]:
+        """
+        Lista os módulos que definem os processadores registrados.
+
+        Returns:
+            List[str]: Nomes dos módulos, sem repetição
+        """
+        names = []
+        for entry in self.entries:
+            module_name = getattr(entry.func, "__module__", None)
+            if module_name and module_name not in names:
+                names.append(module_name)
+        return names
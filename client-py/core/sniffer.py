@@ -1,10 +1,21 @@
+import sys
 import socket
+import struct
 import threading
 import time
 from abc import abstractmethod
-from typing import Callable, Dict, Any, Tuple, Optional
+from types import MappingProxyType
+from typing import Callable, Dict, Any, List, Mapping, Tuple, Optional
 
 from .base import BaseComponent
+from .guard import ProcessorGuard
+from .metrics import MetricsRegistry, HISTOGRAM_BUCKETS
+from .registry import ProcessorRegistry
+
+# SO_TIMESTAMPNS (Linux): o kernel anexa a cada datagrama o horário de recebimento (timespec,
+# relógio de parede). O módulo socket não exporta a constante; 35 é o valor em x86 e ARM
+SO_TIMESTAMPNS = getattr(socket, "SO_TIMESTAMPNS", 35 if sys.platform.startswith("linux") else None)
+TIMESPEC = struct.Struct("@ll")
 
 class BaseSniffer(BaseComponent):
     """
@@ -12,6 +23,9 @@ class BaseSniffer(BaseComponent):
     Fornece a estrutura básica para captura de pacotes independente de protocolo.
     """
     
+    # Amostragem dos tempos nas métricas: histogramas medidos em 1 pacote a cada N
+    METRICS_SAMPLE = 16
+    
     def __init__(self, name: str, port: int, callback: Optional[Callable] = None):
         """
         Inicializa o sniffer base.
@@ -26,27 +40,252 @@ class BaseSniffer(BaseComponent):
         self.callback = callback
         self.socket = None
         self.thread = None
-        self.processors: Dict[str, Callable] = {}
+        self.registry = ProcessorRegistry()
+        self.metrics: Optional[MetricsRegistry] = None
+        self._processor_metrics: Dict[str, Tuple[Any, Any, Any]] = {}
+        self._sampled = False
     
-    def register_processor(self, name: str, processor_func: Callable) -> None:
+    @property
+    def processors(self) -> Mapping[str, Callable]:
+        """
+        Visão somente leitura dos processadores registrados.
+        
+        Returns:
+            Mapping[str, Callable]: Nome -> função de processamento
+        """
+        return MappingProxyType(self.registry.as_dict())
+    
+    @property
+    def processor_guards(self) -> Mapping[str, ProcessorGuard]:
+        """
+        Visão somente leitura dos guardas de cada processador.
+        
+        Returns:
+            Mapping[str, ProcessorGuard]: Nome -> guarda do processador
+        """
+        return MappingProxyType({entry.name: entry.guard for entry in self.registry})
+    
+    def register_processor(self, name: str, processor_func: Callable, **guard_options) -> None:
         """
         Registra um processador de pacotes.
+        Pode ser chamado com a captura em andamento: o registro é trocado de forma atômica.
         
         Args:
             name (str): Nome identificador do processador
             processor_func (callable): Função de processamento
+            **guard_options: Limites do ProcessorGuard (budget, error_rate, max_time, cooldown, ...)
         """
-        self.processors[name] = processor_func
+        self.registry.register(name, processor_func, ProcessorGuard(name, **guard_options))
         self.logger.info(f"Processador '{name}' registrado")
     
+    def unregister_processor(self, name: str) -> bool:
+        """
+        Remove um processador de pacotes.
+        
+        Args:
+            name (str): Nome identificador do processador
+            
+        Returns:
+            bool: True se o processador estava registrado
+        """
+        if self.registry.unregister(name):
+            self.logger.info(f"Processador '{name}' removido")
+            return True
+        return False
+    
+    def reload_processors(self, module_name: Optional[str] = None) -> List[str]:
+        """
+        Reimporta os módulos dos processadores e troca suas funções sem parar a captura.
+        
+        Args:
+            module_name (str, optional): Módulo a recarregar; se omitido, recarrega todos
+                                         os módulos que definem processadores registrados
+            
+        Returns:
+            List[str]: Nomes dos processadores substituídos
+        """
+        module_names = [module_name] if module_name else self.registry.modules()
+        replaced = []
+        for name in module_names:
+            try:
+                names = self.registry.reload_module(name)
+                replaced.extend(names)
+                self.logger.info(f"Módulo '{name}' recarregado ({len(names)} processadores substituídos)")
+            except Exception as e:
+                self.logger.error(f"Erro ao recarregar módulo '{name}': {str(e)}")
+        return replaced
+    
+    def get_processor_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Retorna as estatísticas de execução de cada processador registrado.
+        
+        Returns:
+            Dict[str, Dict[str, Any]]: Estado do circuit breaker, tempos e contadores por processador
+        """
+        return {entry.name: entry.guard.get_stats() for entry in self.registry}
+    
+    def reset_processor(self, name: str) -> None:
+        """
+        Reativa manualmente um processador desativado pelo circuit breaker.
+        
+        Args:
+            name (str): Nome do processador
+            
+        Raises:
+            KeyError: Se o processador não estiver registrado
+        """
+        entry = self.registry.get(name)
+        if entry is None:
+            raise KeyError(f"Processador '{name}' não encontrado")
+        entry.guard.reset()
+        self.logger.info(f"Processador '{name}' reativado manualmente")
+    
+    def instrument(self, metrics: MetricsRegistry) -> None:
+        """
+        Passa a registrar as métricas da captura: pacotes, bytes e detecções (contadores
+        exatos) e histogramas do tempo de processamento de cada pacote, de cada processador
+        e dos callbacks. Os histogramas são medidos em 1 de cada METRICS_SAMPLE pacotes, o
+        que mantém a distribuição com custo baixo; chamadas e tempo total exatos de cada
+        processador continuam em get_processor_stats. Sem chamar este método o caminho de
+        captura não mede nada além do que o ProcessorGuard já mede.
+
+        Quando o sniffer tem o horário de recebimento do pacote pelo kernel (SO_TIMESTAMPNS
+        ou timestamp do pcap), registra também a latência do kernel até cada callback.
+
+        Args:
+            metrics (MetricsRegistry): Registro de métricas
+        """
+        self._packets = metrics.counter("tanakai_packets_total", "Pacotes capturados", sniffer=self.name)
+        self._packet_bytes = metrics.counter("tanakai_packet_bytes_total", "Bytes capturados", sniffer=self.name)
+        self._packet_time = metrics.histogram(
+            "tanakai_packet_seconds", "Tempo total de processamento de um pacote (amostrado)", sniffer=self.name
+        )
+        self._callback_time = metrics.histogram(
+            "tanakai_callback_seconds", "Tempo do callback de cada detecção, barramento e assinantes (amostrado)", sniffer=self.name
+        )
+        self._kernel_callback_time = metrics.histogram(
+            "tanakai_kernel_callback_seconds", "Do recebimento do pacote pelo kernel até a chamada do callback (amostrado)", sniffer=self.name
+        )
+        self._processor_metrics = {}
+        self.metrics = metrics
+
+    def _processor_metric(self, name: str) -> Tuple[List[int], Any, Any]:
+        """
+        Cria as métricas de um processador: (buckets e histograma de tempo, contador de detecções).
+        """
+        histogram = self.metrics.histogram("tanakai_processor_seconds", "Tempo de execução de cada processador (amostrado)", processor=name)
+        handles = (
+            histogram.counts,
+            histogram,
+            self.metrics.counter("tanakai_detections_total", "Detecções por processador", processor=name)
+        )
+        self._processor_metrics[name] = handles
+        return handles
+
+    def _handle_packet(self, data: bytes, addr: Tuple, timestamp: Optional[float] = None) -> None:
+        """
+        Entrega um pacote capturado a _process_packet, registrando as métricas da captura.
+
+        Args:
+            data (bytes): Dados do pacote
+            addr (tuple): Endereço de origem (IP, porta)
+            timestamp (float, optional): Horário (epoch) de recebimento do pacote pelo kernel
+        """
+        if self.metrics is None:
+            self._process_packet(data, addr, timestamp)
+            return
+
+        packets = self._packets
+        packets.value += 1
+        self._packet_bytes.value += len(data)
+        if packets.value % self.METRICS_SAMPLE:
+            self._process_packet(data, addr, timestamp)
+            return
+
+        self._sampled = True
+        start = time.perf_counter()
+        try:
+            self._process_packet(data, addr, timestamp)
+        finally:
+            self._sampled = False
+            self._packet_time.observe(time.perf_counter() - start)
+
+    @staticmethod
+    def _observe_age(histogram, timestamp: Optional[float]) -> None:
+        """
+        Registra no histograma o tempo decorrido desde o recebimento do pacote pelo kernel.
+        O horário do kernel é de relógio de parede: ajustes do relógio podem dar valores negativos.
+        """
+        if timestamp is not None:
+            age = time.time() - timestamp
+            histogram.observe(age if age > 0.0 else 0.0)
+    
+    def _run_processors(self, data: bytes, addr: Tuple, timestamp: Optional[float] = None) -> None:
+        """
+        Executa os processadores registrados, medindo o tempo de cada um e
+        ignorando os que estiverem desativados pelo circuit breaker.
+        
+        Args:
+            data (bytes): Dados do pacote
+            addr (tuple): Endereço de origem (IP, porta)
+            timestamp (float, optional): Horário (epoch) de recebimento do pacote pelo kernel
+        """
+        metrics = self.metrics
+        sampled = self._sampled
+        processor_metrics = self._processor_metrics
+        last_bucket = HISTOGRAM_BUCKETS - 1
+
+        # Leitura sem lock: a tupla de entradas é imutável e trocada atomicamente
+        for name, processor, guard in self.registry.entries:
+            if not guard.allow():
+                continue
+            
+            state = guard.state
+            error = False
+            result = None
+            start = time.perf_counter()
+            try:
+                result = processor(data, addr)
+            except Exception as e:
+                error = True
+                self.logger.error(f"Erro no processador '{name}': {str(e)}")
+            elapsed = time.perf_counter() - start
+            if sampled:
+                # Registro em linha no histograma: são várias chamadas por pacote
+                counts, histogram, _ = processor_metrics.get(name) or self._processor_metric(name)
+                index = int(elapsed * 1e9).bit_length()
+                counts[index if index < last_bucket else last_bucket] += 1
+                histogram.sum += elapsed
+            if result and metrics is not None:
+                (processor_metrics.get(name) or self._processor_metric(name))[2].value += 1
+            
+            reason = guard.record(elapsed, error)
+            if reason:
+                self.logger.warning(f"Processador '{name}' desativado: {reason}")
+            elif state != guard.state:
+                self.logger.info(f"Processador '{name}' reativado após período de teste")
+            
+            # Se um processador retornar resultado, notifica via callback
+            if result and self.callback:
+                if sampled:
+                    self._observe_age(self._kernel_callback_time, timestamp)
+                    start = time.perf_counter()
+                try:
+                    self.callback(name, result, data, addr)
+                except Exception as e:
+                    self.logger.error(f"Erro no callback do processador '{name}': {str(e)}")
+                if sampled:
+                    self._callback_time.observe(time.perf_counter() - start)
+    
     @abstractmethod
-    def _process_packet(self, data: bytes, addr: Tuple) -> None:
+    def _process_packet(self, data: bytes, addr: Tuple, timestamp: Optional[float] = None) -> None:
         """
         Processa um pacote capturado.
         
         Args:
             data (bytes): Dados do pacote
             addr (tuple): Endereço de origem (IP, porta)
+            timestamp (float, optional): Horário (epoch) de recebimento do pacote pelo kernel
         """
         pass
     
@@ -138,25 +377,49 @@ class UDPSniffer(BaseSniffer):
             callback (callable, optional): Função de callback para processamento
         """
         super().__init__("UDPSniffer", port, callback)
+        self.kernel_timestamps = False
     
     def _setup_socket(self) -> None:
         """
-        Configura o socket UDP para captura.
+        Configura o socket UDP para captura, com o horário de recebimento do kernel
+        (SO_TIMESTAMPNS) em cada datagrama quando a plataforma suporta e há métricas.
         """
         self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         self.socket.bind(('0.0.0.0', self.port))
         self.socket.settimeout(1.0)
+        
+        self.kernel_timestamps = False
+        if self.metrics is not None and SO_TIMESTAMPNS is not None and hasattr(self.socket, "recvmsg"):
+            try:
+                self.socket.setsockopt(socket.SOL_SOCKET, SO_TIMESTAMPNS, 1)
+                self.kernel_timestamps = True
+            except OSError as e:
+                self.logger.warning(f"Horário de recebimento do kernel indisponível: {str(e)}")
     
     def _capture_loop(self) -> None:
         """
-        Loop principal de captura UDP.
+        Loop principal de captura UDP. O recvmsg (com o horário do kernel) custa mais que
+        o recvfrom, por isso só é usado nos pacotes que serão amostrados pelas métricas.
         """
         self.logger.info("Loop de captura de pacotes UDP iniciado")
         
+        timestamps = self.kernel_timestamps
+        sample = self.METRICS_SAMPLE
+        ancillary_size = socket.CMSG_SPACE(TIMESPEC.size) if timestamps else 0
         while self._running and self.socket is not None:
             try:
-                data, addr = self.socket.recvfrom(65535)
-                self._process_packet(data, addr)
+                timestamp = None
+                if timestamps and self._packets.value % sample == sample - 1:
+                    data, ancillary, _, addr = self.socket.recvmsg(65535, ancillary_size)
+                    for level, kind, value in ancillary:
+                        if level == socket.SOL_SOCKET and kind == SO_TIMESTAMPNS:
+                            seconds, nanoseconds = TIMESPEC.unpack_from(value)
+                            timestamp = seconds + nanoseconds * 1e-9
+                else:
+                    data, addr = self.socket.recvfrom(65535)
+                if not self._running:
+                    break
+                self._handle_packet(data, addr, timestamp)
             except socket.timeout:
                 # Timeout esperado para verificar self._running periodicamente
                 pass
@@ -165,25 +428,31 @@ class UDPSniffer(BaseSniffer):
                     self.logger.error(f"Erro na captura: {str(e)}")
                     time.sleep(0.1)
     
-    def _process_packet(self, data: bytes, addr: Tuple) -> None:
+    def _cleanup(self) -> None:
+        """
+        Acorda o recvfrom com um datagrama vazio, para a thread de captura sair sem
+        esperar o timeout do socket, e limpa os recursos.
+        """
+        if self.socket is not None and self.thread is not None:
+            try:
+                with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as wake:
+                    wake.sendto(b"", ("127.0.0.1", self.socket.getsockname()[1]))
+            except OSError:
+                pass
+        super()._cleanup()
+    
+    def _process_packet(self, data: bytes, addr: Tuple, timestamp: Optional[float] = None) -> None:
         """
         Processa um pacote UDP capturado.
         
         Args:
             data (bytes): Dados do pacote
             addr (tuple): Endereço de origem (IP, porta)
+            timestamp (float, optional): Horário (epoch) de recebimento do pacote pelo kernel
         """
         try:
             # Executa todos os processadores registrados
-            for name, processor in self.processors.items():
-                try:
-                    result = processor(data, addr)
-                    
-                    # Se um processador retornar resultado, notifica via callback
-                    if result and self.callback:
-                        self.callback(name, result, data, addr)
-                except Exception as e:
-                    self.logger.error(f"Erro no processador '{name}': {str(e)}")
+            self._run_processors(data, addr, timestamp)
         except Exception as e:
             self.logger.error(f"Erro ao processar pacote: {str(e)}")
 
@@ -259,8 +528,8 @@ class ScapySniffer(BaseSniffer):
                         data = bytes(packet[UDP].payload)
                         addr = (packet.src, packet[UDP].sport)
                         
-                        # Processa o pacote
-                        self._process_packet(data, addr)
+                        # Processa o pacote com o horário de recebimento registrado pelo pcap
+                        self._handle_packet(data, addr, float(packet.time))
                     except Exception as e:
                         self.logger.error(f"Erro ao processar pacote: {str(e)}")
             
@@ -1,10 +1,9 @@
 import os
 import sys
+import json
 import platform
-import webbrowser
 import importlib.util
-import subprocess
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from .base import BaseComponent
 from .logger import Logger
@@ -151,6 +150,8 @@ class SystemUtils(BaseComponent):
         """
         Abre a página de download do Npcap no navegador padrão.
         """
+        import webbrowser
+
         self.logger.info(f"Abrindo página de download do Npcap: {NPCAP_DOWNLOAD_URL}")
         webbrowser.open(NPCAP_DOWNLOAD_URL)
     
@@ -161,6 +162,8 @@ class SystemUtils(BaseComponent):
         Returns:
             bool: True se instalado com sucesso
         """
+        import subprocess
+
         try:
             self.logger.info("Tentando instalar o Scapy automaticamente...")
             subprocess.check_call([sys.executable, "-m", "pip", "install", "scapy>=2.5.0"])
@@ -170,14 +173,76 @@ class SystemUtils(BaseComponent):
             self.logger.error(f"Falha ao instalar Scapy: {str(e)}")
             return False
     
-    def check_and_prompt_npcap(self) -> bool:
+    def capability_key(self) -> Dict[str, Any]:
+        """
+        Monta a chave do cache de capacidades: o interpretador e a data de modificação das
+        bibliotecas de captura e dos diretórios de pacotes (instalar ou remover o Scapy
+        altera o diretório site-packages).
+        
+        Returns:
+            Dict[str, Any]: Chave que invalida o cache quando o ambiente muda
+        """
+        paths = [NPCAP_WPCAP_DLL_WIN, NPCAP_PACKET_DLL_WIN, LIBPCAP_SO_LINUX, LIBPCAP_A_LINUX, LIBPCAP_DYLIB_MAC]
+        paths += [path for path in sys.path if os.path.basename(path) in ("site-packages", "dist-packages")]
+        mtimes = {}
+        for path in paths:
+            try:
+                mtimes[path] = os.stat(path).st_mtime_ns
+            except OSError:
+                mtimes[path] = None
+        return {"executable": sys.executable, "version": sys.version, "mtimes": mtimes}
+    
+    def load_capabilities(self, cache_path: str) -> bool:
+        """
+        Verifica se o cache registra uma biblioteca de captura disponível para este ambiente.
+        
+        Args:
+            cache_path (str): Arquivo do cache de capacidades
+        
+        Returns:
+            bool: True se o cache existir e ainda for válido
+        """
+        try:
+            with open(cache_path, "r", encoding="utf-8") as file:
+                cached = json.load(file)
+        except (OSError, ValueError):
+            return False
+        return bool(cached.get("capture")) and cached.get("key") == self.capability_key()
+    
+    def save_capabilities(self, cache_path: str) -> None:
+        """
+        Grava no cache que há uma biblioteca de captura disponível para este ambiente.
+        
+        Args:
+            cache_path (str): Arquivo do cache de capacidades
+        """
+        temp_path = f"{cache_path}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump({"key": self.capability_key(), "capture": True}, file)
+            os.replace(temp_path, cache_path)
+        except OSError as e:
+            self.logger.warning(f"Não foi possível gravar o cache de capacidades '{cache_path}': {str(e)}")
+    
+    def check_and_prompt_npcap(self, cache_path: Optional[str] = None) -> bool:
         """
         Verifica se alguma biblioteca de captura está disponível e orienta o usuário se não estiver.
+        Com cache_path, um resultado positivo é reaproveitado nas próximas execuções enquanto
+        o interpretador e as bibliotecas não mudarem; resultados negativos não são guardados.
+        
+        Args:
+            cache_path (str, optional): Arquivo do cache de capacidades (None desativa)
         
         Returns:
             bool: True se alguma biblioteca estiver disponível
         """
+        if cache_path and self.load_capabilities(cache_path):
+            self.logger.info("Biblioteca de captura disponível (verificação em cache)")
+            return True
+        
         if self.is_packet_capture_available():
+            if cache_path:
+                self.save_capabilities(cache_path)
             return True
         
         # Exibe mensagem para o usuário
@@ -219,12 +284,15 @@ class SystemUtils(BaseComponent):
 
 
 # Função auxiliar para facilitar o uso
-def check_and_prompt_npcap() -> bool:
+def check_and_prompt_npcap(cache_path: Optional[str] = None) -> bool:
     """
     Função auxiliar que verifica se as bibliotecas de captura estão disponíveis.
     
+    Args:
+        cache_path (str, optional): Arquivo do cache de capacidades (None desativa)
+    
     Returns:
         bool: True se alguma biblioteca estiver disponível
     """
     utils = SystemUtils()
-    return utils.check_and_prompt_npcap() 
\ No newline at end of file
+    return utils.check_and_prompt_npcap(cache_path) 
\ No newline at end of file
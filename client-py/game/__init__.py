@@ -0,0 +1,22 @@
+"""
+Módulo game - Estado do jogo derivado das detecções (entidades, combate, mercado...).
+"""
+
+from .arena import EntityArena
+from .entities import EntityStore
+from .combat import CombatAggregator
+from .fights import FightTracker
+from .coalescer import PositionCoalescer
+from .market import MarketAggregator
+from .respawn import TimerWheel, RespawnTracker
+
+__all__ = [
+    "EntityArena",
+    "EntityStore",
+    "CombatAggregator",
+    "FightTracker",
+    "PositionCoalescer",
+    "MarketAggregator",
+    "TimerWheel",
+    "RespawnTracker"
+]
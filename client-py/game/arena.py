@@ -0,0 +1,285 @@
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Um handle combina o slot (32 bits baixos) e a geração do slot (bits altos)
+SLOT_BITS = 32
+SLOT_MASK = (1 << SLOT_BITS) - 1
+
+
+class EntityArena:
+    """
+    Arena de registros de entidades com reaproveitamento de slots e contadores de geração.
+
+    Cada registro ocupa um slot de um conjunto pré-alocado. Quem guarda uma referência
+    recebe um handle (slot + geração), que deixa de ser válido quando o slot é liberado.
+    A troca de zona apenas incrementa a época da arena (O(1)): todos os registros da
+    época anterior passam a ser considerados livres e os handles antigos são
+    detectados como inválidos sob demanda, sem percorrer as entidades.
+    """
+
+    def __init__(self, capacity: int = 65536):
+        """
+        Inicializa a arena.
+
+        Args:
+            capacity (int): Quantidade máxima de registros simultâneos
+        """
+        self.capacity = capacity
+        self.epoch = 0
+        self.resets = 0
+
+        self._generations = array('I', bytes(4 * capacity))
+        self._epochs = array('I', bytes(4 * capacity))
+        self._live = bytearray(capacity)
+        # Entidade de cada slot (somente leitura fora da arena; vale apenas para slots vivos)
+        self.ids = array('q', [-1]) * capacity
+        self._records = [None] * capacity
+
+        # Slots livres da época atual e cursor dos slots ainda não usados nela
+        self._free = []
+        self._cursor = 0
+
+        # Índice entidade -> slot da época atual (trocado por um novo a cada zona)
+        self._index: Dict[int, int] = {}
+
+        # Dicionários de épocas anteriores, esvaziados aos poucos para que a troca
+        # de zona não pague a desalocação de dezenas de milhares de entradas de uma vez
+        self._retired: List[dict] = []
+        self.drain_step = 8
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, entity_id: int) -> bool:
+        return entity_id in self._index
+
+    @property
+    def is_full(self) -> bool:
+        return not self._free and self._cursor >= self.capacity
+
+    def allocate(self, entity_id: int, record: Any = None) -> Optional[int]:
+        """
+        Reserva um slot para uma entidade (evento de spawn).
+        Se a entidade já estiver na arena, apenas substitui o registro.
+
+        Args:
+            entity_id (int): Identificador da entidade
+            record (Any, optional): Registro associado
+
+        Returns:
+            Optional[int]: Handle do registro ou None se a arena estiver cheia
+        """
+        slot = self._index.get(entity_id)
+        if slot is None:
+            if self._free:
+                slot = self._free.pop()
+            elif self._cursor < self.capacity:
+                slot = self._cursor
+                self._cursor += 1
+            else:
+                return None
+
+            if self._retired:
+                self.drain(self.drain_step)
+
+            # Nova ocupação do slot: invalida qualquer handle anterior
+            self._generations[slot] = (self._generations[slot] + 1) & 0xFFFFFFFF
+            self._epochs[slot] = self.epoch
+            self._live[slot] = 1
+            self.ids[slot] = entity_id
+            self._index[entity_id] = slot
+
+        self._records[slot] = record
+        return (self._generations[slot] << SLOT_BITS) | slot
+
+    def free(self, entity_id: int) -> bool:
+        """
+        Libera o slot de uma entidade (evento de saída).
+
+        Args:
+            entity_id (int): Identificador da entidade
+
+        Returns:
+            bool: True se a entidade estava na arena
+        """
+        slot = self._index.pop(entity_id, None)
+        if slot is None:
+            return False
+        self._release(slot)
+        return True
+
+    def free_slot(self, slot: int) -> bool:
+        """
+        Libera um slot diretamente.
+
+        Args:
+            slot (int): Slot ocupado na época atual
+
+        Returns:
+            bool: True se o slot estava ocupado
+        """
+        if not self._is_current(slot):
+            return False
+        self._index.pop(self.ids[slot], None)
+        self._release(slot)
+        return True
+
+    def reset(self) -> None:
+        """
+        Invalida todos os registros (troca de zona) em O(1).
+        Os slots da época anterior voltam a ficar disponíveis e seus handles
+        passam a ser rejeitados por get/is_valid.
+        """
+        self.epoch = (self.epoch + 1) & 0xFFFFFFFF
+        self.resets += 1
+        self._free = []
+        self._cursor = 0
+        self.retire(self._index)
+        self._index = {}
+
+    def retire(self, table: dict) -> None:
+        """
+        Agenda a liberação gradual de um dicionário que deixou de ser usado.
+
+        Args:
+            table (dict): Dicionário a ser esvaziado por drain
+        """
+        if table:
+            self._retired.append(table)
+
+    def drain(self, budget: Optional[int] = None) -> int:
+        """
+        Libera entradas dos dicionários de épocas anteriores.
+
+        Args:
+            budget (int, optional): Quantidade máxima de entradas liberadas (padrão: todas)
+
+        Returns:
+            int: Quantidade de entradas liberadas
+        """
+        released = 0
+        retired = self._retired
+        while retired and (budget is None or released < budget):
+            table = retired[-1]
+            if budget is None:
+                released += len(table)
+                table.clear()
+            else:
+                while table and released < budget:
+                    table.popitem()
+                    released += 1
+            if not table:
+                retired.pop()
+        return released
+
+    def is_valid(self, handle: int) -> bool:
+        """
+        Verifica se um handle ainda se refere a um registro vivo.
+
+        Args:
+            handle (int): Handle retornado por allocate
+
+        Returns:
+            bool: True se o handle é válido
+        """
+        slot = handle & SLOT_MASK
+        return (slot < self.capacity
+                and self._is_current(slot)
+                and self._generations[slot] == handle >> SLOT_BITS)
+
+    def get(self, handle: int) -> Any:
+        """
+        Obtém o registro de um handle.
+
+        Args:
+            handle (int): Handle retornado por allocate
+
+        Returns:
+            Any: Registro associado ou None se o handle estiver obsoleto
+        """
+        if not self.is_valid(handle):
+            return None
+        return self._records[handle & SLOT_MASK]
+
+    def lookup(self, entity_id: int) -> Optional[int]:
+        """
+        Obtém o handle atual de uma entidade.
+
+        Args:
+            entity_id (int): Identificador da entidade
+
+        Returns:
+            Optional[int]: Handle ou None se a entidade não estiver na arena
+        """
+        slot = self._index.get(entity_id)
+        if slot is None:
+            return None
+        return (self._generations[slot] << SLOT_BITS) | slot
+
+    def slot_of(self, entity_id: int) -> Optional[int]:
+        """
+        Obtém o slot atual de uma entidade.
+
+        Args:
+            entity_id (int): Identificador da entidade
+
+        Returns:
+            Optional[int]: Slot ou None se a entidade não estiver na arena
+        """
+        return self._index.get(entity_id)
+
+    def entity_of(self, slot: int) -> int:
+        """
+        Obtém a entidade que ocupa um slot da época atual.
+
+        Args:
+            slot (int): Slot
+
+        Returns:
+            int: Identificador da entidade (-1 se o slot estiver livre)
+        """
+        return self.ids[slot] if self._is_current(slot) else -1
+
+    def record_of(self, slot: int) -> Any:
+        return self._records[slot] if self._is_current(slot) else None
+
+    def items(self) -> Iterator[Tuple[int, int]]:
+        """
+        Percorre as entidades vivas.
+
+        Yields:
+            Tuple[int, int]: (id da entidade, slot)
+        """
+        return iter(list(self._index.items()))
+
+    def slots(self):
+        """
+        Retorna os slots ocupados na época atual.
+        """
+        return self._index.values()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retorna as estatísticas da arena.
+
+        Returns:
+            Dict[str, Any]: Registros vivos, capacidade, slots já usados na época e trocas de zona
+        """
+        return {
+            "live": len(self._index),
+            "capacity": self.capacity,
+            "high_water": self._cursor,
+            "free": len(self._free),
+            "epoch": self.epoch,
+            "resets": self.resets,
+            "retired": sum(len(table) for table in self._retired)
+        }
+
+    def _is_current(self, slot: int) -> bool:
+        return self._live[slot] == 1 and self._epochs[slot] == self.epoch
+
+    def _release(self, slot: int) -> None:
+        self._live[slot] = 0
+        self.ids[slot] = -1
+        self._records[slot] = None
+        self._free.append(slot)
@@ -0,0 +1,195 @@
+import threading
+from typing import Any, Dict, Iterable, List, Tuple
+
+from core.base import BaseComponent
+from core.bus import EventBus
+
+
+class PositionCoalescer(BaseComponent):
+    """
+    Estágio do pipeline que agrupa atualizações frequentes (posições) por entidade.
+
+    Assina todas as detecções de um barramento de entrada. Eventos dos tipos
+    agrupados são guardados apenas na versão mais recente de cada entidade e
+    publicados uma vez por tick no barramento de saída; os demais eventos são
+    repassados imediatamente. Os assinantes do barramento de saída recebem,
+    assim, no máximo uma atualização por entidade por tick, sem perder o estado final.
+
+    A ordem entre os dois caminhos é preservada onde importa: antes de repassar um
+    evento de uma entidade (saída, spawn...) a atualização pendente dela é publicada,
+    e antes de um evento com o campo "zone" (troca de zona) todas as pendentes são
+    publicadas, para que nenhuma posição antiga chegue depois do evento.
+
+    O lote é publicado pela thread de ticks e os repasses pela thread de quem publica
+    no barramento de entrada; o barramento de saída deve usar async_dispatch=True para
+    que os assinantes sejam executados em uma única thread.
+    """
+
+    def __init__(
+        self,
+        output: EventBus,
+        tick: float = 0.05,
+        kinds: Iterable[str] = ("player",),
+        key_field: str = "id"
+    ):
+        """
+        Inicializa o estágio de agrupamento.
+
+        Args:
+            output (EventBus): Barramento que recebe os eventos agrupados e repassados
+            tick (float): Duração do tick em segundos
+            kinds (Iterable[str]): Tipos de detecção agrupados por entidade
+            key_field (str): Campo do resultado que identifica a entidade
+        """
+        super().__init__("PositionCoalescer")
+        self.output = output
+        self.tick = tick
+        self.kinds = frozenset(kinds)
+        self.key_field = key_field
+
+        self.received = 0
+        self.emitted = 0
+        self.forwarded = 0
+        self.ticks = 0
+
+        self._lock = threading.Lock()
+        # Serializa as publicações no barramento de saída (lotes e repasses)
+        self._publish_lock = threading.RLock()
+        self._pending: Dict[Tuple[str, Any], Tuple[str, Dict[str, Any], bytes, tuple]] = {}
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self) -> bool:
+        """
+        Inicia a thread que publica os lotes a cada tick.
+
+        Returns:
+            bool: True se iniciado com sucesso
+        """
+        if self._running:
+            return True
+
+        self._running = True
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._tick_loop, name="PositionCoalescer", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self) -> bool:
+        """
+        Para a thread de ticks e publica o que ainda estiver pendente.
+
+        Returns:
+            bool: True se parado com sucesso
+        """
+        if not self._running:
+            return True
+
+        self._running = False
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        self.flush()
+        return True
+
+    def attach(self, bus: EventBus) -> None:
+        """
+        Registra o estágio como assinante de todas as detecções do barramento de entrada.
+
+        Args:
+            bus (EventBus): Barramento de entrada
+        """
+        bus.subscribe(EventBus.ALL, self.handle_detection, name="PositionCoalescer")
+
+    def handle_detection(self, processor_name: str, result: Dict[str, Any], data: bytes, addr: tuple) -> None:
+        """
+        Assinante do barramento: guarda a versão mais recente ou repassa o evento.
+
+        Args:
+            processor_name (str): Nome do processador que identificou o pacote
+            result (dict): Resultado do processamento
+            data (bytes): Dados brutos do pacote
+            addr (tuple): Endereço de origem (IP, porta)
+        """
+        kind = result.get("type")
+        if kind not in self.kinds or self.key_field not in result:
+            with self._publish_lock:
+                if result.get("zone") is not None:
+                    # Troca de zona: nada da zona anterior pode chegar depois do evento
+                    self.flush()
+                elif self.key_field in result:
+                    self._flush_entity(result[self.key_field])
+                self.forwarded += 1
+                self.output.publish(processor_name, result, data, addr)
+            return
+
+        with self._lock:
+            self.received += 1
+            self._pending[(kind, result[self.key_field])] = (processor_name, result, data, addr)
+
+    def flush(self) -> List[Dict[str, Any]]:
+        """
+        Publica no barramento de saída o estado mais recente de cada entidade
+        atualizada desde o último tick.
+
+        Returns:
+            List[Dict[str, Any]]: Lote de resultados publicados
+        """
+        with self._publish_lock:
+            with self._lock:
+                if not self._pending:
+                    return []
+                pending = self._pending
+                self._pending = {}
+
+            batch = []
+            publish = self.output.publish
+            for processor_name, result, data, addr in pending.values():
+                publish(processor_name, result, data, addr)
+                batch.append(result)
+
+            self.emitted += len(batch)
+            self.ticks += 1
+        return batch
+
+    def _flush_entity(self, entity_id: Any) -> None:
+        """
+        Publica as atualizações pendentes de uma entidade (com o lock de publicação adquirido).
+        """
+        with self._lock:
+            pending = [self._pending.pop((kind, entity_id), None) for kind in self.kinds]
+
+        for event in pending:
+            if event is not None:
+                self.output.publish(*event)
+                self.emitted += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retorna as estatísticas do agrupamento.
+
+        Returns:
+            Dict[str, Any]: Atualizações recebidas, publicadas, agrupadas (descartadas
+                            por terem sido substituídas) e a razão de redução
+        """
+        coalesced = self.received - self.emitted - len(self._pending)
+        return {
+            "received": self.received,
+            "emitted": self.emitted,
+            "coalesced": coalesced,
+            "forwarded": self.forwarded,
+            "pending": len(self._pending),
+            "ticks": self.ticks,
+            "reduction": self.received / self.emitted if self.emitted else 0.0
+        }
+
+    def _tick_loop(self) -> None:
+        """
+        Loop da thread de ticks.
+        """
+        while not self._stop_event.wait(self.tick):
+            try:
+                self.flush()
+            except Exception as e:
+                self.logger.error(f"Erro ao publicar lote de posições: {str(e)}")
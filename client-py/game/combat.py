@@ -0,0 +1,313 @@
+import time
+import heapq
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.base import BaseComponent
+from core.bus import EventBus
+
+# Papéis acompanhados para cada entidade
+ROLE_DEALT = "dealt"      # Dano causado
+ROLE_TAKEN = "taken"      # Dano recebido
+ROLE_HEALED = "healed"    # Cura realizada
+ROLES = (ROLE_DEALT, ROLE_TAKEN, ROLE_HEALED)
+
+
+class CombatSeries:
+    """
+    Série temporal de uma entidade em um papel, em buckets de tempo fixos
+    guardados em um buffer circular. A memória por entidade é constante.
+    """
+
+    __slots__ = ("amounts", "hits", "bucket_ids", "total", "total_hits", "last_seen")
+
+    def __init__(self, buckets: int):
+        self.amounts = array('d', bytes(8 * buckets))
+        self.hits = array('I', bytes(4 * buckets))
+        self.bucket_ids = array('q', [-1]) * buckets
+        self.total = 0.0
+        self.total_hits = 0
+        self.last_seen = 0.0
+
+    def add(self, bucket_id: int, amount: float, timestamp: float) -> None:
+        """
+        Soma um valor ao bucket do instante informado (O(1)).
+        """
+        index = bucket_id % len(self.amounts)
+        if self.bucket_ids[index] != bucket_id:
+            # Bucket reaproveitado: descarta o conteúdo de uma volta anterior do buffer
+            self.bucket_ids[index] = bucket_id
+            self.amounts[index] = 0.0
+            self.hits[index] = 0
+        self.amounts[index] += amount
+        self.hits[index] += 1
+        self.total += amount
+        self.total_hits += 1
+        if timestamp > self.last_seen:
+            self.last_seen = timestamp
+
+    def window_sum(self, first_bucket: int, last_bucket: int) -> Tuple[float, int]:
+        """
+        Soma os buckets entre first_bucket e last_bucket (inclusive).
+        """
+        size = len(self.amounts)
+        amount = 0.0
+        hits = 0
+        bucket_ids = self.bucket_ids
+        for bucket_id in range(max(first_bucket, last_bucket - size + 1), last_bucket + 1):
+            index = bucket_id % size
+            if bucket_ids[index] == bucket_id:
+                amount += self.amounts[index]
+                hits += self.hits[index]
+        return amount, hits
+
+
+class CombatAggregator(BaseComponent):
+    """
+    Agrega eventos de combate em tempo real: DPS/HPS em janelas deslizantes,
+    dano total e ranking de atacantes, por entidade.
+
+    Cada entidade mantém, por papel (dano causado, recebido e cura), um buffer
+    circular de buckets de tempo. Atualizações são O(1) e consultas somam apenas
+    os buckets da janela. O número de entidades é limitado (LRU).
+    """
+
+    DEFAULT_WINDOWS = (1.0, 10.0, 60.0)
+
+    def __init__(self, resolution: float = 0.25, history: float = 60.0, max_entities: int = 10000):
+        """
+        Inicializa o agregador.
+
+        Args:
+            resolution (float): Duração de cada bucket em segundos
+            history (float): Maior janela consultável em segundos
+            max_entities (int): Quantidade máxima de entidades acompanhadas por papel
+        """
+        super().__init__("CombatAggregator")
+        self.resolution = resolution
+        self.history = history
+        self.max_entities = max_entities
+        self.events = 0
+
+        self._buckets = int(round(history / resolution)) + 1
+        self._series: Dict[str, "OrderedDict[int, CombatSeries]"] = {role: OrderedDict() for role in ROLES}
+        self._lock = threading.Lock()
+
+    def start(self) -> bool:
+        """
+        Inicializa o componente (não faz nada específico neste caso).
+
+        Returns:
+            bool: True sempre, pois não requer inicialização
+        """
+        self._running = True
+        return True
+
+    def stop(self) -> bool:
+        """
+        Finaliza o componente (não faz nada específico neste caso).
+
+        Returns:
+            bool: True sempre, pois não requer finalização
+        """
+        self._running = False
+        return True
+
+    def attach(self, bus: EventBus) -> None:
+        """
+        Registra o agregador como assinante das detecções de combate.
+
+        Args:
+            bus (EventBus): Barramento de detecções
+        """
+        bus.subscribe("combat", self.handle_detection, name="CombatAggregator")
+
+    def handle_detection(self, processor_name: str, result: Dict[str, Any], data: bytes, addr: tuple) -> None:
+        """
+        Assinante do barramento: contabiliza o evento de combate.
+
+        Args:
+            processor_name (str): Nome do processador que identificou o pacote
+            result (dict): Dados do evento de combate
+            data (bytes): Dados brutos do pacote
+            addr (tuple): Endereço de origem (IP, porta)
+        """
+        self.record(result["attacker_id"], result["target_id"], result["damage"], healing=result.get("healing", False))
+
+    def record(
+        self,
+        source_id: int,
+        target_id: int,
+        amount: float,
+        timestamp: Optional[float] = None,
+        healing: bool = False
+    ) -> None:
+        """
+        Contabiliza um evento de dano ou cura.
+
+        Args:
+            source_id (int): Entidade que causou o dano (ou realizou a cura)
+            target_id (int): Entidade atingida
+            amount (float): Valor do dano ou da cura
+            timestamp (float, optional): Momento do evento (padrão: agora)
+            healing (bool): True se o evento for uma cura
+        """
+        now = time.monotonic() if timestamp is None else timestamp
+        bucket_id = int(now / self.resolution)
+
+        with self._lock:
+            self.events += 1
+            if healing:
+                self._get_series(ROLE_HEALED, source_id).add(bucket_id, amount, now)
+            else:
+                self._get_series(ROLE_DEALT, source_id).add(bucket_id, amount, now)
+                self._get_series(ROLE_TAKEN, target_id).add(bucket_id, amount, now)
+
+    def rate(self, entity_id: int, window: float = 10.0, role: str = ROLE_DEALT, now: Optional[float] = None) -> float:
+        """
+        Calcula o valor por segundo (DPS, dano recebido por segundo ou HPS) na janela.
+
+        Args:
+            entity_id (int): Entidade
+            window (float): Janela em segundos (até o histórico configurado)
+            role (str): "dealt", "taken" ou "healed"
+            now (float, optional): Fim da janela (padrão: agora)
+
+        Returns:
+            float: Valor médio por segundo na janela
+        """
+        return self.window_total(entity_id, window, role, now) / window
+
+    def dps(self, entity_id: int, window: float = 10.0, now: Optional[float] = None) -> float:
+        return self.rate(entity_id, window, ROLE_DEALT, now)
+
+    def hps(self, entity_id: int, window: float = 10.0, now: Optional[float] = None) -> float:
+        return self.rate(entity_id, window, ROLE_HEALED, now)
+
+    def window_total(self, entity_id: int, window: float = 10.0, role: str = ROLE_DEALT, now: Optional[float] = None) -> float:
+        """
+        Soma o valor de uma entidade na janela.
+
+        Args:
+            entity_id (int): Entidade
+            window (float): Janela em segundos
+            role (str): "dealt", "taken" ou "healed"
+            now (float, optional): Fim da janela (padrão: agora)
+
+        Returns:
+            float: Soma na janela
+        """
+        first_bucket, last_bucket = self._window_buckets(window, now)
+        with self._lock:
+            series = self._series[role].get(entity_id)
+            if series is None:
+                return 0.0
+            return series.window_sum(first_bucket, last_bucket)[0]
+
+    def total(self, entity_id: int, role: str = ROLE_DEALT) -> float:
+        """
+        Retorna o total acumulado de uma entidade desde que passou a ser acompanhada.
+
+        Args:
+            entity_id (int): Entidade
+            role (str): "dealt", "taken" ou "healed"
+
+        Returns:
+            float: Total acumulado
+        """
+        series = self._series[role].get(entity_id)
+        return series.total if series is not None else 0.0
+
+    def top(self, n: int = 10, window: float = 10.0, role: str = ROLE_DEALT, now: Optional[float] = None) -> List[Tuple[int, float]]:
+        """
+        Ranking das entidades com maior valor por segundo na janela.
+
+        Args:
+            n (int): Tamanho do ranking
+            window (float): Janela em segundos
+            role (str): "dealt" (atacantes), "taken" (alvos) ou "healed" (curandeiros)
+            now (float, optional): Fim da janela (padrão: agora)
+
+        Returns:
+            List[Tuple[int, float]]: (entidade, valor por segundo), do maior para o menor
+        """
+        now = time.monotonic() if now is None else now
+        first_bucket, last_bucket = self._window_buckets(window, now)
+        oldest = now - window
+
+        # O lock é mantido só para listar as séries ativas e, depois, durante a soma de cada
+        # uma: record() não fica bloqueado enquanto o ranking inteiro é calculado
+        lock = self._lock
+        with lock:
+            active = [
+                (entity_id, series)
+                for entity_id, series in self._series[role].items()
+                if series.last_seen >= oldest
+            ]
+
+        candidates = []
+        for entity_id, series in active:
+            with lock:
+                amount = series.window_sum(first_bucket, last_bucket)[0]
+            if amount > 0:
+                candidates.append((amount / window, entity_id))
+
+        return [(entity_id, value) for value, entity_id in heapq.nlargest(n, candidates)]
+
+    def get_summary(self, entity_id: int, now: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Resume as estatísticas de combate de uma entidade nas janelas padrão.
+
+        Args:
+            entity_id (int): Entidade
+            now (float, optional): Fim das janelas (padrão: agora)
+
+        Returns:
+            Dict[str, Any]: Totais e valores por segundo de cada papel em 1s/10s/60s
+        """
+        now = time.monotonic() if now is None else now
+        summary: Dict[str, Any] = {"id": entity_id}
+        for role in ROLES:
+            summary[role] = {
+                "total": self.total(entity_id, role),
+                **{f"{window:g}s": self.rate(entity_id, window, role, now) for window in self.DEFAULT_WINDOWS if window <= self.history}
+            }
+        return summary
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retorna as estatísticas do agregador.
+
+        Returns:
+            Dict[str, Any]: Eventos processados e entidades acompanhadas por papel
+        """
+        return {
+            "events": self.events,
+            **{f"{role}_entities": len(series) for role, series in self._series.items()}
+        }
+
+    def _window_buckets(self, window: float, now: Optional[float]) -> Tuple[int, int]:
+        """
+        Converte uma janela que termina em now no intervalo de buckets correspondente.
+        """
+        now = time.monotonic() if now is None else now
+        window = min(window, self.history)
+        last_bucket = int(now / self.resolution)
+        first_bucket = last_bucket - max(1, int(round(window / self.resolution))) + 1
+        return first_bucket, last_bucket
+
+    def _get_series(self, role: str, entity_id: int) -> CombatSeries:
+        """
+        Obtém (ou cria) a série de uma entidade, descartando a menos recente se o limite for atingido.
+        """
+        table = self._series[role]
+        series = table.get(entity_id)
+        if series is None:
+            if len(table) >= self.max_entities:
+                table.popitem(last=False)
+            series = table[entity_id] = CombatSeries(self._buckets)
+        else:
+            table.move_to_end(entity_id)
+        return series
@@ -0,0 +1,482 @@
+import math
+import time
+import heapq
+import threading
+from array import array
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from core.base import BaseComponent
+from core.bus import EventBus
+from photon.packet_processor import PhotonPacketProcessor
+from .arena import EntityArena, SLOT_MASK
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional: as consultas em lote usam Python puro
+    np = None
+
+
+class EntityStore(BaseComponent):
+    """
+    Armazena o último estado conhecido de cada entidade (jogadores) e indexa as
+    posições em uma grade espacial uniforme para consultas por raio e k-vizinhos.
+
+    As posições ficam em arrays pré-alocados (um slot por entidade, reservado em uma
+    EntityArena) e os slots de entidades antigas são liberados pela remoção periódica,
+    mantendo a memória estável. Na troca de zona todas as entidades são invalidadas
+    em O(1), sem percorrer o armazenamento.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 16384,
+        cell_size: float = 32.0,
+        max_age: float = 30.0,
+        evict_interval: float = 5.0
+    ):
+        """
+        Inicializa o armazenamento de entidades.
+
+        Args:
+            capacity (int): Quantidade máxima de entidades mantidas
+            cell_size (float): Lado de cada célula da grade espacial (unidades do jogo)
+            max_age (float): Tempo, em segundos, sem atualização até a entidade ser removida
+            evict_interval (float): Intervalo, em segundos, entre remoções de entidades antigas
+        """
+        super().__init__("EntityStore")
+        self.capacity = capacity
+        self.cell_size = cell_size
+        self.max_age = max_age
+        self.evict_interval = evict_interval
+
+        # Estado por slot (os slots são reservados pela arena)
+        self.arena = EntityArena(capacity)
+        self._ids = self.arena.ids
+        self._xs = array('d', bytes(8 * capacity))
+        self._ys = array('d', bytes(8 * capacity))
+        self._seen = array('d', bytes(8 * capacity))
+        self._cells: List[Optional[Tuple[int, int]]] = [None] * capacity
+
+        self._grid: Dict[Tuple[int, int], Set[int]] = {}
+
+        # Zona atual, informada pelo campo "zone" dos eventos de entrada
+        self.zone: Optional[Any] = None
+
+        self.evicted = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self) -> bool:
+        """
+        Inicia a remoção periódica de entidades antigas.
+
+        Returns:
+            bool: True se iniciado com sucesso
+        """
+        if self._running:
+            return True
+
+        self._running = True
+        if self.evict_interval > 0:
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._evict_loop, name="EntityStore", daemon=True)
+            self._thread.start()
+        return True
+
+    def stop(self) -> bool:
+        """
+        Para a remoção periódica de entidades antigas.
+
+        Returns:
+            bool: True se parado com sucesso
+        """
+        self._running = False
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        return True
+
+    def attach(self, bus: EventBus) -> None:
+        """
+        Registra o armazenamento como assinante das detecções de jogadores
+        e dos eventos de entrada, saída e spawn.
+
+        Args:
+            bus (EventBus): Barramento de detecções
+        """
+        bus.subscribe("player", self.handle_detection, name="EntityStore")
+        bus.subscribe("event", self.handle_event, name="EntityStore.events")
+
+    def handle_detection(self, processor_name: str, result: Dict[str, Any], data: bytes, addr: tuple) -> None:
+        """
+        Assinante do barramento: atualiza a posição do jogador detectado.
+
+        Args:
+            processor_name (str): Nome do processador que identificou o pacote
+            result (dict): Dados do jogador detectado
+            data (bytes): Dados brutos do pacote
+            addr (tuple): Endereço de origem (IP, porta)
+        """
+        position = result.get("position", {})
+        self.update(result["id"], position.get("x", 0.0), position.get("y", 0.0))
+
+    def handle_event(self, processor_name: str, result: Dict[str, Any], data: bytes, addr: tuple) -> None:
+        """
+        Assinante do barramento: trata os eventos Photon que alteram o conjunto de entidades.
+        Só um evento de entrada com o campo "zone" diferente da zona atual indica troca de
+        zona e invalida todas as entidades (o processamento básico de eventos não informa a
+        zona, então nenhum evento sem esse campo limpa o armazenamento); saída e spawn de
+        uma entidade liberam e reservam o slot dela.
+
+        Args:
+            processor_name (str): Nome do processador que identificou o pacote
+            result (dict): Dados do evento
+            data (bytes): Dados brutos do pacote
+            addr (tuple): Endereço de origem (IP, porta)
+        """
+        code = result.get("code")
+        entity_id = result.get("id")
+
+        if code == PhotonPacketProcessor.EVENT_JOIN:
+            zone = result.get("zone")
+            if zone is not None and zone != self.zone:
+                self.zone = zone
+                self.reset()
+        elif code == PhotonPacketProcessor.EVENT_LEAVE and entity_id is not None:
+            self.remove(entity_id)
+        elif code == PhotonPacketProcessor.EVENT_SPAWN and entity_id is not None:
+            position = result.get("position", {})
+            self.update(entity_id, position.get("x", 0.0), position.get("y", 0.0))
+
+    def __len__(self) -> int:
+        return len(self.arena)
+
+    def __contains__(self, entity_id: int) -> bool:
+        return entity_id in self.arena
+
+    def update(self, entity_id: int, x: float, y: float, timestamp: Optional[float] = None) -> bool:
+        """
+        Registra ou atualiza a posição de uma entidade.
+
+        Args:
+            entity_id (int): Identificador da entidade (object id)
+            x (float): Coordenada X
+            y (float): Coordenada Y
+            timestamp (float, optional): Momento da observação (padrão: agora)
+
+        Returns:
+            bool: False se a posição foi rejeitada por ter coordenadas não finitas (NaN ou infinito)
+        """
+        if not (math.isfinite(x) and math.isfinite(y)):
+            self.rejected += 1
+            return False
+
+        now = time.monotonic() if timestamp is None else timestamp
+        cell = (int(x // self.cell_size), int(y // self.cell_size))
+
+        with self._lock:
+            slot = self.arena.slot_of(entity_id)
+            if slot is None:
+                slot = self._allocate(entity_id)
+
+            self._xs[slot] = x
+            self._ys[slot] = y
+            self._seen[slot] = now
+
+            current = self._cells[slot]
+            if current != cell:
+                if current is not None:
+                    self._remove_from_cell(slot, current)
+                bucket = self._grid.get(cell)
+                if bucket is None:
+                    bucket = self._grid[cell] = set()
+                bucket.add(slot)
+                self._cells[slot] = cell
+        return True
+
+    def remove(self, entity_id: int) -> bool:
+        """
+        Remove uma entidade.
+
+        Args:
+            entity_id (int): Identificador da entidade
+
+        Returns:
+            bool: True se a entidade existia
+        """
+        with self._lock:
+            slot = self.arena.slot_of(entity_id)
+            if slot is None:
+                return False
+            self._release(slot)
+            return True
+
+    def reset(self) -> None:
+        """
+        Invalida todas as entidades (troca de zona) em O(1).
+        A arena avança de época e a grade é substituída por uma vazia; os slots
+        antigos são reaproveitados à medida que novas entidades aparecem e as
+        estruturas da zona anterior são liberadas aos poucos (ver EntityArena.drain).
+        """
+        with self._lock:
+            self.arena.reset()
+            self.arena.retire(self._grid)
+            self._grid = {}
+
+    def clear(self) -> None:
+        """
+        Remove todas as entidades.
+        """
+        self.reset()
+
+    def get(self, entity_id: int) -> Optional[Tuple[float, float, float]]:
+        """
+        Obtém o último estado conhecido de uma entidade.
+
+        Args:
+            entity_id (int): Identificador da entidade
+
+        Returns:
+            Optional[Tuple[float, float, float]]: (x, y, momento da última atualização) ou None
+        """
+        slot = self.arena.slot_of(entity_id)
+        if slot is None:
+            return None
+        return self._xs[slot], self._ys[slot], self._seen[slot]
+
+    def query_radius(self, x: float, y: float, radius: float) -> List[Tuple[int, float]]:
+        """
+        Lista as entidades dentro de um raio.
+
+        Args:
+            x (float): Coordenada X do centro
+            y (float): Coordenada Y do centro
+            radius (float): Raio da busca
+
+        Returns:
+            List[Tuple[int, float]]: (id da entidade, distância), ordenados pela distância
+        """
+        size = self.cell_size
+        radius_sq = radius * radius
+        min_cx, max_cx = int((x - radius) // size), int((x + radius) // size)
+        min_cy, max_cy = int((y - radius) // size), int((y + radius) // size)
+
+        found = []
+        with self._lock:
+            grid, xs, ys, ids = self._grid, self._xs, self._ys, self._ids
+            for cx in range(min_cx, max_cx + 1):
+                for cy in range(min_cy, max_cy + 1):
+                    bucket = grid.get((cx, cy))
+                    if not bucket:
+                        continue
+                    for slot in bucket:
+                        dx = xs[slot] - x
+                        dy = ys[slot] - y
+                        dist_sq = dx * dx + dy * dy
+                        if dist_sq <= radius_sq:
+                            found.append((ids[slot], math.sqrt(dist_sq)))
+
+        found.sort(key=lambda item: item[1])
+        return found
+
+    def query_nearest(self, x: float, y: float, k: int = 1, max_radius: Optional[float] = None) -> List[Tuple[int, float]]:
+        """
+        Lista as k entidades mais próximas de um ponto.
+        Percorre a grade em anéis crescentes a partir da célula do ponto e para
+        assim que nenhum anel seguinte pode conter uma entidade mais próxima. Quando o
+        quadrado percorrido passa a ter mais células que as ocupadas na grade (entidades
+        esparsas ou distantes do ponto), as células ocupadas restantes são verificadas
+        diretamente, o que limita a busca ao tamanho da grade.
+
+        Args:
+            x (float): Coordenada X do ponto
+            y (float): Coordenada Y do ponto
+            k (int): Quantidade de entidades
+            max_radius (float, optional): Distância máxima considerada
+
+        Returns:
+            List[Tuple[int, float]]: (id da entidade, distância), ordenados pela distância
+        """
+        if k <= 0:
+            return []
+
+        size = self.cell_size
+        center_cx, center_cy = int(x // size), int(y // size)
+        best: List[Tuple[float, int]] = []  # Max-heap (distância negativa) com os k melhores
+
+        with self._lock:
+            if not len(self.arena):
+                return []
+
+            grid, xs, ys, ids = self._grid, self._xs, self._ys, self._ids
+            total = len(self.arena)
+            visited = 0
+            max_ring = None if max_radius is None else int(max_radius // size) + 1
+
+            def scan(bucket: Set[int]) -> None:
+                for slot in bucket:
+                    dx = xs[slot] - x
+                    dy = ys[slot] - y
+                    dist = math.sqrt(dx * dx + dy * dy)
+                    if max_radius is not None and dist > max_radius:
+                        continue
+                    if len(best) < k:
+                        heapq.heappush(best, (-dist, ids[slot]))
+                    elif dist < -best[0][0]:
+                        heapq.heapreplace(best, (-dist, ids[slot]))
+
+            ring = 0
+            while visited < total and (max_ring is None or ring <= max_ring):
+                # Distância mínima possível de qualquer ponto do anel até o ponto consultado
+                if len(best) == k and (ring - 1) * size >= -best[0][0]:
+                    break
+
+                if (2 * ring + 1) ** 2 > len(grid):
+                    # Verifica diretamente as células ocupadas fora dos anéis já percorridos
+                    for (cx, cy), bucket in grid.items():
+                        distance = max(abs(cx - center_cx), abs(cy - center_cy))
+                        if distance >= ring and (max_ring is None or distance <= max_ring):
+                            scan(bucket)
+                    break
+
+                for cell in self._ring_cells(center_cx, center_cy, ring):
+                    bucket = grid.get(cell)
+                    if not bucket:
+                        continue
+                    visited += len(bucket)
+                    scan(bucket)
+                ring += 1
+
+        return sorted(((entity_id, -neg_dist) for neg_dist, entity_id in best), key=lambda item: item[1])
+
+    def query_radius_bulk(self, points: Sequence[Tuple[float, float]], radius: float) -> List[List[int]]:
+        """
+        Executa várias consultas por raio de uma vez.
+        Com NumPy disponível, calcula as distâncias de forma vetorizada sobre os arrays de posições.
+
+        Args:
+            points (Sequence[Tuple[float, float]]): Centros das consultas
+            radius (float): Raio das buscas
+
+        Returns:
+            List[List[int]]: Ids das entidades dentro do raio, para cada centro
+        """
+        if np is None:
+            return [[entity_id for entity_id, _ in self.query_radius(x, y, radius)] for x, y in points]
+
+        with self._lock:
+            slots = np.fromiter(self.arena.slots(), dtype=np.int64, count=len(self.arena))
+            xs = np.frombuffer(self._xs, dtype=np.float64)[slots]
+            ys = np.frombuffer(self._ys, dtype=np.float64)[slots]
+            ids = np.frombuffer(self._ids, dtype=np.int64)[slots]
+
+        centers = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        radius_sq = radius * radius
+        results = []
+        for cx, cy in centers:
+            mask = (xs - cx) ** 2 + (ys - cy) ** 2 <= radius_sq
+            results.append(ids[mask].tolist())
+        return results
+
+    def evict_stale(self, max_age: Optional[float] = None, now: Optional[float] = None) -> int:
+        """
+        Remove as entidades sem atualização há mais de max_age segundos.
+
+        Args:
+            max_age (float, optional): Idade máxima (padrão: a configurada no armazenamento)
+            now (float, optional): Momento de referência (padrão: agora)
+
+        Returns:
+            int: Quantidade de entidades removidas
+        """
+        limit = (time.monotonic() if now is None else now) - (self.max_age if max_age is None else max_age)
+        removed = 0
+        with self._lock:
+            seen = self._seen
+            for slot in [slot for slot in self.arena.slots() if seen[slot] < limit]:
+                self._release(slot)
+                removed += 1
+        self.evicted += removed
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retorna as estatísticas do armazenamento.
+
+        Returns:
+            Dict[str, Any]: Entidades, capacidade, células ocupadas, entidades removidas e
+                            posições rejeitadas
+        """
+        return {
+            "entities": len(self.arena),
+            "capacity": self.capacity,
+            "cells": len(self._grid),
+            "evicted": self.evicted,
+            "rejected": self.rejected,
+            "zone": self.zone,
+            "zone_resets": self.arena.resets
+        }
+
+    def _allocate(self, entity_id: int) -> int:
+        """
+        Reserva um slot para uma nova entidade (com o lock adquirido).
+        Sem slots livres, reaproveita o da entidade atualizada há mais tempo.
+        """
+        if self.arena.is_full:
+            seen = self._seen
+            oldest = min(self.arena.slots(), key=lambda slot: seen[slot])
+            self._release(oldest)
+            self.evicted += 1
+
+        slot = self.arena.allocate(entity_id) & SLOT_MASK
+        # O slot pode vir de uma zona anterior: a célula antiga pertence a outra grade
+        self._cells[slot] = None
+        return slot
+
+    def _release(self, slot: int) -> None:
+        """
+        Libera um slot (com o lock adquirido).
+        """
+        cell = self._cells[slot]
+        if cell is not None:
+            self._remove_from_cell(slot, cell)
+            self._cells[slot] = None
+        self.arena.free_slot(slot)
+
+    def _remove_from_cell(self, slot: int, cell: Tuple[int, int]) -> None:
+        bucket = self._grid[cell]
+        bucket.discard(slot)
+        if not bucket:
+            del self._grid[cell]
+
+    @staticmethod
+    def _ring_cells(center_cx: int, center_cy: int, ring: int):
+        """
+        Gera as células na borda de um quadrado de "raio" ring em torno da célula central.
+        """
+        if ring == 0:
+            yield center_cx, center_cy
+            return
+        for cx in range(center_cx - ring, center_cx + ring + 1):
+            yield cx, center_cy - ring
+            yield cx, center_cy + ring
+        for cy in range(center_cy - ring + 1, center_cy + ring):
+            yield center_cx - ring, cy
+            yield center_cx + ring, cy
+
+    def _evict_loop(self) -> None:
+        """
+        Loop da remoção periódica de entidades antigas.
+        """
+        while not self._stop_event.wait(self.evict_interval):
+            try:
+                with self._lock:
+                    self.arena.drain(4096)
+                removed = self.evict_stale()
+                if removed:
+                    self.logger.debug("%d entidades antigas removidas", removed)
+            except Exception as e:
+                self.logger.error(f"Erro ao remover entidades antigas: {str(e)}")
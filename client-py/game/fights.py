@@ -0,0 +1,381 @@
+import time
+import threading
+from collections import OrderedDict, deque
+from typing import Any, Dict, List, Optional
+
+from core.base import BaseComponent
+from core.bus import EventBus
+
+
+class Fight:
+    """
+    Estado de uma luta em andamento: participantes e totais por entidade.
+    """
+
+    __slots__ = ("fight_id", "start", "last_seen", "events", "members", "dealt", "taken", "healed")
+
+    def __init__(self, fight_id: int, timestamp: float):
+        self.fight_id = fight_id
+        self.start = timestamp
+        self.last_seen = timestamp
+        self.events = 0
+        self.members = set()
+        self.dealt: Dict[int, float] = {}
+        self.taken: Dict[int, float] = {}
+        self.healed: Dict[int, float] = {}
+
+    def merge(self, other: "Fight") -> None:
+        """
+        Incorpora outra luta (os grupos de participantes se encontraram).
+        """
+        self.start = min(self.start, other.start)
+        self.last_seen = max(self.last_seen, other.last_seen)
+        self.events += other.events
+        self.members |= other.members
+        for mine, theirs in ((self.dealt, other.dealt), (self.taken, other.taken), (self.healed, other.healed)):
+            for entity_id, amount in theirs.items():
+                mine[entity_id] = mine.get(entity_id, 0.0) + amount
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Resume a luta.
+
+        Returns:
+            Dict[str, Any]: Participantes, dano causado/recebido, cura e duração
+        """
+        participants = sorted(self.members)
+        return {
+            "type": "fight",
+            "fight_id": self.fight_id,
+            "start": self.start,
+            "end": self.last_seen,
+            "duration": self.last_seen - self.start,
+            "events": self.events,
+            "participants": participants,
+            "damage_total": sum(self.dealt.values()),
+            "healing_total": sum(self.healed.values()),
+            "entities": {
+                entity_id: {
+                    "dealt": self.dealt.get(entity_id, 0.0),
+                    "taken": self.taken.get(entity_id, 0.0),
+                    "healed": self.healed.get(entity_id, 0.0)
+                }
+                for entity_id in participants
+            }
+        }
+
+
+class FightTracker(BaseComponent):
+    """
+    Separa a sessão em lutas a partir dos eventos de combate, de forma incremental.
+
+    Cada evento liga atacante e alvo; os grupos de entidades ligadas são mantidos em
+    uma estrutura union-find, e dois grupos que se encontram têm suas lutas unidas.
+    Uma luta termina quando nenhum participante aparece em eventos por gap segundos;
+    o resumo é então publicado como detecção do tipo "fight" e guardado nos resumos
+    recentes. Só as lutas ativas ficam em memória (limitadas a max_fights), e as lutas
+    são mantidas em ordem de atividade, então encerrar as inativas não percorre o histórico.
+    """
+
+    def __init__(
+        self,
+        output: Optional[EventBus] = None,
+        gap: float = 10.0,
+        max_fights: int = 1024,
+        history: int = 100
+    ):
+        """
+        Inicializa o rastreador de lutas.
+
+        Args:
+            output (EventBus, optional): Barramento que recebe os resumos das lutas encerradas
+            gap (float): Intervalo, em segundos, sem eventos até a luta ser encerrada
+            max_fights (int): Quantidade máxima de lutas ativas (a menos recente é encerrada)
+            history (int): Quantidade de resumos recentes mantidos
+        """
+        super().__init__("FightTracker")
+        self.output = output
+        self.gap = gap
+        self.max_fights = max_fights
+
+        self.events = 0
+        self.started = 0
+        self.merged = 0
+        self.completed = 0
+
+        # Union-find: entidade -> pai; a raiz de cada grupo indexa a luta em _fights
+        self._parent: Dict[int, int] = {}
+        self._fights: "OrderedDict[int, Fight]" = OrderedDict()
+        self._recent = deque(maxlen=history)
+        self._next_id = 1
+
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self) -> bool:
+        """
+        Inicia a verificação periódica de lutas inativas.
+
+        Returns:
+            bool: True se iniciado com sucesso
+        """
+        if self._running:
+            return True
+
+        self._running = True
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._expire_loop, name="FightTracker", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self) -> bool:
+        """
+        Para a verificação periódica e encerra as lutas em andamento.
+
+        Returns:
+            bool: True se parado com sucesso
+        """
+        if not self._running:
+            return True
+
+        self._running = False
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        self.close_all()
+        return True
+
+    def attach(self, bus: EventBus) -> None:
+        """
+        Registra o rastreador como assinante das detecções de combate.
+
+        Args:
+            bus (EventBus): Barramento de detecções
+        """
+        bus.subscribe("combat", self.handle_detection, name="FightTracker")
+
+    def handle_detection(self, processor_name: str, result: Dict[str, Any], data: bytes, addr: tuple) -> None:
+        """
+        Assinante do barramento: contabiliza o evento de combate na luta correspondente.
+
+        Args:
+            processor_name (str): Nome do processador que identificou o pacote
+            result (dict): Dados do evento de combate
+            data (bytes): Dados brutos do pacote
+            addr (tuple): Endereço de origem (IP, porta)
+        """
+        self.record(result["attacker_id"], result["target_id"], result["damage"], healing=result.get("healing", False))
+
+    def record(
+        self,
+        source_id: int,
+        target_id: int,
+        amount: float,
+        timestamp: Optional[float] = None,
+        healing: bool = False
+    ) -> int:
+        """
+        Contabiliza um evento de dano ou cura.
+
+        Args:
+            source_id (int): Entidade que causou o dano (ou realizou a cura)
+            target_id (int): Entidade atingida
+            amount (float): Valor do dano ou da cura
+            timestamp (float, optional): Momento do evento (padrão: agora)
+            healing (bool): True se o evento for uma cura
+
+        Returns:
+            int: Identificador da luta que recebeu o evento
+        """
+        now = time.monotonic() if timestamp is None else timestamp
+        closed = []
+
+        with self._lock:
+            self.events += 1
+            closed.extend(self._expire(now))
+
+            root = self._union(source_id, target_id, now)
+            fight = self._fights[root]
+            self._fights.move_to_end(root)
+            if now > fight.last_seen:
+                fight.last_seen = now
+            fight.events += 1
+            if healing:
+                fight.healed[source_id] = fight.healed.get(source_id, 0.0) + amount
+            else:
+                fight.dealt[source_id] = fight.dealt.get(source_id, 0.0) + amount
+                fight.taken[target_id] = fight.taken.get(target_id, 0.0) + amount
+
+            if len(self._fights) > self.max_fights:
+                closed.append(self._close(next(iter(self._fights))))
+            fight_id = fight.fight_id
+
+        self._emit(closed)
+        return fight_id
+
+    def expire(self, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Encerra as lutas sem eventos há mais de gap segundos.
+
+        Args:
+            now (float, optional): Momento de referência (padrão: agora)
+
+        Returns:
+            List[Dict[str, Any]]: Resumos das lutas encerradas
+        """
+        with self._lock:
+            closed = self._expire(time.monotonic() if now is None else now)
+        self._emit(closed)
+        return closed
+
+    def close_all(self) -> List[Dict[str, Any]]:
+        """
+        Encerra todas as lutas em andamento.
+
+        Returns:
+            List[Dict[str, Any]]: Resumos das lutas encerradas
+        """
+        with self._lock:
+            closed = [self._close(root) for root in list(self._fights)]
+        self._emit(closed)
+        return closed
+
+    def active(self) -> List[Dict[str, Any]]:
+        """
+        Resume as lutas em andamento.
+
+        Returns:
+            List[Dict[str, Any]]: Resumos parciais, da menos para a mais recente
+        """
+        with self._lock:
+            return [fight.summary() for fight in self._fights.values()]
+
+    def recent(self, n: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Retorna os resumos das lutas encerradas mais recentes.
+
+        Args:
+            n (int, optional): Quantidade de resumos (padrão: todos os mantidos)
+
+        Returns:
+            List[Dict[str, Any]]: Resumos, do mais recente para o mais antigo
+        """
+        with self._lock:
+            summaries = list(reversed(self._recent))
+        return summaries if n is None else summaries[:n]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retorna as estatísticas do rastreador.
+
+        Returns:
+            Dict[str, Any]: Eventos, lutas iniciadas, unidas, encerradas e ativas
+        """
+        return {
+            "events": self.events,
+            "started": self.started,
+            "merged": self.merged,
+            "completed": self.completed,
+            "active": len(self._fights),
+            "tracked_entities": len(self._parent)
+        }
+
+    def _find(self, entity_id: int) -> int:
+        """
+        Encontra a raiz do grupo de uma entidade, com compressão de caminho (com o lock adquirido).
+        """
+        parent = self._parent
+        root = entity_id
+        while parent[root] != root:
+            root = parent[root]
+        while parent[entity_id] != root:
+            parent[entity_id], entity_id = root, parent[entity_id]
+        return root
+
+    def _union(self, source_id: int, target_id: int, now: float) -> int:
+        """
+        Liga atacante e alvo, criando ou unindo lutas conforme necessário (com o lock adquirido).
+
+        Returns:
+            int: Raiz do grupo resultante
+        """
+        parent = self._parent
+        source_root = self._find(source_id) if source_id in parent else None
+        target_root = self._find(target_id) if target_id in parent else None
+
+        if source_root is None and target_root is None:
+            parent[source_id] = source_id
+            parent[target_id] = source_id
+            fight = self._fights[source_id] = Fight(self._next_id, now)
+            fight.members.update((source_id, target_id))
+            self._next_id += 1
+            self.started += 1
+            return source_id
+
+        if source_root is None:
+            parent[source_id] = target_root
+            self._fights[target_root].members.add(source_id)
+            return target_root
+        if target_root is None:
+            parent[target_id] = source_root
+            self._fights[source_root].members.add(target_id)
+            return source_root
+        if source_root == target_root:
+            return source_root
+
+        # Dois grupos distintos: a luta com menos participantes é incorporada à outra
+        keep, absorb = source_root, target_root
+        if len(self._fights[keep].members) < len(self._fights[absorb].members):
+            keep, absorb = absorb, keep
+        self._fights[keep].merge(self._fights.pop(absorb))
+        parent[absorb] = keep
+        self.merged += 1
+        return keep
+
+    def _expire(self, now: float) -> List[Dict[str, Any]]:
+        """
+        Encerra as lutas inativas a partir da menos recente (com o lock adquirido).
+        """
+        closed = []
+        limit = now - self.gap
+        fights = self._fights
+        while fights:
+            root, fight = next(iter(fights.items()))
+            if fight.last_seen >= limit:
+                break
+            closed.append(self._close(root))
+        return closed
+
+    def _close(self, root: int) -> Dict[str, Any]:
+        """
+        Encerra uma luta e remove seus participantes do union-find (com o lock adquirido).
+        """
+        fight = self._fights.pop(root)
+        summary = fight.summary()
+        parent = self._parent
+        for entity_id in fight.members:
+            parent.pop(entity_id, None)
+        self._recent.append(summary)
+        self.completed += 1
+        return summary
+
+    def _emit(self, closed: List[Dict[str, Any]]) -> None:
+        """
+        Publica os resumos das lutas encerradas (fora do lock).
+        """
+        if self.output is None:
+            return
+        for summary in closed:
+            self.output.publish(self.name, summary, b"", ("", 0))
+
+    def _expire_loop(self) -> None:
+        """
+        Loop da verificação periódica de lutas inativas.
+        """
+        while not self._stop_event.wait(max(self.gap / 4, 0.25)):
+            try:
+                self.expire()
+            except Exception as e:
+                self.logger.error(f"Erro ao encerrar lutas inativas: {str(e)}")
@@ -0,0 +1,352 @@
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.base import BaseComponent
+from core.bus import EventBus
+
+# Campos de cada entrada de um lote delta, na ordem em que são enviados.
+# "window" é o índice da janela (início = window * window_seconds) e "seen_offset"
+# são os segundos inteiros entre o início da janela e a última observação.
+DELTA_FIELDS = (
+    "item_id", "location", "quality", "window",
+    "best_sell", "best_buy", "sell_volume", "buy_volume", "orders", "seen_offset"
+)
+
+
+class SeenOrders:
+    """
+    Conjunto aproximado e limitado dos ids de ordens já vistos (filtro de Bloom rotativo).
+
+    Dois filtros de Bloom se alternam: quando o atual recebe capacity ids, o anterior
+    é descartado e um novo passa a receber as inserções. A memória é fixa e um id é
+    lembrado por pelo menos capacity inserções; falsos positivos (ordens novas tratadas
+    como repetidas) ocorrem com a taxa de erro configurada.
+    """
+
+    __slots__ = ("capacity", "bits", "hashes", "_current", "_previous", "_count")
+
+    def __init__(self, capacity: int = 200000, hashes: int = 4, bits_per_entry: int = 12):
+        """
+        Inicializa o conjunto.
+
+        Args:
+            capacity (int): Ids inseridos em cada filtro antes da rotação
+            hashes (int): Quantidade de funções de hash
+            bits_per_entry (int): Bits por id (12 bits e 4 hashes: ~0,5% de falsos positivos)
+        """
+        self.capacity = capacity
+        self.hashes = hashes
+        self.bits = max(64, capacity * bits_per_entry)
+        self._current = bytearray(self.bits // 8 + 1)
+        self._previous = bytearray(self.bits // 8 + 1)
+        self._count = 0
+
+    def add(self, order_id: int) -> bool:
+        """
+        Insere um id.
+
+        Args:
+            order_id (int): Id da ordem
+
+        Returns:
+            bool: True se o id já havia sido visto (provavelmente)
+        """
+        positions = self._positions(order_id)
+        current = self._current
+        if all(current[p >> 3] & (1 << (p & 7)) for p in positions):
+            return True
+
+        previous = self._previous
+        seen = all(previous[p >> 3] & (1 << (p & 7)) for p in positions)
+
+        if self._count >= self.capacity:
+            self._previous, self._current = current, bytearray(len(current))
+            current = self._current
+            self._count = 0
+        for p in positions:
+            current[p >> 3] |= 1 << (p & 7)
+        self._count += 1
+        return seen
+
+    def _positions(self, order_id: int) -> List[int]:
+        # Hash duplo (Kirsch-Mitzenmacher) a partir de uma mistura de 64 bits do id
+        h = (order_id * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+        h ^= h >> 31
+        h1 = h & 0xFFFFFFFF
+        h2 = (h >> 32) | 1
+        bits = self.bits
+        return [(h1 + i * h2) % bits for i in range(self.hashes)]
+
+
+class MarketEntry:
+    """
+    Observações de um (item, local, qualidade) em uma janela de tempo.
+    """
+
+    __slots__ = ("window", "best_sell", "best_buy", "sell_volume", "buy_volume", "orders", "last_seen")
+
+    def __init__(self, window: int):
+        self.window = window
+        self.best_sell = 0
+        self.best_buy = 0
+        self.sell_volume = 0
+        self.buy_volume = 0
+        self.orders = 0
+        self.last_seen = 0.0
+
+    def as_row(self, key: Tuple[int, int, int], window_seconds: float) -> list:
+        item_id, location, quality = key
+        return [
+            item_id, location, quality, self.window,
+            self.best_sell, self.best_buy, self.sell_volume, self.buy_volume, self.orders,
+            int(self.last_seen - self.window * window_seconds)
+        ]
+
+
+class MarketAggregator(BaseComponent):
+    """
+    Agrega as ordens de mercado observadas por (item, local, qualidade) em janelas de tempo.
+
+    Para cada chave e janela mantém o melhor preço de venda (menor) e de compra (maior),
+    o volume de cada lado e o momento da última observação. Ordens já vistas são
+    descartadas por um filtro de ids limitado. A cada flush_interval segundos apenas
+    as entradas alteradas são publicadas, como um lote delta compacto (linhas na ordem
+    de DELTA_FIELDS), no lugar das ordens brutas.
+    """
+
+    def __init__(
+        self,
+        output: Optional[EventBus] = None,
+        window: float = 300.0,
+        flush_interval: float = 5.0,
+        max_entries: int = 50000,
+        seen_capacity: int = 200000
+    ):
+        """
+        Inicializa o agregador de mercado.
+
+        Args:
+            output (EventBus, optional): Barramento que recebe os lotes delta ("market_delta")
+            window (float): Duração de cada janela de agregação em segundos
+            flush_interval (float): Intervalo, em segundos, entre lotes delta
+            max_entries (int): Quantidade máxima de chaves mantidas (a menos recente é descartada)
+            seen_capacity (int): Capacidade do filtro de ids de ordens já vistas
+        """
+        super().__init__("MarketAggregator")
+        self.output = output
+        self.window = window
+        self.flush_interval = flush_interval
+        self.max_entries = max_entries
+
+        self.orders = 0
+        self.duplicates = 0
+        self.batches = 0
+        self.rows_emitted = 0
+
+        self._seen = SeenOrders(seen_capacity)
+        self._entries: "OrderedDict[Tuple[int, int, int], MarketEntry]" = OrderedDict()
+        self._dirty = set()
+        self._closed: List[list] = []
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self) -> bool:
+        """
+        Inicia a publicação periódica dos lotes delta.
+
+        Returns:
+            bool: True se iniciado com sucesso
+        """
+        if self._running:
+            return True
+
+        self._running = True
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._flush_loop, name="MarketAggregator", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self) -> bool:
+        """
+        Para a publicação periódica e publica as alterações pendentes.
+
+        Returns:
+            bool: True se parado com sucesso
+        """
+        if not self._running:
+            return True
+
+        self._running = False
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        self.flush()
+        return True
+
+    def attach(self, bus: EventBus) -> None:
+        """
+        Registra o agregador como assinante das detecções de mercado.
+
+        Args:
+            bus (EventBus): Barramento de detecções
+        """
+        bus.subscribe("market", self.handle_detection, name="MarketAggregator")
+
+    def handle_detection(self, processor_name: str, result: Dict[str, Any], data: bytes, addr: tuple) -> None:
+        """
+        Assinante do barramento: contabiliza a ordem de mercado.
+
+        Args:
+            processor_name (str): Nome do processador que identificou o pacote
+            result (dict): Dados da ordem
+            data (bytes): Dados brutos do pacote
+            addr (tuple): Endereço de origem (IP, porta)
+        """
+        self.observe(
+            result["order_id"], result["item_id"], result["location"], result["quality"],
+            result["price"], result["amount"], result["side"] == "buy"
+        )
+
+    def observe(
+        self,
+        order_id: int,
+        item_id: int,
+        location: int,
+        quality: int,
+        price: int,
+        amount: int,
+        buy: bool = False,
+        timestamp: Optional[float] = None
+    ) -> bool:
+        """
+        Contabiliza uma ordem observada.
+
+        Args:
+            order_id (int): Id da ordem
+            item_id (int): Id do item
+            location (int): Local do mercado
+            quality (int): Qualidade do item
+            price (int): Preço unitário
+            amount (int): Quantidade
+            buy (bool): True para ordens de compra, False para ordens de venda
+            timestamp (float, optional): Momento da observação (padrão: agora)
+
+        Returns:
+            bool: False se a ordem já havia sido vista
+        """
+        now = time.time() if timestamp is None else timestamp
+        window = int(now // self.window)
+        key = (item_id, location, quality)
+
+        with self._lock:
+            self.orders += 1
+            if self._seen.add(order_id):
+                self.duplicates += 1
+                return False
+
+            entry = self._entries.get(key)
+            if entry is None:
+                if len(self._entries) >= self.max_entries:
+                    self._retire(*self._entries.popitem(last=False))
+                entry = self._entries[key] = MarketEntry(window)
+            else:
+                self._entries.move_to_end(key)
+                if entry.window != window:
+                    # Nova janela: a anterior é encerrada (e enviada, se houver alterações)
+                    self._retire(key, entry)
+                    entry = self._entries[key] = MarketEntry(window)
+
+            if buy:
+                if price > entry.best_buy:
+                    entry.best_buy = price
+                entry.buy_volume += amount
+            else:
+                if entry.best_sell == 0 or price < entry.best_sell:
+                    entry.best_sell = price
+                entry.sell_volume += amount
+            entry.orders += 1
+            entry.last_seen = now
+            self._dirty.add(key)
+            return True
+
+    def flush(self) -> Optional[Dict[str, Any]]:
+        """
+        Publica as entradas alteradas desde o último lote.
+
+        Returns:
+            Optional[Dict[str, Any]]: Lote delta publicado ou None se não houve alterações
+        """
+        with self._lock:
+            rows = self._closed
+            self._closed = []
+            entries = self._entries
+            for key in self._dirty:
+                rows.append(entries[key].as_row(key, self.window))
+            self._dirty = set()
+
+        if not rows:
+            return None
+
+        batch = {"type": "market_delta", "window_seconds": self.window, "fields": DELTA_FIELDS, "rows": rows}
+        self.batches += 1
+        self.rows_emitted += len(rows)
+        if self.output is not None:
+            self.output.publish(self.name, batch, b"", ("", 0))
+        return batch
+
+    def get(self, item_id: int, location: int, quality: int) -> Optional[Dict[str, Any]]:
+        """
+        Obtém a janela atual de um (item, local, qualidade).
+
+        Args:
+            item_id (int): Id do item
+            location (int): Local do mercado
+            quality (int): Qualidade do item
+
+        Returns:
+            Optional[Dict[str, Any]]: Campos de DELTA_FIELDS ou None
+        """
+        key = (item_id, location, quality)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            return dict(zip(DELTA_FIELDS, entry.as_row(key, self.window)))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retorna as estatísticas do agregador.
+
+        Returns:
+            Dict[str, Any]: Ordens recebidas, repetidas, chaves mantidas e linhas publicadas
+        """
+        return {
+            "orders": self.orders,
+            "duplicates": self.duplicates,
+            "entries": len(self._entries),
+            "batches": self.batches,
+            "rows_emitted": self.rows_emitted,
+            "reduction": (self.orders / self.rows_emitted) if self.rows_emitted else 0.0
+        }
+
+    def _retire(self, key: Tuple[int, int, int], entry: MarketEntry) -> None:
+        """
+        Guarda a última versão de uma entrada que deixa de ser mantida (com o lock adquirido).
+        """
+        if key in self._dirty:
+            self._dirty.discard(key)
+            self._closed.append(entry.as_row(key, self.window))
+
+    def _flush_loop(self) -> None:
+        """
+        Loop da publicação periódica dos lotes delta.
+        """
+        while not self._stop_event.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                self.logger.error(f"Erro ao publicar lote de mercado: {str(e)}")
@@ -0,0 +1,367 @@
+import time
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from core.base import BaseComponent
+from core.bus import EventBus
+
+# Fases de um respawn acompanhado
+PHASE_SOON = "soon"        # Faltam warn_before segundos para o tempo mínimo
+PHASE_MIN = "min"          # Tempo mínimo atingido: pode ter reaparecido
+PHASE_MAX = "max"          # Tempo máximo atingido: já reapareceu
+
+
+class TimerWheel:
+    """
+    Roda de temporizadores hierárquica (estilo kernel Linux).
+
+    Cada nível tem 2**slot_bits slots; o nível 0 tem a resolução de um tick e cada
+    nível seguinte cobre 2**slot_bits vezes mais tempo. Agendar é O(1) (o nível e o
+    slot saem do prazo) e cada tick examina um slot do nível 0; quando o nível 0 dá
+    uma volta, o slot correspondente do nível de cima é redistribuído nos níveis
+    inferiores (custo amortizado O(1) por temporizador).
+    """
+
+    def __init__(self, slot_bits: int = 6, levels: int = 4):
+        """
+        Inicializa a roda.
+
+        Args:
+            slot_bits (int): Bits de slot por nível (64 slots com o padrão)
+            levels (int): Quantidade de níveis (64**4 ticks de alcance com o padrão)
+        """
+        self.slot_bits = slot_bits
+        self.levels = levels
+        self.tick = 0
+        self._mask = (1 << slot_bits) - 1
+        self._span = 1 << (slot_bits * levels)
+        self._wheels: List[List[List[Tuple[int, Any]]]] = [
+            [[] for _ in range(1 << slot_bits)] for _ in range(levels)
+        ]
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def schedule(self, deadline: int, item: Any) -> None:
+        """
+        Agenda um item para o tick informado.
+
+        Args:
+            deadline (int): Tick de expiração (prazos já vencidos expiram no próximo tick)
+            item (Any): Item devolvido por advance quando o prazo vencer
+        """
+        self._count += 1
+        self._place(max(deadline, self.tick + 1), item)
+
+    def advance(self, to_tick: int) -> List[Any]:
+        """
+        Avança a roda até o tick informado.
+
+        Args:
+            to_tick (int): Tick de destino
+
+        Returns:
+            List[Any]: Itens cujos prazos venceram, em ordem de prazo
+        """
+        expired = []
+        bits, mask, wheels = self.slot_bits, self._mask, self._wheels
+        while self.tick < to_tick:
+            if not self._count:
+                # Roda vazia: não há nada a redistribuir nem a expirar
+                self.tick = to_tick
+                break
+
+            self.tick += 1
+            tick = self.tick
+
+            # Redistribui os níveis superiores cujos slots começam neste tick
+            level = 1
+            while level < self.levels and not (tick & ((1 << (bits * level)) - 1)):
+                index = (tick >> (bits * level)) & mask
+                bucket = wheels[level][index]
+                if bucket:
+                    wheels[level][index] = []
+                    for deadline, item in bucket:
+                        self._place(deadline, item)
+                level += 1
+
+            bucket = wheels[0][tick & mask]
+            if bucket:
+                wheels[0][tick & mask] = []
+                self._count -= len(bucket)
+                expired.extend(item for _, item in bucket)
+        return expired
+
+    def _place(self, deadline: int, item: Any) -> None:
+        delta = deadline - self.tick
+        if delta >= self._span:
+            # Além do alcance: fica no último nível e é reavaliado a cada redistribuição
+            slot_tick = self.tick + self._span - 1
+            level = self.levels - 1
+        else:
+            # Nível = quantos grupos de slot_bits o intervalo ocupa além do primeiro
+            slot_tick = deadline
+            level = (delta.bit_length() - 1) // self.slot_bits if delta > 0 else 0
+        self._wheels[level][(slot_tick >> (self.slot_bits * level)) & self._mask].append((deadline, item))
+
+
+class RespawnTracker(BaseComponent):
+    """
+    Acompanha mobs mortos e recursos esgotados e avisa quando vão reaparecer.
+
+    Para cada morte ou coleta observada, arma temporizadores para o aviso prévio
+    (PHASE_SOON), para o tempo mínimo (PHASE_MIN) e para o tempo máximo (PHASE_MAX)
+    de respawn, obtidos do catálogo do servidor (respawntimesecondsmin/max dos mobs e
+    respawntimeseconds dos recursos). Os temporizadores ficam em uma TimerWheel; uma
+    nova observação do mesmo objeto invalida os temporizadores anteriores sem removê-los
+    (a geração do objeto é conferida quando eles vencem).
+
+    Os avisos são publicados no barramento de saída como detecções do tipo "respawn".
+    """
+
+    KINDS = ("mobs", "harvestables")
+
+    def __init__(
+        self,
+        output: Optional[EventBus] = None,
+        respawn_time: Optional[Callable[[str, int], Optional[Tuple[int, int]]]] = None,
+        tick: float = 1.0,
+        warn_before: float = 30.0
+    ):
+        """
+        Inicializa o rastreador de respawn.
+
+        Args:
+            output (EventBus, optional): Barramento que recebe os avisos de respawn
+            respawn_time (Callable, optional): Função (tipo, id do tipo) -> (mínimo, máximo) em
+                                               segundos, como CatalogCache.respawn_time
+            tick (float): Resolução dos temporizadores em segundos
+            warn_before (float): Antecedência, em segundos, do aviso de respawn próximo
+        """
+        super().__init__("RespawnTracker")
+        self.output = output
+        self.respawn_time = respawn_time
+        self.tick = tick
+        self.warn_before = warn_before
+
+        self.tracked = 0
+        self.unknown = 0
+        self.alerts = 0
+
+        self._wheel = TimerWheel()
+        self._origin = time.monotonic()
+        self._pending: Dict[Tuple[str, int], Dict[str, Any]] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self) -> bool:
+        """
+        Inicia a thread que avança a roda de temporizadores.
+
+        Returns:
+            bool: True se iniciado com sucesso
+        """
+        if self._running:
+            return True
+
+        self._running = True
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._tick_loop, name="RespawnTracker", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self) -> bool:
+        """
+        Para a thread de temporizadores.
+
+        Returns:
+            bool: True se parado com sucesso
+        """
+        if not self._running:
+            return True
+
+        self._running = False
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        return True
+
+    def attach(self, bus: EventBus) -> None:
+        """
+        Registra o rastreador como assinante das mortes de mobs ("mob_killed") e dos
+        recursos esgotados ("harvestable_depleted"). As detecções devem trazer o id do
+        objeto ("id"), o id do tipo no catálogo ("type_id") e, opcionalmente, "position".
+
+        Args:
+            bus (EventBus): Barramento de detecções
+        """
+        bus.subscribe("mob_killed", self.handle_detection, name="RespawnTracker.mobs")
+        bus.subscribe("harvestable_depleted", self.handle_detection, name="RespawnTracker.harvestables")
+
+    def handle_detection(self, processor_name: str, result: Dict[str, Any], data: bytes, addr: tuple) -> None:
+        """
+        Assinante do barramento: arma os temporizadores do objeto.
+
+        Args:
+            processor_name (str): Nome do processador que identificou o pacote
+            result (dict): Dados da morte ou coleta
+            data (bytes): Dados brutos do pacote
+            addr (tuple): Endereço de origem (IP, porta)
+        """
+        kind = "mobs" if result.get("type") == "mob_killed" else "harvestables"
+        self.track(kind, result["id"], result["type_id"], position=result.get("position"))
+
+    def track(
+        self,
+        kind: str,
+        object_id: int,
+        type_id: int,
+        timestamp: Optional[float] = None,
+        position: Optional[Dict[str, float]] = None,
+        respawn: Optional[Tuple[float, float]] = None
+    ) -> bool:
+        """
+        Arma os temporizadores de um mob morto ou recurso esgotado.
+
+        Args:
+            kind (str): "mobs" ou "harvestables"
+            object_id (int): Id do objeto no mundo
+            type_id (int): Id do tipo no catálogo
+            timestamp (float, optional): Momento da morte/coleta (relógio monotônico, padrão: agora)
+            position (dict, optional): Posição do objeto
+            respawn (Tuple[float, float], optional): (mínimo, máximo) em segundos; padrão: do catálogo
+
+        Returns:
+            bool: False se o tempo de respawn do tipo for desconhecido
+        """
+        if respawn is None and self.respawn_time is not None:
+            respawn = self.respawn_time(kind, type_id)
+        if respawn is None:
+            self.unknown += 1
+            return False
+
+        now = time.monotonic() if timestamp is None else timestamp
+        respawn_min, respawn_max = respawn
+        key = (kind, object_id)
+
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+            self._pending[key] = {
+                "kind": kind,
+                "id": object_id,
+                "type_id": type_id,
+                "position": position,
+                "since": now,
+                "respawn_min": now + respawn_min,
+                "respawn_max": now + respawn_max,
+                "generation": generation
+            }
+
+            phases = [(PHASE_MIN, now + respawn_min), (PHASE_MAX, now + max(respawn_min, respawn_max))]
+            if respawn_min > self.warn_before:
+                phases.insert(0, (PHASE_SOON, now + respawn_min - self.warn_before))
+            for phase, deadline in phases:
+                self._wheel.schedule(self._to_tick(deadline), (key, generation, phase))
+            self.tracked += 1
+        return True
+
+    def forget(self, kind: str, object_id: int) -> bool:
+        """
+        Deixa de acompanhar um objeto (por exemplo, quando ele é visto novamente).
+
+        Args:
+            kind (str): "mobs" ou "harvestables"
+            object_id (int): Id do objeto no mundo
+
+        Returns:
+            bool: True se o objeto estava sendo acompanhado
+        """
+        with self._lock:
+            return self._pending.pop((kind, object_id), None) is not None
+
+    def advance(self, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Avança os temporizadores até o momento informado e publica os avisos vencidos.
+
+        Args:
+            now (float, optional): Momento de referência (relógio monotônico, padrão: agora)
+
+        Returns:
+            List[Dict[str, Any]]: Avisos publicados
+        """
+        now = time.monotonic() if now is None else now
+        alerts = []
+        with self._lock:
+            for key, generation, phase in self._wheel.advance(self._to_tick(now)):
+                entry = self._pending.get(key)
+                if entry is None or entry["generation"] != generation:
+                    # Temporizador de uma observação substituída ou esquecida
+                    continue
+                if phase == PHASE_MAX:
+                    del self._pending[key]
+                alerts.append({
+                    "type": "respawn",
+                    "phase": phase,
+                    **{field: value for field, value in entry.items() if field != "generation"}
+                })
+
+        for alert in alerts:
+            self.alerts += 1
+            if alert["phase"] == PHASE_SOON:
+                self.logger.info(
+                    f"Respawn em {alert['respawn_min'] - now:.0f}s - {alert['kind']} {alert['id']} (tipo {alert['type_id']})"
+                )
+            if self.output is not None:
+                self.output.publish(self.name, alert, b"", ("", 0))
+        return alerts
+
+    def pending(self, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Lista os objetos acompanhados, do respawn mais próximo para o mais distante.
+
+        Args:
+            now (float, optional): Momento de referência (relógio monotônico, padrão: agora)
+
+        Returns:
+            List[Dict[str, Any]]: Objetos com os segundos restantes até o respawn mínimo ("eta")
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            entries = [
+                {**{field: value for field, value in entry.items() if field != "generation"}, "eta": entry["respawn_min"] - now}
+                for entry in self._pending.values()
+            ]
+        return sorted(entries, key=lambda entry: entry["eta"])
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retorna as estatísticas do rastreador.
+
+        Returns:
+            Dict[str, Any]: Objetos acompanhados, temporizadores pendentes, tipos sem tempo conhecido e avisos
+        """
+        return {
+            "tracked": self.tracked,
+            "pending": len(self._pending),
+            "timers": len(self._wheel),
+            "unknown": self.unknown,
+            "alerts": self.alerts
+        }
+
+    def _to_tick(self, timestamp: float) -> int:
+        return int((timestamp - self._origin) / self.tick)
+
+    def _tick_loop(self) -> None:
+        """
+        Loop da thread de temporizadores.
+        """
+        while not self._stop_event.wait(self.tick):
+            try:
+                self.advance()
+            except Exception as e:
+                self.logger.error(f"Erro ao avançar os temporizadores de respawn: {str(e)}")
@@ -0,0 +1,17 @@
+"""
+Módulo network - Comunicação do cliente Tanakai com o servidor.
+"""
+
+from .catalog import CatalogCache
+from .codec import BatchCodec, train_dictionary, load_dictionary
+from .uploader import Uploader
+from .stream import StreamSession
+
+__all__ = [
+    "CatalogCache",
+    "BatchCodec",
+    "train_dictionary",
+    "load_dictionary",
+    "Uploader",
+    "StreamSession"
+]
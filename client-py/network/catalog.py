@@ -0,0 +1,281 @@
+import os
+import json
+import threading
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from core.base import BaseComponent
+from storage.catalog import CatalogTable, find_table, table_path, TABLE_SUFFIX
+
+# Arquivo local dos tempos de respawn (JSON), por versão
+RESPAWNS_PREFIX = "respawns-"
+RESPAWNS_SUFFIX = ".json"
+
+
+class CatalogCache(BaseComponent):
+    """
+    Cache local dos catálogos de itens, mobs e recursos coletáveis do servidor, para
+    resolver ids em nomes e tiers nos callbacks sem acessar a rede. Mantém também os
+    tempos de respawn de mobs e recursos, usados pelo RespawnTracker.
+
+    Cada catálogo é baixado uma vez por versão dos dumps do servidor e gravado como
+    uma CatalogTable mapeada em memória. Ao iniciar, as tabelas já existentes são
+    abertas imediatamente; a verificação de versão roda em segundo plano e só baixa
+    os catálogos quando o servidor informa uma versão nova.
+    """
+
+    def __init__(
+        self,
+        server: str,
+        directory: str,
+        kinds: Iterable[str] = ("items", "mobs", "harvestables"),
+        refresh_interval: float = 3600.0,
+        timeout: float = 10.0
+    ):
+        """
+        Inicializa o cache de catálogos.
+
+        Args:
+            server (str): URL base do servidor Tanakai
+            directory (str): Diretório das tabelas locais
+            kinds (Iterable[str]): Catálogos mantidos
+            refresh_interval (float): Intervalo, em segundos, entre verificações de versão (0 desativa)
+            timeout (float): Tempo limite das requisições em segundos
+        """
+        super().__init__("CatalogCache")
+        self.server = server.rstrip("/")
+        self.directory = directory
+        self.kinds = tuple(kinds)
+        self.refresh_interval = refresh_interval
+        self.timeout = timeout
+
+        self.downloads = 0
+        self.lookups = 0
+        self.misses = 0
+
+        self._tables: Dict[str, CatalogTable] = {}
+        self._respawns: Dict[str, Dict[int, Tuple[int, int]]] = {}
+        self._respawns_version: Optional[str] = None
+        # Criada na primeira consulta, já na thread de verificação (o requests é caro de importar)
+        self._session = None
+        self._refresh_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    @property
+    def version(self) -> Optional[str]:
+        """
+        Versão dos catálogos carregados (None se algum ainda não foi baixado).
+        """
+        versions = {table.version for table in self._tables.values()}
+        if len(versions) != 1 or len(self._tables) != len(self.kinds):
+            return None
+        return versions.pop()
+
+    def start(self) -> bool:
+        """
+        Abre as tabelas locais e inicia a verificação de versão em segundo plano.
+
+        Returns:
+            bool: True se iniciado com sucesso
+        """
+        if self._running:
+            return True
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            for kind in self.kinds:
+                path = find_table(self.directory, kind)
+                if path is not None:
+                    self._tables[kind] = CatalogTable(path)
+            self._load_respawns()
+        except Exception as e:
+            self.logger.error(f"Erro ao abrir os catálogos locais: {str(e)}")
+            return False
+
+        self._running = True
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._refresh_loop, name="CatalogCache", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self) -> bool:
+        """
+        Para a verificação de versão.
+
+        Returns:
+            bool: True se parado com sucesso
+        """
+        if not self._running:
+            return True
+
+        self._running = False
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.timeout)
+            self._thread = None
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+        return True
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Consulta a versão do servidor e baixa os catálogos se ela mudou.
+
+        Args:
+            force (bool): Baixa os catálogos mesmo que a versão seja a mesma
+
+        Returns:
+            bool: True se algum catálogo foi atualizado
+        """
+        with self._refresh_lock:
+            if self._session is None:
+                import requests
+
+                self._session = requests.Session()
+            response = self._session.get(f"{self.server}/v1/catalog/version", timeout=self.timeout)
+            response.raise_for_status()
+            version = response.json()["version"]
+
+            updated = False
+            for kind in self.kinds:
+                table = self._tables.get(kind)
+                if not force and table is not None and table.version == version:
+                    continue
+
+                response = self._session.get(f"{self.server}/v1/catalog/{kind}", timeout=self.timeout)
+                response.raise_for_status()
+                catalog = response.json()
+
+                path = CatalogTable.write(
+                    table_path(self.directory, kind, catalog["version"]),
+                    catalog["version"],
+                    catalog["entries"]
+                )
+                # Troca a referência de uma vez; a tabela antiga é liberada quando não houver mais leitores
+                self._tables[kind] = CatalogTable(path)
+                self._remove_old_tables(kind, path)
+                self.downloads += 1
+                updated = True
+                self.logger.info(f"Catálogo '{kind}' atualizado para a versão {catalog['version']} ({len(catalog['entries'])} entradas)")
+
+            if force or self._respawns_version != version:
+                response = self._session.get(f"{self.server}/v1/catalog/respawns", timeout=self.timeout)
+                response.raise_for_status()
+                respawns = response.json()
+
+                path = os.path.join(self.directory, f"{RESPAWNS_PREFIX}{respawns['version']}{RESPAWNS_SUFFIX}")
+                with open(path + ".tmp", "w", encoding="utf-8") as file:
+                    json.dump(respawns, file, separators=(",", ":"))
+                os.replace(path + ".tmp", path)
+                self._load_respawns(path)
+                self._remove_old_files(RESPAWNS_PREFIX, RESPAWNS_SUFFIX, path)
+                self.downloads += 1
+                updated = True
+
+            return updated
+
+    def resolve(self, kind: str, entity_id: int) -> Optional[Tuple[str, int]]:
+        """
+        Resolve um id em (nome, tier).
+
+        Args:
+            kind (str): Catálogo ("items" ou "mobs")
+            entity_id (int): Id do item ou mob
+
+        Returns:
+            Optional[Tuple[str, int]]: (nome, tier) ou None se o catálogo ou o id não existir
+        """
+        self.lookups += 1
+        table = self._tables.get(kind)
+        found = table.lookup(entity_id) if table is not None else None
+        if found is None:
+            self.misses += 1
+        return found
+
+    def respawn_time(self, kind: str, type_id: int) -> Optional[Tuple[int, int]]:
+        """
+        Obtém o tempo de respawn de um tipo de mob ou recurso.
+
+        Args:
+            kind (str): "mobs" ou "harvestables"
+            type_id (int): Id do tipo no catálogo
+
+        Returns:
+            Optional[Tuple[int, int]]: (mínimo, máximo) em segundos, ou None se desconhecido
+        """
+        return self._respawns.get(kind, {}).get(type_id)
+
+    def item(self, item_id: int) -> Optional[Tuple[str, int]]:
+        return self.resolve("items", item_id)
+
+    def mob(self, mob_id: int) -> Optional[Tuple[str, int]]:
+        return self.resolve("mobs", mob_id)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retorna as estatísticas do cache.
+
+        Returns:
+            Dict[str, Any]: Versão, entradas por catálogo, downloads, consultas e ids não encontrados
+        """
+        return {
+            "version": self.version,
+            "entries": {kind: len(table) for kind, table in self._tables.items()},
+            "respawns": {kind: len(times) for kind, times in self._respawns.items()},
+            "downloads": self.downloads,
+            "lookups": self.lookups,
+            "misses": self.misses
+        }
+
+    def _load_respawns(self, path: Optional[str] = None) -> None:
+        """
+        Carrega os tempos de respawn do arquivo informado ou do mais recente no diretório.
+        """
+        if path is None:
+            names = [
+                name for name in os.listdir(self.directory)
+                if name.startswith(RESPAWNS_PREFIX) and name.endswith(RESPAWNS_SUFFIX)
+            ]
+            if not names:
+                return
+            path = max((os.path.join(self.directory, name) for name in names), key=os.path.getmtime)
+
+        with open(path, "r", encoding="utf-8") as file:
+            respawns = json.load(file)
+
+        self._respawns = {
+            "mobs": {entry[0]: (entry[1], entry[2]) for entry in respawns.get("mobs", [])},
+            "harvestables": {entry[0]: (entry[1], entry[1]) for entry in respawns.get("harvestables", [])}
+        }
+        self._respawns_version = respawns.get("version")
+
+    def _remove_old_tables(self, kind: str, current: str) -> None:
+        """
+        Remove as tabelas de versões anteriores (ignorando as que ainda estiverem em uso).
+        """
+        self._remove_old_files(f"{kind}-", TABLE_SUFFIX, current)
+
+    def _remove_old_files(self, prefix: str, suffix: str, current: str) -> None:
+        """
+        Remove os arquivos de versões anteriores (ignorando os que ainda estiverem em uso).
+        """
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name.startswith(prefix) and name.endswith(suffix) and path != current:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def _refresh_loop(self) -> None:
+        """
+        Loop da verificação de versão: uma vez ao iniciar e depois a cada refresh_interval.
+        """
+        while True:
+            try:
+                self.refresh()
+            except Exception as e:
+                self.logger.warning(f"Não foi possível atualizar os catálogos: {str(e)}")
+            if self.refresh_interval <= 0 or self._stop_event.wait(self.refresh_interval):
+                break
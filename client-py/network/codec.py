@@ -0,0 +1,168 @@
+import re
+import gzip
+import zlib
+import struct
+from collections import Counter
+from typing import Iterable, Optional
+
+# Cabeçalho dos lotes compactados com dicionário: assinatura + id do dicionário (CRC32)
+ZDICT_MAGIC = b"TZ"
+ZDICT_HEADER = struct.Struct("<2sI")
+
+# Valores de Content-Encoding de cada formato
+ENCODING_GZIP = "gzip"
+ENCODING_ZDICT = "x-tanakai-zdict"
+
+# Tamanho máximo de um dicionário do zlib (janela de 32 KiB)
+MAX_DICTIONARY_BYTES = 32 * 1024
+
+# Números (ids, coordenadas, timestamps) separam os trechos repetidos das detecções em JSON
+_NUMBER = re.compile(rb"-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?")
+
+
+def dictionary_id(dictionary: bytes) -> int:
+    """
+    Calcula o id de um dicionário (CRC32 do conteúdo).
+
+    Args:
+        dictionary (bytes): Dicionário
+
+    Returns:
+        int: Id do dicionário
+    """
+    return zlib.crc32(dictionary)
+
+
+def train_dictionary(samples: Iterable[bytes], size: int = 16 * 1024) -> bytes:
+    """
+    Treina um dicionário para o zlib a partir de detecções gravadas (uma linha NDJSON por amostra).
+
+    As linhas são quebradas nos números; os trechos restantes (nomes de campos, tipos,
+    nomes únicos de itens...) são pontuados por frequência x tamanho e os melhores entram
+    no dicionário até o tamanho pedido (trechos que aparecem uma única vez ficam de fora,
+    então o dicionário pode ser menor). O zlib alcança referências mais próximas com
+    menos bits, então os trechos mais valiosos ficam no fim.
+
+    Args:
+        samples (Iterable[bytes]): Linhas NDJSON de tráfego gravado
+        size (int): Tamanho máximo do dicionário em bytes
+
+    Returns:
+        bytes: Dicionário
+    """
+    size = min(size, MAX_DICTIONARY_BYTES)
+    counts: Counter = Counter()
+    for sample in samples:
+        counts.update(fragment for fragment in _NUMBER.split(sample) if len(fragment) > 2)
+
+    chosen = []
+    total = 0
+    for fragment, count in sorted(counts.items(), key=lambda item: item[1] * len(item[0]), reverse=True):
+        if count < 2:
+            break
+        if total + len(fragment) > size:
+            continue
+        chosen.append(fragment)
+        total += len(fragment)
+
+    chosen.reverse()
+    return b"".join(chosen)
+
+
+class BatchCodec:
+    """
+    Compacta os lotes NDJSON enviados ao servidor.
+
+    Sem dicionário usa gzip. Com dicionário usa zlib com dicionário pré-definido (zdict),
+    que aproveita os trechos repetidos já no primeiro byte do lote; o corpo leva o id do
+    dicionário para que o servidor escolha o mesmo dicionário para descompactar.
+    """
+
+    def __init__(self, dictionary: Optional[bytes] = None, level: int = 6):
+        """
+        Inicializa o codec.
+
+        Args:
+            dictionary (bytes, optional): Dicionário treinado com train_dictionary (None usa gzip)
+            level (int): Nível de compressão (1 a 9)
+        """
+        if dictionary is not None and len(dictionary) > MAX_DICTIONARY_BYTES:
+            dictionary = dictionary[-MAX_DICTIONARY_BYTES:]
+        self.dictionary = dictionary or None
+        self.dictionary_id = dictionary_id(self.dictionary) if self.dictionary else None
+        self.level = level
+
+    @property
+    def encoding(self) -> str:
+        """
+        Content-Encoding dos lotes gerados por este codec.
+        """
+        return ENCODING_ZDICT if self.dictionary else ENCODING_GZIP
+
+    def encode(self, raw: bytes) -> bytes:
+        """
+        Compacta um lote.
+
+        Args:
+            raw (bytes): Lote NDJSON
+
+        Returns:
+            bytes: Lote compactado
+        """
+        if not self.dictionary:
+            return gzip.compress(raw, compresslevel=self.level)
+
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, -15, 9, zlib.Z_DEFAULT_STRATEGY, self.dictionary)
+        return ZDICT_HEADER.pack(ZDICT_MAGIC, self.dictionary_id) + compressor.compress(raw) + compressor.flush()
+
+    def decode(self, body: bytes) -> bytes:
+        """
+        Descompacta um lote gerado por encode (usado em testes e benchmarks).
+
+        Args:
+            body (bytes): Lote compactado
+
+        Returns:
+            bytes: Lote NDJSON
+
+        Raises:
+            ValueError: Se o lote usar outro dicionário
+        """
+        if not body.startswith(ZDICT_MAGIC):
+            return gzip.decompress(body)
+
+        _, body_dictionary = ZDICT_HEADER.unpack_from(body)
+        if body_dictionary != self.dictionary_id:
+            raise ValueError(f"Lote compactado com o dicionário {body_dictionary:08x}")
+        decompressor = zlib.decompressobj(-15, self.dictionary)
+        return decompressor.decompress(body[ZDICT_HEADER.size:]) + decompressor.flush()
+
+
+def load_dictionary(path: str) -> Optional[bytes]:
+    """
+    Lê um dicionário salvo por scripts/train_dictionary.py.
+
+    Args:
+        path (str): Caminho do arquivo
+
+    Returns:
+        Optional[bytes]: Dicionário ou None se o arquivo não existir ou estiver vazio
+    """
+    try:
+        with open(path, "rb") as file:
+            return file.read(MAX_DICTIONARY_BYTES) or None
+    except FileNotFoundError:
+        return None
+
+
+def encoding_of(body: bytes) -> str:
+    """
+    Identifica o Content-Encoding de um lote compactado (lotes do spool não guardam o cabeçalho).
+
+    Args:
+        body (bytes): Lote compactado
+
+    Returns:
+        str: ENCODING_ZDICT ou ENCODING_GZIP
+    """
+    return ENCODING_ZDICT if body.startswith(ZDICT_MAGIC) else ENCODING_GZIP
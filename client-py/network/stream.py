@@ -0,0 +1,559 @@
+import json
+import time
+import uuid
+import queue
+import random
+import struct
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+
+from core.base import BaseComponent
+from core.bus import EventBus
+from .codec import BatchCodec
+
+if TYPE_CHECKING:
+    import requests
+
+# Rotas da sessão de streaming no servidor
+SESSION_ROUTE = "/v1/client/session"
+DICTIONARY_ROUTE = "/v1/client/dictionaries"
+
+# Cabeçalho de cada quadro: tipo, flags, sequência e tamanho do payload (igual ao do servidor)
+FRAME_HEADER = struct.Struct("<BBII")
+
+# Quadros do cliente para o servidor
+FRAME_BATCH = 1
+
+# Quadros do servidor para o cliente
+FRAME_HELLO = 16
+FRAME_CREDIT = 17
+FRAME_ACK = 18
+FRAME_CATALOG = 19
+FRAME_HEARTBEAT = 20
+
+# Flags dos quadros
+FLAG_GZIP = 1
+FLAG_REJECTED = 2
+FLAG_ZDICT = 4
+FLAG_UNKNOWN_DICT = 8
+
+# Tamanho máximo do payload de um quadro
+MAX_FRAME_BYTES = 16 * 1024 * 1024
+
+
+def encode_frame(kind: int, seq: int = 0, payload: bytes = b"", flags: int = 0) -> bytes:
+    """
+    Monta um quadro binário.
+
+    Args:
+        kind (int): Tipo do quadro
+        seq (int): Número de sequência (ou quantidade, nos quadros de crédito)
+        payload (bytes): Conteúdo do quadro
+        flags (int): Flags do quadro
+
+    Returns:
+        bytes: Quadro pronto para envio
+    """
+    return FRAME_HEADER.pack(kind, flags, seq, len(payload)) + payload
+
+
+class FrameDecoder:
+    """
+    Separa os quadros de um fluxo de bytes recebido em pedaços arbitrários.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def feed(self, data: bytes) -> List[Tuple[int, int, int, bytes]]:
+        """
+        Acrescenta bytes recebidos e retorna os quadros completos.
+
+        Args:
+            data (bytes): Bytes recebidos
+
+        Returns:
+            List[Tuple[int, int, int, bytes]]: (tipo, flags, seq, payload) de cada quadro completo
+
+        Raises:
+            ValueError: Se um quadro exceder MAX_FRAME_BYTES
+        """
+        self._buffer += data
+        frames = []
+        offset = 0
+        size = len(self._buffer)
+        while offset + FRAME_HEADER.size <= size:
+            kind, flags, seq, length = FRAME_HEADER.unpack_from(self._buffer, offset)
+            if length > MAX_FRAME_BYTES:
+                raise ValueError(f"Quadro de {length} bytes excede o tamanho máximo")
+            end = offset + FRAME_HEADER.size + length
+            if end > size:
+                break
+            frames.append((kind, flags, seq, bytes(self._buffer[offset + FRAME_HEADER.size:end])))
+            offset = end
+        del self._buffer[:offset]
+        return frames
+
+
+class StreamSession(BaseComponent):
+    """
+    Sessão de streaming com o servidor para dados ao vivo (combate, posições...).
+
+    Usa duas conexões HTTP de longa duração: um POST com corpo chunked que leva os
+    lotes de detecções em quadros binários e um GET em streaming que traz os quadros
+    do servidor. O controle de fluxo é por créditos: cada lote consome um crédito e o
+    servidor devolve um crédito por lote processado, junto com o ACK. Lotes sem ACK
+    ficam guardados e são reenviados com o mesmo número de sequência após uma
+    reconexão (o servidor descarta os que já havia contabilizado). O servidor também
+    avisa quando a versão dos catálogos muda.
+
+    Em relação ao Uploader, os lotes são pequenos e fechados a cada flush_interval
+    (dezenas de milissegundos) sem o custo de uma requisição por lote. Lotes tão pequenos
+    comprimem mal com gzip; com um dicionário treinado (dictionary) eles usam zlib com
+    dicionário pré-definido, enviado ao servidor no início de cada sessão.
+    """
+
+    def __init__(
+        self,
+        server: str,
+        batch_size: int = 500,
+        flush_interval: float = 0.05,
+        buffer_size: int = 200000,
+        compress_level: int = 1,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        timeout: float = 10.0,
+        on_catalog_version: Optional[Callable[[str], None]] = None,
+        dictionary: Optional[bytes] = None
+    ):
+        """
+        Inicializa a sessão de streaming.
+
+        Args:
+            server (str): URL base do servidor Tanakai
+            batch_size (int): Quantidade máxima de detecções por lote
+            flush_interval (float): Tempo máximo, em segundos, até o envio de um lote
+            buffer_size (int): Quantidade máxima de detecções aguardando envio
+            compress_level (int): Nível de compressão dos lotes (0 desativa)
+            backoff (float): Espera base, em segundos, entre tentativas de reconexão
+            max_backoff (float): Espera máxima, em segundos, entre tentativas de reconexão
+            timeout (float): Tempo limite de conexão e de silêncio do servidor, em segundos
+            on_catalog_version (Callable, optional): Chamada com a nova versão quando os catálogos mudam
+            dictionary (bytes, optional): Dicionário de compressão treinado com train_dictionary (None usa gzip)
+        """
+        super().__init__("StreamSession")
+        self.base = server.rstrip("/") + SESSION_ROUTE
+        self.dictionary_url = server.rstrip("/") + DICTIONARY_ROUTE
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.buffer_size = buffer_size
+        self.compress_level = compress_level
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.on_catalog_version = on_catalog_version
+        self.codec = BatchCodec(dictionary, compress_level or 1)
+
+        self.session_id: Optional[str] = None
+        self.catalog_version: Optional[str] = None
+        self.connected = False
+
+        self.received = 0
+        self.dropped = 0
+
+        # Tipos de detecção ignorados pelo assinante do barramento (ver attach)
+        self.exclude_kinds: FrozenSet[str] = frozenset()
+        self.sent = 0
+        self.acked = 0
+        self.rejected = 0
+        self.resent = 0
+        self.batches = 0
+        self.raw_bytes = 0
+        self.sent_bytes = 0
+        self.reconnects = 0
+        self.credit_waits = 0
+        self.ack_time = 0.0
+        self.max_ack_time = 0.0
+
+        self._prefix = uuid.uuid4().hex[:12]
+        self._sequence = 0
+        self._credits = 0
+        self._unacked: Dict[int, Tuple[bytes, float, int]] = {}
+        self._buffer: List[Tuple[float, Dict[str, Any]]] = []
+        self._buffer_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._credit_cond = threading.Condition(self._lock)
+        self._outbox: Optional["queue.Queue[Optional[bytes]]"] = None
+        self._http: Optional["requests.Session"] = None
+        self._events_response = None
+        self._started_at = 0.0
+        self._wake = threading.Event()
+        self._stop_event = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> bool:
+        """
+        Inicia a conexão com o servidor (com reconexão automática) e a thread de envio.
+
+        Returns:
+            bool: True se iniciado com sucesso
+        """
+        if self._running:
+            return True
+
+        self._running = True
+        self._started_at = time.monotonic()
+        self._stop_event.clear()
+        self._threads = [
+            threading.Thread(target=self._connection_loop, name="StreamSession", daemon=True),
+            threading.Thread(target=self._flush_loop, name="StreamSession.flush", daemon=True)
+        ]
+        for thread in self._threads:
+            thread.start()
+        return True
+
+    def stop(self) -> bool:
+        """
+        Envia o que ainda estiver em memória (se houver créditos), espera os ACKs por
+        até timeout segundos e encerra a sessão.
+
+        Returns:
+            bool: True se parado com sucesso
+        """
+        if not self._running:
+            return True
+
+        self._running = False
+        self._stop_event.set()
+        self._wake.set()
+        with self._credit_cond:
+            self._credit_cond.notify_all()
+
+        # O envio termina primeiro; depois espera os ACKs pendentes e fecha as conexões
+        self._threads[1].join(timeout=self.timeout)
+        deadline = time.monotonic() + self.timeout
+        while self._unacked and self.connected and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self._disconnect()
+        self._threads[0].join(timeout=self.timeout)
+        self._threads = []
+
+        if self._http is not None:
+            import requests
+
+            if self.session_id is not None:
+                try:
+                    self._http.delete(f"{self.base}/{self.session_id}", timeout=self.timeout)
+                except requests.RequestException:
+                    pass
+            self._http.close()
+            self._http = None
+        return True
+
+    def attach(self, bus: EventBus, kind: str = EventBus.ALL, exclude: Iterable[str] = ()) -> None:
+        """
+        Registra a sessão como assinante do barramento de detecções.
+
+        Args:
+            bus (EventBus): Barramento de detecções
+            kind (str): Tipo de detecção enviado (padrão: todos)
+            exclude (Iterable[str]): Tipos não enviados, como os já resumidos por um agregador
+                                     (ex.: "market", substituído pelos lotes "market_delta")
+        """
+        self.exclude_kinds = frozenset(exclude)
+        bus.subscribe(kind, self.handle_detection, name="StreamSession")
+
+    def handle_detection(self, processor_name: str, result: Dict[str, Any], data: bytes, addr: tuple) -> None:
+        """
+        Assinante do barramento: guarda a detecção para o próximo lote.
+
+        Args:
+            processor_name (str): Nome do processador que identificou o pacote
+            result (dict): Resultado do processamento
+            data (bytes): Dados brutos do pacote
+            addr (tuple): Endereço de origem (IP, porta)
+        """
+        if result.get("type") in self.exclude_kinds:
+            return
+        self.append(result)
+
+    def append(self, result: Dict[str, Any], timestamp: Optional[float] = None) -> bool:
+        """
+        Guarda uma detecção para envio, sem bloquear.
+
+        Args:
+            result (dict): Resultado do processador
+            timestamp (float, optional): Momento da detecção (padrão: agora)
+
+        Returns:
+            bool: False se a detecção foi descartada por buffer cheio
+        """
+        with self._buffer_lock:
+            if len(self._buffer) >= self.buffer_size:
+                self.dropped += 1
+                return False
+            self._buffer.append((time.time() if timestamp is None else timestamp, result))
+            self.received += 1
+            full = len(self._buffer) >= self.batch_size
+        if full:
+            self._wake.set()
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retorna as estatísticas da sessão.
+
+        Returns:
+            Dict[str, Any]: Estado da conexão, detecções recebidas, enviadas, confirmadas e
+                            descartadas, lotes, créditos, reconexões e tempo até o ACK
+        """
+        elapsed = time.monotonic() - self._started_at if self._started_at else 0.0
+        return {
+            "connected": self.connected,
+            "session": self.session_id,
+            "received": self.received,
+            "sent": self.sent,
+            "acked": self.acked,
+            "dropped": self.dropped,
+            "rejected": self.rejected,
+            "pending": len(self._buffer),
+            "unacked": len(self._unacked),
+            "credits": self._credits,
+            "batches": self.batches,
+            "resent": self.resent,
+            "reconnects": self.reconnects,
+            "credit_waits": self.credit_waits,
+            "events_per_second": self.acked / elapsed if elapsed else 0.0,
+            "bytes_per_event": self.sent_bytes / self.sent if self.sent else 0.0,
+            "compression_ratio": self.raw_bytes / self.sent_bytes if self.sent_bytes else 0.0,
+            "dictionary": f"{self.codec.dictionary_id:08x}" if self.codec.dictionary else None,
+            "avg_ack_ms": self.ack_time / self.batches * 1000 if self.batches else 0.0,
+            "max_ack_ms": self.max_ack_time * 1000
+        }
+
+    def _encode(self, events: List[Tuple[float, Dict[str, Any]]]) -> Tuple[bytes, int]:
+        """
+        Monta o payload de um lote: uma detecção JSON por linha, compactado pelo codec
+        (com dicionário ou gzip) ou sem compressão.
+        """
+        dumps = json.dumps
+        payload = "\n".join(
+            dumps({"ts": timestamp, **result}, separators=(",", ":"), default=str)
+            for timestamp, result in events
+        ).encode()
+        self.raw_bytes += len(payload)
+        if not self.compress_level:
+            return payload, 0
+        return self.codec.encode(payload), FLAG_ZDICT if self.codec.dictionary else FLAG_GZIP
+
+    def _flush_loop(self) -> None:
+        """
+        Loop da thread de envio: fecha um lote por intervalo ou quando o buffer enche,
+        esperando créditos do servidor quando eles acabam.
+        """
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            stopping = self._stop_event.is_set()
+            deadline = time.monotonic() + self.timeout
+
+            try:
+                while self._buffer:
+                    with self._credit_cond:
+                        if self._credits <= 0 or self._outbox is None:
+                            # Ao parar, espera créditos apenas enquanto houver conexão, até o tempo limite
+                            if stopping and (self._outbox is None or time.monotonic() > deadline):
+                                break
+                            self.credit_waits += 1
+                            self._credit_cond.wait(self.flush_interval)
+                            continue
+                        self._credits -= 1
+                        outbox = self._outbox
+
+                    with self._buffer_lock:
+                        events, self._buffer = self._buffer[:self.batch_size], self._buffer[self.batch_size:]
+                    payload, flags = self._encode(events)
+
+                    with self._lock:
+                        self._sequence += 1
+                        frame = encode_frame(FRAME_BATCH, self._sequence, payload, flags)
+                        self._unacked[self._sequence] = (frame, time.monotonic(), len(events))
+                    outbox.put(frame)
+                    self.sent += len(events)
+                    self.sent_bytes += len(frame)
+            except Exception as e:
+                self.logger.error(f"Erro ao enviar lote pela sessão de streaming: {str(e)}")
+
+            if stopping:
+                break
+
+    def _connection_loop(self) -> None:
+        """
+        Loop da conexão: cria a sessão, abre as duas conexões e reconecta com espera
+        exponencial e jitter quando alguma delas cai. O requests é importado aqui, fora
+        do início do cliente, por ser caro de importar.
+        """
+        import requests
+
+        self._http = requests.Session()
+        failures = 0
+        while not self._stop_event.is_set():
+            try:
+                self._run_session()
+                failures = 0
+            except Exception as e:
+                if not self._stop_event.is_set():
+                    self.logger.warning(f"Sessão de streaming interrompida: {str(e)}")
+            finally:
+                self._disconnect()
+
+            if self._stop_event.is_set():
+                break
+            failures += 1
+            self.reconnects += 1
+            delay = random.uniform(0, min(self.max_backoff, self.backoff * (2 ** (failures - 1))))
+            self._stop_event.wait(delay)
+
+    def _run_session(self) -> None:
+        """
+        Envia o dicionário de compressão, cria uma sessão, reenvia os lotes sem ACK e lê os
+        quadros do servidor até a conexão cair.
+        """
+        if self.compress_level and self.codec.dictionary:
+            # O servidor pode ter reiniciado sem o dicionário: ele é reenviado a cada sessão
+            response = self._http.post(
+                self.dictionary_url,
+                data=self.codec.dictionary,
+                headers={"Content-Type": "application/octet-stream"},
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+
+        response = self._http.post(self.base, json={"prefix": self._prefix}, timeout=self.timeout)
+        response.raise_for_status()
+        hello = response.json()
+        self.session_id = hello["session"]
+        self._set_catalog_version(hello.get("catalog_version"))
+
+        self._events_response = self._http.get(
+            f"{self.base}/{self.session_id}/events", stream=True, timeout=(self.timeout, self.timeout)
+        )
+        self._events_response.raise_for_status()
+
+        outbox: "queue.Queue[Optional[bytes]]" = queue.Queue()
+        with self._credit_cond:
+            # Lotes sem ACK da conexão anterior são reenviados primeiro e consomem créditos
+            pending = [self._unacked[seq][0] for seq in sorted(self._unacked)]
+            self.resent += len(pending)
+            for frame in pending:
+                outbox.put(frame)
+            self._credits = hello.get("credits", 0) - len(pending)
+            self._outbox = outbox
+            self._credit_cond.notify_all()
+
+        sender = threading.Thread(target=self._send_batches, args=(outbox,), name="StreamSession.batches", daemon=True)
+        sender.start()
+        self.connected = True
+        self.logger.info(f"Sessão de streaming {self.session_id} conectada")
+
+        decoder = FrameDecoder()
+        try:
+            for chunk in self._events_response.iter_content(chunk_size=None):
+                for kind, flags, seq, payload in decoder.feed(chunk):
+                    self._handle_frame(kind, flags, seq, payload)
+        finally:
+            outbox.put(None)
+            sender.join(timeout=self.timeout)
+
+    def _send_batches(self, outbox: "queue.Queue[Optional[bytes]]") -> None:
+        """
+        Mantém o POST chunked aberto, escrevendo cada quadro assim que ele é colocado na fila.
+        """
+        def frames() -> Iterator[bytes]:
+            while True:
+                frame = outbox.get()
+                if frame is None:
+                    return
+                yield frame
+
+        import requests
+
+        try:
+            self._http.post(
+                f"{self.base}/{self.session_id}/batches",
+                data=frames(),
+                headers={"Content-Type": "application/octet-stream"},
+                timeout=(self.timeout, None)
+            )
+        except requests.RequestException as e:
+            if not self._stop_event.is_set():
+                self.logger.warning(f"Conexão de lotes da sessão de streaming encerrada: {str(e)}")
+        finally:
+            # Derruba a conexão de eventos para que o loop de conexão reconecte
+            response = self._events_response
+            if response is not None and self.connected:
+                response.close()
+
+    def _handle_frame(self, kind: int, flags: int, seq: int, payload: bytes) -> None:
+        """
+        Trata um quadro recebido do servidor.
+        """
+        if kind == FRAME_ACK and flags & FLAG_UNKNOWN_DICT:
+            # Lote fica sem ACK; a reconexão reenvia o dicionário e depois o lote
+            self.logger.warning(f"Servidor não conhece o dicionário do lote {seq}, reconectando")
+            response = self._events_response
+            if response is not None:
+                response.close()
+        elif kind == FRAME_ACK:
+            with self._lock:
+                entry = self._unacked.pop(seq, None)
+            if entry is None:
+                return
+            elapsed = time.monotonic() - entry[1]
+            self.batches += 1
+            self.ack_time += elapsed
+            if elapsed > self.max_ack_time:
+                self.max_ack_time = elapsed
+            if flags & FLAG_REJECTED:
+                self.rejected += entry[2]
+                self.logger.error(f"Lote {seq} recusado pelo servidor")
+            else:
+                self.acked += entry[2]
+        elif kind == FRAME_CREDIT:
+            with self._credit_cond:
+                self._credits += seq
+                self._credit_cond.notify_all()
+        elif kind == FRAME_CATALOG:
+            self._set_catalog_version(json.loads(payload).get("version"))
+
+    def _set_catalog_version(self, version: Optional[str]) -> None:
+        """
+        Guarda a versão dos catálogos informada pelo servidor, avisando se ela mudou.
+        """
+        previous, self.catalog_version = self.catalog_version, version
+        if previous is not None and version != previous and self.on_catalog_version is not None:
+            self.logger.info(f"Nova versão dos catálogos no servidor: {version}")
+            threading.Thread(target=self._notify_catalog, args=(version,), name="StreamSession.catalog", daemon=True).start()
+
+    def _notify_catalog(self, version: str) -> None:
+        """
+        Chama on_catalog_version fora da thread de leitura da sessão.
+        """
+        try:
+            self.on_catalog_version(version)
+        except Exception as e:
+            self.logger.warning(f"Não foi possível atualizar os catálogos para a versão {version}: {str(e)}")
+
+    def _disconnect(self) -> None:
+        """
+        Fecha as conexões da sessão atual; os lotes sem ACK ficam para a próxima.
+        """
+        self.connected = False
+        with self._credit_cond:
+            if self._outbox is not None:
+                self._outbox.put(None)
+            self._outbox = None
+            self._credits = 0
+        if self._events_response is not None:
+            self._events_response.close()
+            self._events_response = None
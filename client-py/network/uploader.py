@@ -0,0 +1,549 @@
+import json
+import time
+import uuid
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from core.base import BaseComponent
+from core.bus import EventBus
+from storage.spool import UploadSpool, SpooledBatch
+from .codec import BatchCodec, ZDICT_HEADER, ZDICT_MAGIC, encoding_of
+
+if TYPE_CHECKING:
+    import requests
+
+# Rota do servidor que recebe os lotes de detecções
+UPLOAD_ROUTE = "/v1/client/detections"
+
+# Rota do servidor que recebe o dicionário de compressão
+DICTIONARY_ROUTE = "/v1/client/dictionaries"
+
+# Respostas que indicam falha temporária (o lote é reenviado)
+RETRY_STATUS = (408, 425, 429, 500, 502, 503, 504)
+
+
+class Uploader(BaseComponent):
+    """
+    Envia as detecções do barramento para o servidor em lotes NDJSON compactados com gzip
+    ou, com um dicionário treinado (dictionary), com zlib e dicionário pré-definido.
+
+    A assinatura do barramento apenas guarda a detecção em memória. Uma thread de
+    envio fecha um lote a cada flush_interval segundos ou assim que batch_size
+    detecções se acumulam, o que vier primeiro, e o entrega a um pool de até
+    max_in_flight envios simultâneos sobre conexões HTTP persistentes. Falhas
+    temporárias são reenviadas com espera exponencial e jitter; cada lote leva um
+    X-Batch-Id para que o servidor ignore reenvios de lotes já recebidos.
+
+    Sem spool, com todos os envios ocupados a thread de envio espera e as detecções
+    continuam acumulando até buffer_size; acima disso são descartadas e contadas.
+
+    Com spool (spool_path), os lotes que esgotam as tentativas e os lotes fechados
+    enquanto todos os envios estão ocupados vão para um UploadSpool em disco; enquanto
+    o spool tiver lotes, os novos lotes também vão para ele, preservando a ordem. Uma
+    thread de reenvio lê os segmentos do mais antigo para o mais novo, envia seus lotes
+    usando os mesmos max_in_flight envios e remove cada segmento confirmado. O spool
+    sobrevive a reinícios do cliente.
+
+    Com dicionário, ele é enviado ao servidor antes do primeiro lote e novamente sempre
+    que o servidor responder que não o conhece (HTTP 409).
+    """
+
+    def __init__(
+        self,
+        server: str,
+        batch_size: int = 2000,
+        flush_interval: float = 1.0,
+        max_in_flight: int = 4,
+        buffer_size: int = 200000,
+        max_retries: int = 5,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        compress_level: int = 6,
+        timeout: float = 10.0,
+        spool_path: Optional[str] = None,
+        spool_bytes: int = 256 * 1024 * 1024,
+        dictionary: Optional[bytes] = None
+    ):
+        """
+        Inicializa o uploader.
+
+        Args:
+            server (str): URL base do servidor Tanakai
+            batch_size (int): Quantidade máxima de detecções por lote
+            flush_interval (float): Tempo máximo, em segundos, até o envio de um lote
+            max_in_flight (int): Quantidade máxima de envios simultâneos (e de conexões no pool)
+            buffer_size (int): Quantidade máxima de detecções aguardando envio
+            max_retries (int): Tentativas adicionais de um lote após falhas temporárias
+            backoff (float): Espera base, em segundos, entre tentativas (dobra a cada tentativa)
+            max_backoff (float): Espera máxima, em segundos, entre tentativas
+            compress_level (int): Nível de compressão (1 a 9)
+            timeout (float): Tempo limite das requisições em segundos
+            spool_path (str, optional): Diretório do spool em disco (None desativa)
+            spool_bytes (int): Tamanho máximo do spool; acima dele os lotes mais antigos são descartados
+            dictionary (bytes, optional): Dicionário de compressão treinado com train_dictionary (None usa gzip)
+        """
+        super().__init__("Uploader")
+        self.url = server.rstrip("/") + UPLOAD_ROUTE
+        self.dictionary_url = server.rstrip("/") + DICTIONARY_ROUTE
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_in_flight = max_in_flight
+        self.buffer_size = buffer_size
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.compress_level = compress_level
+        self.timeout = timeout
+        self.codec = BatchCodec(dictionary, compress_level)
+
+        self.received = 0
+        self.dropped = 0
+
+        # Tipos de detecção ignorados pelo assinante do barramento (ver attach)
+        self.exclude_kinds: FrozenSet[str] = frozenset()
+        self.sent = 0
+        self.failed = 0
+        self.batches = 0
+        self.failed_batches = 0
+        self.retries = 0
+        self.raw_bytes = 0
+        self.sent_bytes = 0
+        self.send_time = 0.0
+        self.spooled = 0
+        self.replayed = 0
+
+        self.spool = UploadSpool(spool_path, max_bytes=spool_bytes) if spool_path else None
+
+        self._buffer: List[Tuple[float, Dict[str, Any]]] = []
+        self._buffer_lock = threading.Lock()
+        self._batch_prefix = uuid.uuid4().hex[:12]
+        self._batch_sequence = 0
+        self._dictionary_sent = False
+        self._dictionary_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._stats_lock = threading.Lock()
+        self._session: Optional["requests.Session"] = None
+        self._session_lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._started_at = 0.0
+        self._wake = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._replay_thread = None
+
+    def start(self) -> bool:
+        """
+        Abre o pool de conexões e inicia a thread de envio.
+
+        Returns:
+            bool: True se iniciado com sucesso
+        """
+        if self._running:
+            return True
+
+        if self.spool is not None:
+            try:
+                self.spool.open()
+            except Exception as e:
+                self.logger.error(f"Erro ao abrir o spool de upload '{self.spool.directory}': {str(e)}")
+                return False
+            if len(self.spool):
+                self.logger.info(f"Spool de upload com {self.spool.events} detecções pendentes de execuções anteriores")
+
+        self._executor = ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix="Uploader")
+
+        self._running = True
+        self._started_at = time.monotonic()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._flush_loop, name="Uploader", daemon=True)
+        self._thread.start()
+        if self.spool is not None:
+            self._replay_thread = threading.Thread(target=self._replay_loop, name="Uploader.replay", daemon=True)
+            self._replay_thread.start()
+        self.logger.info(f"Uploader enviando para '{self.url}'")
+        return True
+
+    def stop(self) -> bool:
+        """
+        Envia o que ainda estiver em memória e encerra a thread e o pool de envio.
+
+        Returns:
+            bool: True se parado com sucesso
+        """
+        if not self._running:
+            return True
+
+        self._running = False
+        self._stop_event.set()
+        self._wake.set()
+        for thread in (self._thread, self._replay_thread):
+            if thread is not None:
+                thread.join(timeout=self.timeout * 2)
+        self._thread = self._replay_thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+        if self.spool is not None:
+            self.spool.close()
+        return True
+
+    def attach(self, bus: EventBus, kind: str = EventBus.ALL, exclude: Iterable[str] = ()) -> None:
+        """
+        Registra o uploader como assinante do barramento de detecções.
+
+        Args:
+            bus (EventBus): Barramento de detecções
+            kind (str): Tipo de detecção enviado (padrão: todos)
+            exclude (Iterable[str]): Tipos não enviados, como os já resumidos por um agregador
+                                     (ex.: "market", substituído pelos lotes "market_delta")
+        """
+        self.exclude_kinds = frozenset(exclude)
+        bus.subscribe(kind, self.handle_detection, name="Uploader")
+
+    def handle_detection(self, processor_name: str, result: Dict[str, Any], data: bytes, addr: tuple) -> None:
+        """
+        Assinante do barramento: guarda a detecção para o próximo lote.
+
+        Args:
+            processor_name (str): Nome do processador que identificou o pacote
+            result (dict): Resultado do processamento
+            data (bytes): Dados brutos do pacote
+            addr (tuple): Endereço de origem (IP, porta)
+        """
+        if result.get("type") in self.exclude_kinds:
+            return
+        self.append(result)
+
+    def append(self, result: Dict[str, Any], timestamp: Optional[float] = None) -> bool:
+        """
+        Guarda uma detecção para envio, sem bloquear.
+
+        Args:
+            result (dict): Resultado do processador
+            timestamp (float, optional): Momento da detecção (padrão: agora)
+
+        Returns:
+            bool: False se a detecção foi descartada por buffer cheio
+        """
+        with self._buffer_lock:
+            if len(self._buffer) >= self.buffer_size:
+                self.dropped += 1
+                return False
+            self._buffer.append((time.time() if timestamp is None else timestamp, result))
+            self.received += 1
+            full = len(self._buffer) >= self.batch_size
+        if full:
+            self._wake.set()
+        return True
+
+    def flush(self) -> int:
+        """
+        Fecha lotes com todas as detecções em memória e os entrega ao pool de envio.
+        Sem spool, bloqueia enquanto todos os envios estiverem ocupados; com spool, grava
+        no spool os lotes que não podem ser enviados imediatamente.
+
+        Returns:
+            int: Quantidade de lotes entregues
+        """
+        with self._buffer_lock:
+            pending, self._buffer = self._buffer, []
+
+        batches = 0
+        for start in range(0, len(pending), self.batch_size):
+            events = pending[start:start + self.batch_size]
+            batch_id, body, raw_size = self._encode(events)
+            if self.spool is not None:
+                # Spool com lotes anteriores ou nenhum envio livre: mantém a ordem e não bloqueia
+                if len(self.spool) or not self._slots.acquire(blocking=False):
+                    self._spool_batch(batch_id, body, len(events), raw_size)
+                    batches += 1
+                    continue
+            else:
+                self._slots.acquire()
+            try:
+                self._executor.submit(self._send, batch_id, body, raw_size, len(events))
+            except RuntimeError:
+                # Pool já encerrado
+                self._slots.release()
+                self.failed += len(events)
+                self.failed_batches += 1
+                continue
+            batches += 1
+        return batches
+
+    def replay(self) -> bool:
+        """
+        Reenvia os segmentos do spool, do mais antigo para o mais novo, com até
+        max_in_flight envios simultâneos. Cada segmento é removido quando todos os seus
+        lotes forem confirmados; a primeira falha interrompe o reenvio.
+
+        Returns:
+            bool: True se o spool ficou vazio
+        """
+        while not self._stop_event.is_set():
+            path = self.spool.oldest()
+            if path is None:
+                return True
+
+            batches = self.spool.read(path)
+            failed = threading.Event()
+            futures = []
+            for batch in batches:
+                self._slots.acquire()
+                if failed.is_set() or self._stop_event.is_set():
+                    self._slots.release()
+                    break
+                futures.append(self._executor.submit(self._replay_batch, batch, failed))
+            for future in futures:
+                future.result()
+            if failed.is_set() or len(futures) < len(batches):
+                return False
+
+            self.spool.remove(path)
+        return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retorna as estatísticas do uploader.
+
+        Returns:
+            Dict[str, Any]: Detecções recebidas, enviadas, descartadas e com falha, lotes,
+                            reenvios, vazão, bytes por detecção e latência dos envios
+        """
+        elapsed = time.monotonic() - self._started_at if self._started_at else 0.0
+        return {
+            "received": self.received,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "pending": len(self._buffer),
+            "batches": self.batches,
+            "failed_batches": self.failed_batches,
+            "retries": self.retries,
+            "events_per_second": self.sent / elapsed if elapsed else 0.0,
+            "bytes_per_event": self.sent_bytes / self.sent if self.sent else 0.0,
+            "compression_ratio": self.raw_bytes / self.sent_bytes if self.sent_bytes else 0.0,
+            "dictionary": f"{self.codec.dictionary_id:08x}" if self.codec.dictionary else None,
+            "avg_send_ms": self.send_time / self.batches * 1000 if self.batches else 0.0,
+            "spooled": self.spooled,
+            "replayed": self.replayed,
+            "spool": self.spool.get_stats() if self.spool is not None else None
+        }
+
+    def _encode(self, events: List[Tuple[float, Dict[str, Any]]]) -> Tuple[str, bytes, int]:
+        """
+        Monta o corpo de um lote: uma detecção JSON por linha, compactado pelo codec.
+        """
+        dumps = json.dumps
+        raw = "\n".join(
+            dumps({"ts": timestamp, **result}, separators=(",", ":"), default=str)
+            for timestamp, result in events
+        ).encode()
+
+        self._batch_sequence += 1
+        batch_id = f"{self._batch_prefix}-{self._batch_sequence}"
+        return batch_id, self.codec.encode(raw), len(raw)
+
+    def _post(self, batch_id: str, body: bytes) -> Optional[bool]:
+        """
+        Faz uma tentativa de envio de um lote.
+
+        Returns:
+            Optional[bool]: True se confirmado, False em falha temporária e None se recusado pelo servidor
+        """
+        encoding = encoding_of(body)
+        if body.startswith(ZDICT_MAGIC) and not self._dictionary_sent and not self._send_dictionary():
+            return False
+
+        headers = {
+            "Content-Type": "application/x-ndjson",
+            "Content-Encoding": encoding,
+            "X-Batch-Id": batch_id
+        }
+        import requests
+
+        try:
+            response = self._http_session().post(self.url, data=body, headers=headers, timeout=self.timeout)
+        except requests.RequestException as e:
+            self.logger.warning(f"Falha ao enviar o lote {batch_id}: {str(e)}")
+            return False
+
+        if response.status_code < 300:
+            return True
+        if response.status_code == 409 and body.startswith(ZDICT_MAGIC):
+            # Servidor não conhece o dicionário: reenvia-o e repete o lote, desde que seja o dicionário atual
+            _, dictionary_id = ZDICT_HEADER.unpack_from(body)
+            if dictionary_id != self.codec.dictionary_id:
+                self.logger.error(f"Lote {batch_id} compactado com o dicionário {dictionary_id:08x}, que não está mais disponível")
+                return None
+            self._dictionary_sent = False
+            return False
+        if response.status_code not in RETRY_STATUS:
+            self.logger.error(f"Lote {batch_id} recusado pelo servidor: HTTP {response.status_code}")
+            return None
+        self.logger.warning(f"Servidor indisponível ao enviar o lote {batch_id}: HTTP {response.status_code}")
+        return False
+
+    def _http_session(self) -> "requests.Session":
+        """
+        Cria a sessão HTTP no primeiro envio, já nas threads de envio: o requests é caro de
+        importar e fica fora do início do cliente.
+        """
+        with self._session_lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_in_flight, max_retries=0)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._session = session
+            return self._session
+
+    def _send_dictionary(self) -> bool:
+        """
+        Envia o dicionário de compressão ao servidor (uma única vez entre os envios simultâneos).
+
+        Returns:
+            bool: True se o servidor confirmou o dicionário
+        """
+        import requests
+
+        with self._dictionary_lock:
+            if self._dictionary_sent:
+                return True
+            try:
+                response = self._http_session().post(
+                    self.dictionary_url,
+                    data=self.codec.dictionary,
+                    headers={"Content-Type": "application/octet-stream"},
+                    timeout=self.timeout
+                )
+                response.raise_for_status()
+            except requests.RequestException as e:
+                self.logger.warning(f"Falha ao enviar o dicionário de compressão: {str(e)}")
+                return False
+
+            self._dictionary_sent = True
+            self.logger.info(f"Dicionário de compressão {self.codec.dictionary_id:08x} enviado ({len(self.codec.dictionary)} bytes)")
+            return True
+
+    def _send(self, batch_id: str, body: bytes, raw_size: int, count: int) -> bool:
+        """
+        Envia um lote, repetindo falhas temporárias com espera exponencial e jitter.
+        Se as tentativas se esgotarem, o lote vai para o spool (se houver).
+        """
+        try:
+            for attempt in range(self.max_retries + 1):
+                if attempt:
+                    with self._stats_lock:
+                        self.retries += 1
+                    # Jitter completo: espera aleatória até o limite exponencial (sem espera ao parar)
+                    delay = random.uniform(0, min(self.max_backoff, self.backoff * (2 ** (attempt - 1))))
+                    self._stop_event.wait(delay)
+
+                started = time.perf_counter()
+                result = self._post(batch_id, body)
+                if result:
+                    self._record_sent(body, raw_size, count, time.perf_counter() - started)
+                    return True
+                if result is None:
+                    break
+
+            if result is False and self.spool is not None:
+                self._spool_batch(batch_id, body, count, raw_size)
+            else:
+                with self._stats_lock:
+                    self.failed += count
+                    self.failed_batches += 1
+            return False
+        finally:
+            self._slots.release()
+
+    def _replay_batch(self, batch: SpooledBatch, failed: threading.Event) -> bool:
+        """
+        Reenvia um lote do spool (uma tentativa; as novas tentativas ficam com o loop de reenvio).
+        """
+        try:
+            if failed.is_set():
+                return False
+            started = time.perf_counter()
+            result = self._post(batch.batch_id, batch.body)
+            if result is False:
+                failed.set()
+                return False
+
+            if result:
+                self._record_sent(batch.body, batch.raw_size, batch.count, time.perf_counter() - started)
+                with self._stats_lock:
+                    self.replayed += 1
+            else:
+                # Recusado pelo servidor: reenviar não adianta, o lote é descartado com o segmento
+                with self._stats_lock:
+                    self.failed += batch.count
+                    self.failed_batches += 1
+            return True
+        finally:
+            self._slots.release()
+
+    def _record_sent(self, body: bytes, raw_size: int, count: int, elapsed: float) -> None:
+        with self._stats_lock:
+            self.send_time += elapsed
+            self.batches += 1
+            self.sent += count
+            self.raw_bytes += raw_size
+            self.sent_bytes += len(body)
+
+    def _spool_batch(self, batch_id: str, body: bytes, count: int, raw_size: int) -> None:
+        try:
+            self.spool.append(batch_id, body, count, raw_size)
+            with self._stats_lock:
+                self.spooled += 1
+        except Exception as e:
+            self.logger.error(f"Erro ao gravar o lote {batch_id} no spool: {str(e)}")
+            with self._stats_lock:
+                self.failed += count
+                self.failed_batches += 1
+
+    def _flush_loop(self) -> None:
+        """
+        Loop da thread de envio: fecha um lote por intervalo ou quando o buffer enche.
+        """
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            stopping = self._stop_event.is_set()
+
+            try:
+                self.flush()
+            except Exception as e:
+                self.logger.error(f"Erro ao enviar lote de detecções: {str(e)}")
+
+            if stopping:
+                break
+
+    def _replay_loop(self) -> None:
+        """
+        Loop da thread de reenvio: esvazia o spool, esperando cada vez mais (com jitter)
+        enquanto o servidor continuar indisponível.
+        """
+        failures = 0
+        delay = self.flush_interval
+        while not self._stop_event.wait(delay):
+            try:
+                if self.replay():
+                    failures = 0
+                else:
+                    failures += 1
+            except Exception as e:
+                failures += 1
+                self.logger.error(f"Erro ao reenviar o spool de upload: {str(e)}")
+            delay = self.flush_interval
+            if failures:
+                delay = random.uniform(self.flush_interval, max(self.flush_interval, min(self.max_backoff, self.backoff * (2 ** failures))))
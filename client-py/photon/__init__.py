@@ -4,13 +4,14 @@ Módulo Photon - Implementação para comunicação com o protocolo Photon usado
 
 from .sniffer import PhotonSniffer
 from .packet_processor import PhotonPacketProcessor
+from .layout import Layout
 from .processors import (
     get_default_processors,
     process_player_detection,
     process_item_detection,
     process_combat_detection
 )
-from .callback import PhotonCallback, handle_detection
+from .callback import PhotonCallback, handle_detection, get_default_bus
 
 # Constantes de tipo de pacote
 PACKET_TYPE_OPERATION_REQUEST = 2
@@ -20,12 +21,14 @@ PACKET_TYPE_EVENT = 4
 __all__ = [
     "PhotonSniffer", 
     "PhotonPacketProcessor",
+    "Layout",
     "PhotonCallback",
     "get_default_processors",
     "process_player_detection",
     "process_item_detection", 
     "process_combat_detection",
     "handle_detection",
+    "get_default_bus",
     "PACKET_TYPE_OPERATION_REQUEST",
     "PACKET_TYPE_OPERATION_RESPONSE",
     "PACKET_TYPE_EVENT"
@@ -1,8 +1,8 @@
-import json
 from typing import Dict, Any, Optional
 
-from core.logger import Logger
+from core.logger import Logger, LogRateLimiter, LazyJson
 from core.base import BaseComponent
+from core.bus import EventBus
 
 # Logger para o módulo
 logger = Logger("PhotonCallback")
@@ -13,11 +13,19 @@ class PhotonCallback(BaseComponent):
     Processa os resultados dos processadores de pacotes e executa ações apropriadas.
     """
     
-    def __init__(self):
+    def __init__(self, log_rate: float = 10.0, log_burst: int = 20, log_sample_every: int = 0, catalog=None):
         """
         Inicializa o manipulador de callbacks.
+        
+        Args:
+            log_rate (float): Mensagens de detecção por segundo registradas para cada tipo (0 desativa o limite)
+            log_burst (int): Mensagens de detecção que podem ser registradas de uma vez
+            log_sample_every (int): Se maior que 0, registra apenas 1 a cada N detecções de cada tipo
+            catalog (CatalogCache, optional): Cache de catálogos usado para resolver nomes de itens
         """
         super().__init__("PhotonCallback")
+        self.logger.rate_limiter = LogRateLimiter(log_rate, log_burst, log_sample_every)
+        self.catalog = catalog
     
     def start(self) -> bool:
         """
@@ -39,6 +47,28 @@ class PhotonCallback(BaseComponent):
         self._running = False
         return True
     
+    def get_suppressed(self) -> Dict[str, int]:
+        """
+        Retorna quantas mensagens de detecção foram suprimidas pelo limitador, por tipo.
+        
+        Returns:
+            Dict[str, int]: Tipo da mensagem -> mensagens suprimidas
+        """
+        return self.logger.get_suppressed()
+    
+    def attach(self, bus: EventBus) -> None:
+        """
+        Registra os manipuladores deste callback como assinantes de um barramento.
+        
+        Args:
+            bus (EventBus): Barramento de eventos de detecção
+        """
+        bus.subscribe(EventBus.ALL, self._log_detection, name="PhotonCallback.log")
+        bus.subscribe("player", self._handle_player_detection, name="PhotonCallback.player")
+        bus.subscribe("item", self._handle_item_detection, name="PhotonCallback.item")
+        bus.subscribe("combat", self._handle_combat_detection, name="PhotonCallback.combat")
+        bus.subscribe(EventBus.UNHANDLED, self._handle_unknown_detection, name="PhotonCallback.unknown")
+    
     def handle_detection(self, processor_name: str, result: Dict[str, Any], data: bytes, addr: tuple) -> None:
         """
         Função de callback para processar detecções do sniffer.
@@ -50,72 +80,108 @@ class PhotonCallback(BaseComponent):
             addr (tuple): Endereço de origem (IP, porta)
         """
         try:
-            # Log da detecção
-            source_ip, source_port = addr
-            
             # Loga informações básicas
-            self.logger.info(f"Detecção: {processor_name} de {source_ip}:{source_port}")
+            self._log_detection(processor_name, result, data, addr)
             
             # Manipula diferentes tipos de detecção
             if result.get("type") == "player":
-                self._handle_player_detection(result)
+                self._handle_player_detection(processor_name, result, data, addr)
             elif result.get("type") == "item":
-                self._handle_item_detection(result)
+                self._handle_item_detection(processor_name, result, data, addr)
             elif result.get("type") == "combat":
-                self._handle_combat_detection(result)
+                self._handle_combat_detection(processor_name, result, data, addr)
             else:
-                self.logger.info(f"Tipo desconhecido: {json.dumps(result, indent=2)}")
+                self._handle_unknown_detection(processor_name, result, data, addr)
                 
         except Exception as e:
             self.logger.error(f"Erro ao processar callback: {str(e)}")
     
-    def _handle_player_detection(self, result: Dict[str, Any]) -> None:
+    def _log_detection(self, processor_name: str, result: Dict[str, Any], data: bytes, addr: tuple) -> None:
+        """
+        Registra no log a origem de uma detecção.
+        
+        Args:
+            processor_name (str): Nome do processador que identificou o pacote
+            result (dict): Resultado do processamento
+            data (bytes): Dados brutos do pacote
+            addr (tuple): Endereço de origem (IP, porta)
+        """
+        source_ip, source_port = addr
+        self.logger.hot("detection", "Detecção: %s de %s:%s", processor_name, source_ip, source_port)
+    
+    def _handle_unknown_detection(self, processor_name: str, result: Dict[str, Any], data: bytes, addr: tuple) -> None:
+        """
+        Processa detecções de tipos sem manipulador específico.
+        
+        Args:
+            processor_name (str): Nome do processador que identificou o pacote
+            result (dict): Resultado do processamento
+            data (bytes): Dados brutos do pacote
+            addr (tuple): Endereço de origem (IP, porta)
+        """
+        self.logger.hot("unknown", "Tipo desconhecido: %s", LazyJson(result, indent=2))
+    
+    def _handle_player_detection(self, processor_name: str, result: Dict[str, Any], data: bytes, addr: tuple) -> None:
         """
         Processa detecções de jogadores.
         
         Args:
+            processor_name (str): Nome do processador que identificou o pacote
             result (dict): Dados do jogador detectado
+            data (bytes): Dados brutos do pacote
+            addr (tuple): Endereço de origem (IP, porta)
         """
         player_id = result.get("id")
         position = result.get("position", {})
         x, y = position.get("x", 0), position.get("y", 0)
         
-        self.logger.info(f"Jogador detectado - ID: {player_id}, Posição: ({x:.1f}, {y:.1f})")
+        self.logger.hot("player", "Jogador detectado - ID: %s, Posição: (%.1f, %.1f)", player_id, x, y)
         
         # Aqui você pode implementar lógica adicional, como:
         # - Atualizar um mapa com a posição do jogador
         # - Verificar se é um jogador inimigo
         # - Enviar alertas para o usuário
     
-    def _handle_item_detection(self, result: Dict[str, Any]) -> None:
+    def _handle_item_detection(self, processor_name: str, result: Dict[str, Any], data: bytes, addr: tuple) -> None:
         """
         Processa detecções de itens.
         
         Args:
+            processor_name (str): Nome do processador que identificou o pacote
             result (dict): Dados do item detectado
+            data (bytes): Dados brutos do pacote
+            addr (tuple): Endereço de origem (IP, porta)
         """
         item_id = result.get("id")
         item_type = result.get("item_type")
         tier = result.get("tier")
         
-        self.logger.info(f"Item detectado - ID: {item_id}, Tipo: {item_type}, Tier: {tier}")
+        # Resolve o nome pelo catálogo local (sem acessar o servidor)
+        resolved = self.catalog.item(item_id) if self.catalog is not None else None
+        if resolved is not None:
+            self.logger.hot("item", "Item detectado - %s (ID: %s), Tipo: %s, Tier: %s", resolved[0], item_id, item_type, tier)
+        else:
+            self.logger.hot("item", "Item detectado - ID: %s, Tipo: %s, Tier: %s", item_id, item_type, tier)
         
         # Aqui você pode implementar lógica adicional, como:
         # - Atualizar um inventário de recursos visíveis
         # - Alertar sobre itens valiosos
     
-    def _handle_combat_detection(self, result: Dict[str, Any]) -> None:
+    def _handle_combat_detection(self, processor_name: str, result: Dict[str, Any], data: bytes, addr: tuple) -> None:
         """
         Processa detecções de eventos de combate.
         
         Args:
+            processor_name (str): Nome do processador que identificou o pacote
             result (dict): Dados do evento de combate detectado
+            data (bytes): Dados brutos do pacote
+            addr (tuple): Endereço de origem (IP, porta)
         """
         attacker_id = result.get("attacker_id")
         target_id = result.get("target_id")
         damage = result.get("damage")
         
-        self.logger.info(f"Combate detectado - Atacante: {attacker_id}, Alvo: {target_id}, Dano: {damage:.1f}")
+        self.logger.hot("combat", "Combate detectado - Atacante: %s, Alvo: %s, Dano: %.1f", attacker_id, target_id, damage)
         
         # Aqui você pode implementar lógica adicional, como:
         # - Calcular DPS
@@ -123,10 +189,31 @@ class PhotonCallback(BaseComponent):
         # - Detectar padrões de ataque
 
 
+# Barramento padrão, criado na primeira detecção e reutilizado nas seguintes
+_default_bus: Optional[EventBus] = None
+
+
+def get_default_bus() -> EventBus:
+    """
+    Retorna o barramento padrão, com um PhotonCallback já registrado.
+    
+    Returns:
+        EventBus: Barramento compartilhado pelas chamadas de handle_detection
+    """
+    global _default_bus
+    if _default_bus is None:
+        bus = EventBus()
+        PhotonCallback().attach(bus)
+        bus.start()
+        _default_bus = bus
+    return _default_bus
+
+
 # Função auxiliar para facilitar o uso
 def handle_detection(processor_name: str, result: Dict[str, Any], data: bytes, addr: tuple) -> None:
     """
     Função auxiliar para manipular detecções.
+    Publica a detecção no barramento padrão, sem criar objetos a cada pacote.
     
     Args:
         processor_name (str): Nome do processador que identificou o pacote
@@ -134,5 +221,4 @@ def handle_detection(processor_name: str, result: Dict[str, Any], data: bytes, a
         data (bytes): Dados brutos do pacote
         addr (tuple): Endereço de origem (IP, porta)
     """
-    callback = PhotonCallback()
-    callback.handle_detection(processor_name, result, data, addr) 
\ No newline at end of file
+    get_default_bus().publish(processor_name, result, data, addr)
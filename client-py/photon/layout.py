@@ -0,0 +1,93 @@
+import struct
+from typing import Dict, Any, Optional, Sequence, Tuple
+
+
+class Layout:
+    """
+    Descrição declarativa do layout binário de um pacote.
+    Compila o formato uma única vez em um struct.Struct e extrai todos os
+    campos com um único unpack_from, já verificando o tamanho do pacote.
+
+    Exemplo:
+        PLAYER = Layout("<I f f", fields=("id", "x", "y"), offset=2, magic=b"\\x12\\x34")
+        values = PLAYER.unpack(data)  # (id, x, y) ou None
+    """
+
+    __slots__ = ("format", "fields", "offset", "magic", "size", "end", "_struct", "_unpack_from", "pack", "unpack_from")
+
+    def __init__(self, format: str, fields: Sequence[str], offset: int = 0, magic: bytes = b""):
+        """
+        Compila o layout.
+
+        Args:
+            format (str): Formato no padrão do módulo struct (ex: "<I f f")
+            fields (Sequence[str]): Nomes dos campos, na ordem do formato
+            offset (int): Posição do primeiro campo dentro do pacote
+            magic (bytes): Prefixo que o pacote deve ter para ser reconhecido
+
+        Raises:
+            ValueError: Se o número de campos não corresponder ao formato
+        """
+        self._struct = struct.Struct(format)
+        self._unpack_from = self._struct.unpack_from
+
+        # Acesso direto ao struct (sem prefixo nem verificação), para formatos de armazenamento
+        self.pack = self._struct.pack
+        self.unpack_from = self._struct.unpack_from
+
+        count = len(self._struct.unpack(bytes(self._struct.size)))
+        if count != len(fields):
+            raise ValueError(
+                f"Layout '{format}' possui {count} valores, mas {len(fields)} campos foram informados"
+            )
+
+        self.format = format
+        self.fields = tuple(fields)
+        self.offset = offset
+        self.magic = bytes(magic)
+        self.size = self._struct.size
+        self.end = max(offset + self.size, len(self.magic))
+
+    def matches(self, data: bytes) -> bool:
+        """
+        Verifica se o pacote tem o prefixo e o tamanho exigidos pelo layout.
+
+        Args:
+            data (bytes): Dados do pacote
+
+        Returns:
+            bool: True se o layout pode ser extraído do pacote
+        """
+        return len(data) >= self.end and data.startswith(self.magic)
+
+    def unpack(self, data: bytes) -> Optional[Tuple[Any, ...]]:
+        """
+        Extrai os valores do pacote.
+
+        Args:
+            data (bytes): Dados do pacote
+
+        Returns:
+            Optional[Tuple[Any, ...]]: Valores na ordem dos campos ou None se o pacote não corresponder
+        """
+        if len(data) < self.end or not data.startswith(self.magic):
+            return None
+        return self._unpack_from(data, self.offset)
+
+    def unpack_dict(self, data: bytes) -> Optional[Dict[str, Any]]:
+        """
+        Extrai os valores do pacote como dicionário campo -> valor.
+
+        Args:
+            data (bytes): Dados do pacote
+
+        Returns:
+            Optional[Dict[str, Any]]: Campos extraídos ou None se o pacote não corresponder
+        """
+        values = self.unpack(data)
+        if values is None:
+            return None
+        return dict(zip(self.fields, values))
+
+    def __repr__(self) -> str:
+        return f"Layout({self.format!r}, fields={self.fields!r}, offset={self.offset}, magic={self.magic!r})"
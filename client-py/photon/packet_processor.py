@@ -1,6 +1,6 @@
-import struct
-import json
-from typing import Dict, Any, Tuple, Optional, Callable
+import threading
+from array import array
+from typing import Dict, Any, List, Tuple, Optional, Callable
 
 from core.base import BaseComponent
 
@@ -25,12 +25,40 @@ class PhotonPacketProcessor(BaseComponent):
     EVENT_LEAVE = 254
     EVENT_SPAWN = 2
     
-    def __init__(self):
+    # Quantidade de códigos possíveis (o código ocupa um byte)
+    CODE_COUNT = 256
+    
+    # Nomes dos tipos de pacote usados nos relatórios de estatísticas
+    PACKET_TYPE_NAMES = {
+        PACKET_TYPE_OPERATION_REQUEST: "operation_request",
+        PACKET_TYPE_OPERATION_RESPONSE: "operation_response",
+        PACKET_TYPE_EVENT: "event"
+    }
+    
+    def __init__(self, stats_interval: float = 0.0, stats_top: int = 20):
         """
         Inicializa o processador de pacotes Photon.
+        
+        Args:
+            stats_interval (float): Intervalo em segundos entre relatórios de códigos no log (0 desativa)
+            stats_top (int): Quantidade de códigos exibidos em cada relatório periódico
         """
         super().__init__("PhotonPacketProcessor")
-        self._processors: Dict[str, Callable] = {}
+        
+        # Tabelas de handlers indexadas por tipo de pacote e código
+        self._handlers: Dict[int, List[Optional[Callable]]] = {
+            packet_type: [None] * self.CODE_COUNT for packet_type in self.PACKET_TYPE_NAMES
+        }
+        
+        # Contadores pré-alocados de mensagens e bytes por (tipo de pacote, código)
+        self._message_counts: List[Optional[array]] = []
+        self._byte_counts: List[Optional[array]] = []
+        self.reset_code_stats()
+        
+        self.stats_interval = stats_interval
+        self.stats_top = stats_top
+        self._stats_thread = None
+        self._stats_stop = threading.Event()
     
     def start(self) -> bool:
         """
@@ -40,6 +68,12 @@ class PhotonPacketProcessor(BaseComponent):
             bool: True sempre, pois não requer inicialização especial
         """
         self._running = True
+        
+        # Inicia o relatório periódico de códigos, se configurado
+        if self.stats_interval > 0 and self._stats_thread is None:
+            self._stats_stop.clear()
+            self._stats_thread = threading.Thread(target=self._stats_loop, daemon=True)
+            self._stats_thread.start()
         return True
     
     def stop(self) -> bool:
@@ -50,6 +84,11 @@ class PhotonPacketProcessor(BaseComponent):
             bool: True sempre, pois não requer limpeza especial
         """
         self._running = False
+        
+        if self._stats_thread is not None:
+            self._stats_stop.set()
+            self._stats_thread.join(timeout=2.0)
+            self._stats_thread = None
         return True
     
     def register_handler(self, packet_type: int, code: int, handler_func: Callable):
@@ -61,8 +100,11 @@ class PhotonPacketProcessor(BaseComponent):
             code (int): Código da operação ou evento
             handler_func (callable): Função que processa o pacote
         """
-        key = f"{packet_type}_{code}"
-        self._processors[key] = handler_func
+        if packet_type not in self._handlers or not 0 <= code < self.CODE_COUNT:
+            self.logger.error(f"Handler inválido: pacote tipo={packet_type}, código={code}")
+            return
+        
+        self._handlers[packet_type][code] = handler_func
         self.logger.info(f"Handler registrado para pacote tipo={packet_type}, código={code}")
     
     def process_packet(self, data: bytes, addr: Tuple) -> Optional[Dict[str, Any]]:
@@ -84,6 +126,13 @@ class PhotonPacketProcessor(BaseComponent):
             # Extrai o tipo de pacote (byte 2)
             packet_type = data[2]
             
+            # Contabiliza mensagens e bytes por código (o código está no byte 12)
+            message_counts = self._message_counts[packet_type]
+            if message_counts is not None:
+                code = data[12] if len(data) > 12 else 0
+                message_counts[code] += 1
+                self._byte_counts[packet_type][code] += len(data)
+            
             # Processa com base no tipo
             if packet_type == self.PACKET_TYPE_OPERATION_REQUEST:
                 return self._process_operation_request(data, addr)
@@ -114,9 +163,9 @@ class PhotonPacketProcessor(BaseComponent):
             operation_code = data[12] if len(data) > 12 else 0
             
             # Chama o handler específico se existir
-            key = f"{self.PACKET_TYPE_OPERATION_REQUEST}_{operation_code}"
-            if key in self._processors:
-                return self._processors[key](data, addr)
+            handler = self._handlers[self.PACKET_TYPE_OPERATION_REQUEST][operation_code]
+            if handler is not None:
+                return handler(data, addr)
             
             # Processamento básico se não houver handler específico
             return {
@@ -146,9 +195,9 @@ class PhotonPacketProcessor(BaseComponent):
             operation_code = data[12] if len(data) > 12 else 0
             
             # Chama o handler específico se existir
-            key = f"{self.PACKET_TYPE_OPERATION_RESPONSE}_{operation_code}"
-            if key in self._processors:
-                return self._processors[key](data, addr)
+            handler = self._handlers[self.PACKET_TYPE_OPERATION_RESPONSE][operation_code]
+            if handler is not None:
+                return handler(data, addr)
             
             # Processamento básico se não houver handler específico
             return {
@@ -178,9 +227,9 @@ class PhotonPacketProcessor(BaseComponent):
             event_code = data[12] if len(data) > 12 else 0
             
             # Chama o handler específico se existir
-            key = f"{self.PACKET_TYPE_EVENT}_{event_code}"
-            if key in self._processors:
-                return self._processors[key](data, addr)
+            handler = self._handlers[self.PACKET_TYPE_EVENT][event_code]
+            if handler is not None:
+                return handler(data, addr)
             
             # Processamento básico se não houver handler específico
             return {
@@ -192,4 +241,82 @@ class PhotonPacketProcessor(BaseComponent):
             
         except Exception as e:
             self.logger.error(f"Erro ao processar Event: {str(e)}")
-            return None 
\ No newline at end of file
+            return None
+    
+    def reset_code_stats(self) -> None:
+        """
+        Zera os contadores de mensagens e bytes por código.
+        As tabelas são indexadas diretamente pelo byte de tipo de pacote,
+        evitando dicionários e strings no caminho quente.
+        """
+        message_counts: List[Optional[array]] = [None] * 256
+        byte_counts: List[Optional[array]] = [None] * 256
+        for packet_type in self.PACKET_TYPE_NAMES:
+            message_counts[packet_type] = array('Q', bytes(8 * self.CODE_COUNT))
+            byte_counts[packet_type] = array('Q', bytes(8 * self.CODE_COUNT))
+        
+        # Troca as tabelas de uma só vez para não misturar contagens antigas e novas
+        self._message_counts = message_counts
+        self._byte_counts = byte_counts
+    
+    def get_code_stats(self, top: Optional[int] = None, sort_by: str = "bytes") -> List[Dict[str, Any]]:
+        """
+        Retorna as estatísticas de tráfego por (tipo de pacote, código), ordenadas por volume.
+        
+        Args:
+            top (int, optional): Quantidade máxima de entradas retornadas
+            sort_by (str): Critério de ordenação ("bytes" ou "messages")
+            
+        Returns:
+            List[Dict[str, Any]]: Entradas com tipo, código, mensagens, bytes e se há handler registrado
+        """
+        stats = []
+        for packet_type, type_name in self.PACKET_TYPE_NAMES.items():
+            message_counts = self._message_counts[packet_type]
+            byte_counts = self._byte_counts[packet_type]
+            handlers = self._handlers[packet_type]
+            for code in range(self.CODE_COUNT):
+                messages = message_counts[code]
+                if messages:
+                    stats.append({
+                        "packet_type": type_name,
+                        "code": code,
+                        "messages": messages,
+                        "bytes": byte_counts[code],
+                        "handled": handlers[code] is not None
+                    })
+        
+        stats.sort(key=lambda entry: entry[sort_by], reverse=True)
+        return stats[:top] if top else stats
+    
+    def dump_code_stats(self, top: Optional[int] = None) -> None:
+        """
+        Escreve no log as estatísticas de tráfego por código, ordenadas por volume.
+        
+        Args:
+            top (int, optional): Quantidade máxima de códigos exibidos
+        """
+        stats = self.get_code_stats(top)
+        if not stats:
+            self.logger.info("Nenhum pacote Photon contabilizado")
+            return
+        
+        total_bytes = sum(entry["bytes"] for entry in stats) or 1
+        self.logger.info(f"Tráfego Photon por código ({len(stats)} códigos):")
+        for entry in stats:
+            status = "" if entry["handled"] else " [sem handler]"
+            self.logger.info(
+                f"  {entry['packet_type']:<18} código={entry['code']:<3} "
+                f"mensagens={entry['messages']:<8} bytes={entry['bytes']:<10} "
+                f"({entry['bytes'] * 100.0 / total_bytes:5.1f}%){status}"
+            )
+    
+    def _stats_loop(self) -> None:
+        """
+        Loop que escreve periodicamente as estatísticas de códigos no log.
+        """
+        while not self._stats_stop.wait(self.stats_interval):
+            try:
+                self.dump_code_stats(self.stats_top)
+            except Exception as e:
+                self.logger.error(f"Erro ao gerar estatísticas de códigos: {str(e)}")
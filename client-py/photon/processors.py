@@ -1,15 +1,29 @@
-import json
-import struct
 from typing import Dict, Any, Tuple, Optional, Callable
 
-from core.logger import Logger
+from .layout import Layout
 
-# Logger para o módulo
-logger = Logger("PhotonProcessors")
+# Layouts dos pacotes (fictícios), compilados uma única vez
+PLAYER_LAYOUT = Layout("<I f f", fields=("id", "x", "y"), offset=2, magic=b'\x12\x34')
+ITEM_LAYOUT = Layout("<I B B", fields=("id", "item_type", "tier"), offset=2, magic=b'\x56\x78')
+COMBAT_LAYOUT = Layout("<I I f", fields=("attacker_id", "target_id", "damage"), offset=2, magic=b'\x90\xAB')
+MARKET_LAYOUT = Layout(
+    "<Q I H B I I B",
+    fields=("order_id", "item_id", "location", "quality", "price", "amount", "side"),
+    offset=2,
+    magic=b'\xCD\xEF'
+)
+
+KILL_LAYOUT = Layout("<I I f f", fields=("id", "type_id", "x", "y"), offset=2, magic=b'\x2A\x01')
+HARVEST_LAYOUT = Layout("<I I f f", fields=("id", "type_id", "x", "y"), offset=2, magic=b'\x2A\x02')
+
+# Lados de uma ordem de mercado
+MARKET_SIDES = ("sell", "buy")
 
 def get_default_processors() -> Dict[str, Callable]:
     """
     Retorna um dicionário com os processadores padrão para o Albion Online.
+    Os processadores não tratam as próprias exceções: o sniffer as registra no log e no
+    ProcessorGuard, que desativa o processador quando a taxa de erros passa do limite.
     
     Returns:
         Dict[str, Callable]: Dicionário com nome e função do processador
@@ -17,7 +31,10 @@ def get_default_processors() -> Dict[str, Callable]:
     return {
         "player_detection": process_player_detection,
         "item_detection": process_item_detection,
-        "combat_detection": process_combat_detection
+        "combat_detection": process_combat_detection,
+        "market_detection": process_market_detection,
+        "kill_detection": process_kill_detection,
+        "harvest_detection": process_harvest_detection
     }
 
 def process_player_detection(data: bytes, addr: Tuple) -> Optional[Dict[str, Any]]:
@@ -31,28 +48,24 @@ def process_player_detection(data: bytes, addr: Tuple) -> Optional[Dict[str, Any
     Returns:
         Optional[Dict[str, Any]]: Informações do jogador detectado ou None
     """
-    try:
-        # Aqui você implementaria a lógica real de análise de pacotes
-        # Isso é apenas um exemplo simplificado
+    # Aqui você implementaria a lógica real de análise de pacotes
+    # Isso é apenas um exemplo simplificado
+    
+    # Exemplo (fictício): Se o pacote começar com bytes específicos que indicam dados de jogador
+    values = PLAYER_LAYOUT.unpack(data)
+    if values is not None:
+        # Extrai informações do jogador (código fictício)
+        player_id, x_pos, y_pos = values
         
-        # Exemplo (fictício): Se o pacote começar com bytes específicos que indicam dados de jogador
-        if len(data) > 8 and data[0:2] == b'\x12\x34':
-            # Extrai informações do jogador (código fictício)
-            player_id = int.from_bytes(data[2:6], byteorder='little')
-            x_pos = struct.unpack('<f', data[6:10])[0]
-            y_pos = struct.unpack('<f', data[10:14])[0]
-            
-            # Retorna as informações do jogador
-            return {
-                "type": "player",
-                "id": player_id,
-                "position": {
-                    "x": x_pos,
-                    "y": y_pos
-                }
+        # Retorna as informações do jogador
+        return {
+            "type": "player",
+            "id": player_id,
+            "position": {
+                "x": x_pos,
+                "y": y_pos
             }
-    except Exception as e:
-        logger.error(f"Erro ao processar detecção de jogador: {str(e)}")
+        }
     
     return None
 
@@ -67,23 +80,19 @@ def process_item_detection(data: bytes, addr: Tuple) -> Optional[Dict[str, Any]]
     Returns:
         Optional[Dict[str, Any]]: Informações do item detectado ou None
     """
-    try:
-        # Exemplo (fictício): Se o pacote começar com bytes específicos que indicam item
-        if len(data) > 10 and data[0:2] == b'\x56\x78':
-            # Extrai informações do item (código fictício)
-            item_id = int.from_bytes(data[2:6], byteorder='little')
-            item_type = data[6]
-            tier = data[7]
-            
-            # Retorna as informações do item
-            return {
-                "type": "item",
-                "id": item_id,
-                "item_type": item_type,
-                "tier": tier
-            }
-    except Exception as e:
-        logger.error(f"Erro ao processar detecção de item: {str(e)}")
+    # Exemplo (fictício): Se o pacote começar com bytes específicos que indicam item
+    values = ITEM_LAYOUT.unpack(data)
+    if values is not None:
+        # Extrai informações do item (código fictício)
+        item_id, item_type, tier = values
+        
+        # Retorna as informações do item
+        return {
+            "type": "item",
+            "id": item_id,
+            "item_type": item_type,
+            "tier": tier
+        }
     
     return None
 
@@ -98,22 +107,103 @@ def process_combat_detection(data: bytes, addr: Tuple) -> Optional[Dict[str, Any
     Returns:
         Optional[Dict[str, Any]]: Informações do evento de combate detectado ou None
     """
-    try:
-        # Exemplo (fictício): Se o pacote começar com bytes específicos que indicam evento de combate
-        if len(data) > 12 and data[0:2] == b'\x90\xAB':
-            # Extrai informações do evento de combate (código fictício)
-            attacker_id = int.from_bytes(data[2:6], byteorder='little')
-            target_id = int.from_bytes(data[6:10], byteorder='little')
-            damage = struct.unpack('<f', data[10:14])[0]
-            
-            # Retorna as informações do evento de combate
-            return {
-                "type": "combat",
-                "attacker_id": attacker_id,
-                "target_id": target_id,
-                "damage": damage
-            }
-    except Exception as e:
-        logger.error(f"Erro ao processar detecção de combate: {str(e)}")
+    # Exemplo (fictício): Se o pacote começar com bytes específicos que indicam evento de combate
+    values = COMBAT_LAYOUT.unpack(data)
+    if values is not None:
+        # Extrai informações do evento de combate (código fictício)
+        attacker_id, target_id, damage = values
+        
+        # Retorna as informações do evento de combate
+        return {
+            "type": "combat",
+            "attacker_id": attacker_id,
+            "target_id": target_id,
+            "damage": damage
+        }
+    
+    return None 
+
+def process_market_detection(data: bytes, addr: Tuple) -> Optional[Dict[str, Any]]:
+    """
+    Processa pacotes para detectar ordens de mercado.
+    
+    Args:
+        data (bytes): Dados do pacote
+        addr (tuple): Endereço de origem (IP, porta)
+        
+    Returns:
+        Optional[Dict[str, Any]]: Informações da ordem detectada ou None
+    """
+    # Exemplo (fictício): Se o pacote começar com bytes específicos que indicam uma ordem de mercado
+    values = MARKET_LAYOUT.unpack(data)
+    if values is not None:
+        # Extrai informações da ordem (código fictício)
+        order_id, item_id, location, quality, price, amount, side = values
+        
+        # Retorna as informações da ordem
+        return {
+            "type": "market",
+            "order_id": order_id,
+            "item_id": item_id,
+            "location": location,
+            "quality": quality,
+            "price": price,
+            "amount": amount,
+            "side": MARKET_SIDES[side & 1]
+        }
+    
+    return None
+
+def process_kill_detection(data: bytes, addr: Tuple) -> Optional[Dict[str, Any]]:
+    """
+    Processa pacotes para detectar mortes de mobs.
     
-    return None 
\ No newline at end of file
+    Args:
+        data (bytes): Dados do pacote
+        addr (tuple): Endereço de origem (IP, porta)
+        
+    Returns:
+        Optional[Dict[str, Any]]: Informações da morte detectada ou None
+    """
+    # Exemplo (fictício): Se o pacote começar com bytes específicos que indicam a morte de um mob
+    values = KILL_LAYOUT.unpack(data)
+    if values is not None:
+        # Extrai informações da morte (código fictício)
+        mob_id, type_id, x, y = values
+        
+        # Retorna as informações da morte
+        return {
+            "type": "mob_killed",
+            "id": mob_id,
+            "type_id": type_id,
+            "position": {"x": x, "y": y}
+        }
+    
+    return None
+
+def process_harvest_detection(data: bytes, addr: Tuple) -> Optional[Dict[str, Any]]:
+    """
+    Processa pacotes para detectar recursos coletáveis esgotados.
+    
+    Args:
+        data (bytes): Dados do pacote
+        addr (tuple): Endereço de origem (IP, porta)
+        
+    Returns:
+        Optional[Dict[str, Any]]: Informações do recurso esgotado ou None
+    """
+    # Exemplo (fictício): Se o pacote começar com bytes específicos que indicam um recurso esgotado
+    values = HARVEST_LAYOUT.unpack(data)
+    if values is not None:
+        # Extrai informações do recurso (código fictício)
+        harvestable_id, type_id, x, y = values
+        
+        # Retorna as informações do recurso
+        return {
+            "type": "harvestable_depleted",
+            "id": harvestable_id,
+            "type_id": type_id,
+            "position": {"x": x, "y": y}
+        }
+    
+    return None
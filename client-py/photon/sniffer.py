@@ -1,6 +1,8 @@
+import time
 import logging
 import importlib.util
 from typing import Callable, Dict, Any, Tuple, Optional
+from core.metrics import MetricsRegistry
 from core.sniffer import UDPSniffer
 from .packet_processor import PhotonPacketProcessor
 
@@ -9,17 +11,18 @@ class PhotonSniffer(UDPSniffer):
     Sniffer especializado para captura e processamento de pacotes Photon do Albion Online.
     """
     
-    def __init__(self, port: int = 5056, callback: Optional[Callable] = None):
+    def __init__(self, port: int = 5056, callback: Optional[Callable] = None, stats_interval: float = 0.0):
         """
         Inicializa o sniffer Photon.
         
         Args:
             port (int): Porta UDP (padrão 5056 para Albion Online)
             callback (callable, optional): Função de callback para processamento de pacotes detectados
+            stats_interval (float): Intervalo em segundos entre relatórios de tráfego por código (0 desativa)
         """
         super().__init__(port, callback)
         self.name = "PhotonSniffer"  # Sobrescreve o nome definido na classe base
-        self.photon_processor = PhotonPacketProcessor()
+        self.photon_processor = PhotonPacketProcessor(stats_interval=stats_interval)
     
     def start(self) -> bool:
         """
@@ -47,32 +50,54 @@ class PhotonSniffer(UDPSniffer):
         # Para o sniffer UDP
         return super().stop()
     
-    def _process_packet(self, data: bytes, addr: Tuple) -> None:
+    def instrument(self, metrics: MetricsRegistry) -> None:
+        """
+        Passa a registrar as métricas da captura, incluindo o tempo de decodificação Photon
+        e a latência do recebimento pelo kernel até o fim da decodificação (medidos nos
+        mesmos pacotes amostrados dos demais histogramas).
+        
+        Args:
+            metrics (MetricsRegistry): Registro de métricas
+        """
+        self._decode_time = metrics.histogram(
+            "tanakai_decode_seconds", "Tempo de decodificação Photon de um pacote (amostrado)", sniffer=self.name
+        )
+        self._kernel_decode_time = metrics.histogram(
+            "tanakai_kernel_decode_seconds", "Do recebimento do pacote pelo kernel até o fim da decodificação Photon (amostrado)", sniffer=self.name
+        )
+        super().instrument(metrics)
+    
+    def _process_packet(self, data: bytes, addr: Tuple, timestamp: Optional[float] = None) -> None:
         """
         Processa um pacote capturado usando o processador Photon.
         
         Args:
             data (bytes): Dados do pacote
             addr (tuple): Endereço de origem (IP, porta)
+            timestamp (float, optional): Horário (epoch) de recebimento do pacote pelo kernel
         """
         try:
             # Processa o pacote através do processador Photon
-            result = self.photon_processor.process_packet(data, addr)
+            if not self._sampled:
+                result = self.photon_processor.process_packet(data, addr)
+            else:
+                start = time.perf_counter()
+                result = self.photon_processor.process_packet(data, addr)
+                self._decode_time.observe(time.perf_counter() - start)
+                self._observe_age(self._kernel_decode_time, timestamp)
             
             # Se tiver resultado e callback, notifica
             if result and self.callback:
-                self.callback("photon", result, data, addr)
+                if not self._sampled:
+                    self.callback("photon", result, data, addr)
+                else:
+                    self._observe_age(self._kernel_callback_time, timestamp)
+                    start = time.perf_counter()
+                    self.callback("photon", result, data, addr)
+                    self._callback_time.observe(time.perf_counter() - start)
                 
             # Executa também os processadores registrados diretamente
-            for name, processor in self.processors.items():
-                try:
-                    processor_result = processor(data, addr)
-                    
-                    # Se um processador retornar resultado, notifica via callback
-                    if processor_result and self.callback:
-                        self.callback(name, processor_result, data, addr)
-                except Exception as e:
-                    self.logger.error(f"Erro no processador '{name}': {str(e)}")
+            self._run_processors(data, addr, timestamp)
                     
         except Exception as e:
             self.logger.error(f"Erro ao processar pacote Photon: {str(e)}")
@@ -87,4 +112,12 @@ class PhotonSniffer(UDPSniffer):
             handler_func (callable): Função que processa o pacote
         """
         self.photon_processor.register_handler(packet_type, code, handler_func)
-
+    
+    def dump_code_stats(self, top: Optional[int] = None) -> None:
+        """
+        Escreve no log o tráfego Photon por (tipo de pacote, código), ordenado por volume.
+        
+        Args:
+            top (int, optional): Quantidade máxima de códigos exibidos
+        """
+        self.photon_processor.dump_code_stats(top)
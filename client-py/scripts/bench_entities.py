@@ -0,0 +1,43 @@
+"""
+Benchmark do EntityStore (grade espacial).
+
+Popula o armazenamento com entidades em posições aleatórias e mede o tempo
+médio de atualização, de consultas por raio, de k-vizinhos e da consulta em lote.
+
+Uso: python scripts/bench_entities.py [entidades]
+"""
+
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.entities import EntityStore, np
+
+def timed(label, count, func):
+    started = time.perf_counter()
+    for _ in range(count):
+        func()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<28} {elapsed / count * 1e6:8.1f} us")
+
+def main():
+    entities = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    random.seed(7)
+    store = EntityStore(capacity=entities * 2, evict_interval=0)
+    for entity_id in range(entities):
+        store.update(entity_id, random.uniform(-1000, 1000), random.uniform(-1000, 1000))
+
+    point = lambda: (random.uniform(-1000, 1000), random.uniform(-1000, 1000))
+    print(f"entidades: {entities}")
+    timed("update", 100000, lambda: store.update(random.randrange(entities), *point()))
+    timed("query_radius (r=60)", 5000, lambda: store.query_radius(*point(), 60))
+    timed("query_nearest (k=10)", 5000, lambda: store.query_nearest(*point(), 10))
+    points = [point() for _ in range(100)]
+    backend = "numpy" if np is not None else "python"
+    timed(f"query_radius_bulk x100 ({backend})", 20, lambda: store.query_radius_bulk(points, 60))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark do journal binário de detecções.
+
+Grava detecções sintéticas (jogadores, itens e combate) com o JournalWriter,
+mede a vazão de gravação e o tamanho por evento, e compara com JSON-lines.
+Em seguida mede a leitura filtrada com o JournalReader.
+
+Uso: python scripts/bench_journal.py [eventos]
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from storage.journal import JournalWriter, JournalReader
+
+def make_events(count):
+    random.seed(42)
+    events = []
+    for i in range(count):
+        roll = i % 10
+        if roll < 6:
+            events.append({"type": "player", "id": random.randrange(5000), "position": {"x": random.uniform(-500, 500), "y": random.uniform(-500, 500)}})
+        elif roll < 9:
+            events.append({"type": "combat", "attacker_id": random.randrange(5000), "target_id": random.randrange(5000), "damage": random.uniform(1, 900)})
+        else:
+            events.append({"type": "item", "id": random.randrange(9000), "item_type": 3, "tier": random.randrange(1, 9)})
+    return events
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    events = make_events(count)
+
+    with tempfile.TemporaryDirectory() as directory:
+        journal = JournalWriter(directory, flush_interval=0.25, max_buffer_bytes=256 * 1024 * 1024)
+        journal.start()
+        started = time.perf_counter()
+        base = time.time()
+        for i, event in enumerate(events):
+            journal.append(event, base + i * 0.0001)
+        append_time = time.perf_counter() - started
+        journal.stop()
+        total_time = time.perf_counter() - started
+        stats = journal.get_stats()
+
+        json_bytes = sum(len(json.dumps({"ts": base, **event})) + 1 for event in events)
+
+        print(f"eventos:              {count}")
+        print(f"append (captura):     {count / append_time:,.0f} eventos/s")
+        print(f"append + descarga:    {count / total_time:,.0f} eventos/s")
+        print(f"bytes por evento:     {stats['bytes_written'] / count:.1f} (JSON-lines: {json_bytes / count:.1f})")
+        print(f"descartados:          {stats['dropped']}")
+
+        reader = JournalReader(directory)
+        started = time.perf_counter()
+        total = reader.count()
+        scan_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        window = list(reader.iter_records(start=base + count * 0.00005, end=base + count * 0.00006, kinds=["combat"]))
+        filter_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        decoded = sum(1 for _ in reader.iter_records())
+        decode_time = time.perf_counter() - started
+
+        print(f"varredura (cabeçalhos): {total / scan_time:,.0f} registros/s")
+        print(f"filtro tempo+tipo:      {filter_time * 1000:.1f} ms ({len(window)} registros)")
+        print(f"decodificação total:    {decoded / decode_time:,.0f} registros/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Benchmark da latência de ponta a ponta da captura, a partir do horário do kernel.
+
+Sobe o PhotonSniffer (com métricas e o barramento de detecções como callback) em uma
+porta local e envia os pacotes sintéticos do bench_metrics por UDP, de outro processo
+(para não disputar o GIL com a thread de captura), em várias taxas. Para
+cada taxa mostra os percentis das latências do recebimento pelo kernel (SO_TIMESTAMPNS)
+até o fim da decodificação e até o callback, e quantos pacotes foram processados. Por
+fim compara o custo de receber com recvmsg + SO_TIMESTAMPNS e com recvfrom.
+
+Uso: python scripts/bench_latency.py [pacotes por taxa] [porta UDP]
+"""
+
+import os
+import sys
+import time
+import socket
+import logging
+import multiprocessing
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.bus import EventBus
+from core.metrics import MetricsRegistry
+from core.sniffer import SO_TIMESTAMPNS, TIMESPEC
+from photon.sniffer import PhotonSniffer
+from photon.processors import get_default_processors
+from bench_metrics import PACKETS
+
+# Taxas de envio em pacotes por segundo (0 = o mais rápido possível)
+RATES = (1000, 10000, 50000, 0)
+
+def send(port, count, rate):
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    interval = 1.0 / rate if rate else 0.0
+    started = time.perf_counter()
+    for i in range(count):
+        if interval:
+            # Espera ativa: sleep não tem resolução para intervalos de microssegundos
+            deadline = started + i * interval
+            while time.perf_counter() < deadline:
+                pass
+        sender.sendto(PACKETS[i % len(PACKETS)], ("127.0.0.1", port))
+    sender.close()
+
+def percentiles(histogram):
+    counts = histogram.snapshot()
+    if not sum(counts):
+        return "sem amostras"
+    return " ".join(
+        f"p{int(q * 100)} {histogram.quantile(q, counts) * 1e6:7.1f} us" for q in (0.5, 0.9, 0.99)
+    )
+
+def measure_latency(port, count, rate):
+    registry = MetricsRegistry()
+    bus = EventBus()
+    bus.subscribe(EventBus.ALL, lambda processor_name, result, data, addr: None, name="noop")
+    sniffer = PhotonSniffer(port=port, callback=bus.publish)
+    for name, processor in get_default_processors().items():
+        sniffer.register_processor(name, processor)
+    sniffer.instrument(registry)
+    sniffer.METRICS_SAMPLE = 1
+    sniffer.start()
+    try:
+        sender = multiprocessing.Process(target=send, args=(port, count, rate))
+        sender.start()
+        sender.join()
+        time.sleep(0.5)
+    finally:
+        sniffer.stop()
+
+    received = sniffer._packets.value
+    name = f"{rate} pacotes/s" if rate else "máximo"
+    print(f"{name:>15}  recebidos {received:6d}/{count}  timestamps do kernel: {sniffer.kernel_timestamps}")
+    print(f"{'':>15}  kernel -> decodificação  {percentiles(sniffer._kernel_decode_time)}")
+    print(f"{'':>15}  kernel -> callback       {percentiles(sniffer._kernel_callback_time)}")
+
+def measure_receive(port, count):
+    """
+    Custo por pacote de receber com recvfrom e com recvmsg + SO_TIMESTAMPNS (fila já cheia).
+    """
+    results = {}
+    for mode in ("recvfrom", "recvmsg + SO_TIMESTAMPNS"):
+        receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        receiver.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 8 * 1024 * 1024)
+        receiver.bind(("127.0.0.1", port))
+        receiver.settimeout(0.2)
+        timestamps = mode != "recvfrom"
+        if timestamps:
+            receiver.setsockopt(socket.SOL_SOCKET, SO_TIMESTAMPNS, 1)
+        ancillary_size = socket.CMSG_SPACE(TIMESPEC.size)
+
+        send(port, count, 0)
+        received = 0
+        started = last = time.perf_counter()
+        try:
+            while received < count:
+                if timestamps:
+                    data, ancillary, _, addr = receiver.recvmsg(65535, ancillary_size)
+                    for level, kind, value in ancillary:
+                        if level == socket.SOL_SOCKET and kind == SO_TIMESTAMPNS:
+                            seconds, nanoseconds = TIMESPEC.unpack_from(value)
+                            timestamp = seconds + nanoseconds * 1e-9
+                else:
+                    data, addr = receiver.recvfrom(65535)
+                received += 1
+                last = time.perf_counter()
+        except socket.timeout:
+            pass
+        elapsed = last - started
+        receiver.close()
+        results[mode] = elapsed / max(received, 1)
+        print(f"  {mode:<25} {results[mode] * 1e6:5.2f} us/pacote ({received} pacotes)")
+    return results
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else 15057
+    logging.disable(logging.INFO)
+
+    if SO_TIMESTAMPNS is None:
+        print("SO_TIMESTAMPNS não é suportado nesta plataforma")
+        return
+
+    for rate in RATES:
+        measure_latency(port, count, rate)
+    print("\ncusto de recebimento:")
+    measure_receive(port, min(count, 20000))
+
+if __name__ == "__main__":
+    main()
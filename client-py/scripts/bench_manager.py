@@ -0,0 +1,99 @@
+"""
+Benchmark do início e do encerramento dos componentes pelo ComponentManager.
+
+Monta o pipeline do cliente com componentes reais (sniffer UDP, barramentos, estágios
+de estado, journal, SQLite e uploader com spool, apontado para um servidor inexistente)
+em um diretório temporário e mede start_all/stop_all de duas formas: com as dependências
+declaradas como no tanakai.py (componentes independentes em paralelo) e com cada
+componente dependendo do anterior, o que reproduz a ordem sequencial antiga.
+
+Uso: python scripts/bench_manager.py [rodadas] [porta UDP]
+"""
+
+import os
+import sys
+import time
+import logging
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.bus import EventBus
+from core.manager import ComponentManager
+from game.coalescer import PositionCoalescer
+from game.entities import EntityStore
+from game.combat import CombatAggregator
+from game.fights import FightTracker
+from game.market import MarketAggregator
+from storage.journal import JournalWriter
+from storage.database import DetectionDatabase
+from network.uploader import Uploader
+from photon.sniffer import PhotonSniffer
+
+def build(directory, port, sequential):
+    manager = ComponentManager()
+    bus = EventBus()
+    world_bus = EventBus(async_dispatch=True, name="WorldBus")
+    coalescer = PositionCoalescer(world_bus)
+    coalescer.attach(bus)
+    entities = EntityStore()
+    entities.attach(world_bus)
+    combat = CombatAggregator()
+    combat.attach(world_bus)
+    fights = FightTracker(world_bus)
+    fights.attach(world_bus)
+    market = MarketAggregator(world_bus)
+    market.attach(world_bus)
+    journal = JournalWriter(os.path.join(directory, "journal"))
+    journal.attach(world_bus)
+    database = DetectionDatabase(os.path.join(directory, "detections.db"))
+    database.attach(world_bus)
+    uploader = Uploader("http://127.0.0.1:9", spool_path=os.path.join(directory, "spool"))
+    uploader.attach(world_bus)
+    sniffer = PhotonSniffer(port=port, callback=bus.publish)
+
+    sinks = [journal, database, uploader]
+    graph = [
+        (journal, []), (database, []), (uploader, []), (entities, []), (combat, []),
+        (fights, sinks), (market, sinks),
+        (world_bus, [entities, combat, fights, market] + sinks),
+        (coalescer, [world_bus]), (bus, [coalescer]), (sniffer, [bus]),
+    ]
+    previous = None
+    for component, dependencies in graph:
+        if sequential:
+            dependencies = [previous] if previous else []
+        manager.register_component(component, depends_on=dependencies)
+        previous = component
+    return manager
+
+def measure(port, sequential):
+    with tempfile.TemporaryDirectory() as directory:
+        manager = build(directory, port, sequential)
+        started = time.perf_counter()
+        if not manager.start_all():
+            raise RuntimeError("falha ao iniciar os componentes")
+        start = time.perf_counter() - started
+        # Deixa as threads dos componentes entrarem em seus loops
+        time.sleep(0.2)
+        started = time.perf_counter()
+        manager.stop_all()
+        stop = time.perf_counter() - started
+        return start, stop, manager.get_timings()
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else 15056
+    logging.disable(logging.INFO)
+
+    for name, sequential in (("sequencial", True), ("dependências", False)):
+        results = [measure(port, sequential) for _ in range(rounds)]
+        start = min(result[0] for result in results)
+        stop = min(result[1] for result in results)
+        timings = results[-1][2]
+        slowest = sorted(timings["stop"].items(), key=lambda item: item[1], reverse=True)[:3]
+        print(f"{name:<13} start_all {start * 1000:7.1f} ms   stop_all {stop * 1000:7.1f} ms   "
+              f"(mais lentos para parar: {', '.join(f'{n} {s * 1000:.0f} ms' for n, s in slowest)})")
+
+if __name__ == "__main__":
+    main()
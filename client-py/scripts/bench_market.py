@@ -0,0 +1,89 @@
+"""
+Benchmark do agregador de mercado.
+
+Simula uma sessão de navegação no mercado: ordens sintéticas (com ordens repetidas,
+como acontece ao reabrir as mesmas páginas) passam pelo MarketAggregator, que publica
+lotes delta a cada 5 s simulados. Compara o volume de JSON das ordens brutas com o
+dos lotes delta e mede a vazão do agregador.
+
+Uso: python scripts/bench_market.py [ordens] [segundos simulados]
+"""
+
+import os
+import sys
+import gzip
+import json
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.market import MarketAggregator
+
+def make_orders(count, duration):
+    random.seed(42)
+    hot_items = [random.randrange(1, 9000) for _ in range(400)]
+    known = []
+    orders = []
+    for i in range(count):
+        timestamp = i * duration / count
+        if known and random.random() < 0.6:
+            # Mesma ordem vista novamente ao reabrir a página do item
+            order = dict(random.choice(known))
+        else:
+            order = {
+                "type": "market",
+                "order_id": random.getrandbits(48),
+                "item_id": random.choice(hot_items),
+                "location": random.randrange(6),
+                "quality": random.randrange(1, 6),
+                "price": random.randrange(100, 500000),
+                "amount": random.randrange(1, 1000),
+                "side": "buy" if random.random() < 0.3 else "sell"
+            }
+            known.append(order)
+            if len(known) > 50000:
+                known = known[-50000:]
+        orders.append((timestamp, order))
+    return orders
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300000
+    duration = float(sys.argv[2]) if len(sys.argv) > 2 else 1800.0
+    orders = make_orders(count, duration)
+    raw_json = "\n".join(json.dumps(order, separators=(",", ":")) for _, order in orders).encode()
+
+    market = MarketAggregator(window=300.0, flush_interval=5.0)
+    batches = []
+    next_flush = 5.0
+    started = time.perf_counter()
+    for timestamp, order in orders:
+        if timestamp >= next_flush:
+            batch = market.flush()
+            if batch:
+                batches.append(batch)
+            next_flush += 5.0
+        market.observe(
+            order["order_id"], order["item_id"], order["location"], order["quality"],
+            order["price"], order["amount"], order["side"] == "buy", timestamp
+        )
+    batch = market.flush()
+    if batch:
+        batches.append(batch)
+    elapsed = time.perf_counter() - started
+
+    delta_json = "\n".join(json.dumps(batch, separators=(",", ":")) for batch in batches).encode()
+    raw_gzip = len(gzip.compress(raw_json))
+    delta_gzip = len(gzip.compress(delta_json))
+    stats = market.get_stats()
+
+    print(f"ordens:              {count} em {duration:.0f} s simulados")
+    print(f"vazão do agregador:  {count / elapsed:,.0f} ordens/s ({elapsed / count * 1e6:.2f} us/ordem)")
+    print(f"ordens repetidas:    {stats['duplicates']} ({stats['duplicates'] / count:.1%})")
+    print(f"lotes publicados:    {stats['batches']} ({stats['rows_emitted']} linhas)")
+    print(f"ordens brutas:       {len(raw_json) / 1024:,.0f} KiB JSON, {raw_gzip / 1024:,.0f} KiB gzip")
+    print(f"lotes delta:         {len(delta_json) / 1024:,.0f} KiB JSON, {delta_gzip / 1024:,.0f} KiB gzip")
+    print(f"redução:             {len(raw_json) / len(delta_json):.1f}x (JSON), {len(raw_json) / delta_gzip:.0f}x (bruto JSON -> deltas gzip)")
+
+if __name__ == "__main__":
+    main()
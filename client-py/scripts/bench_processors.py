@@ -0,0 +1,41 @@
+"""
+Benchmark dos processadores padrão do Photon.
+
+Mede o melhor tempo médio (de 5 repetições) por pacote de cada processador retornado por
+get_default_processors() usando pacotes sintéticos.
+
+Uso: python scripts/bench_processors.py [iterações]
+"""
+
+import os
+import sys
+import struct
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from photon.processors import get_default_processors
+
+ADDR = ("127.0.0.1", 5056)
+
+PACKETS = {
+    "player_detection": b"\x12\x34" + struct.pack("<Iff", 1234, 10.5, -3.25),
+    "item_detection": b"\x56\x78" + struct.pack("<IBB", 998, 3, 6) + b"\x00" * 4,
+    "combat_detection": b"\x90\xab" + struct.pack("<IIf", 1, 2, 155.0),
+}
+
+MISS_PACKET = b"\x00" * 16
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    processors = get_default_processors()
+
+    for name, packet in PACKETS.items():
+        processor = processors[name]
+        assert processor(packet, ADDR) is not None, f"{name} não reconheceu o pacote"
+        elapsed = min(timeit.repeat(lambda: processor(packet, ADDR), number=iterations, repeat=5))
+        miss = min(timeit.repeat(lambda: processor(MISS_PACKET, ADDR), number=iterations, repeat=5))
+        print(f"{name:<18} hit: {elapsed / iterations * 1e9:8.1f} ns/pacote   miss: {miss / iterations * 1e9:8.1f} ns/pacote")
+
+if __name__ == "__main__":
+    main()
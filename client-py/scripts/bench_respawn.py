@@ -0,0 +1,91 @@
+"""
+Benchmark da roda de temporizadores do RespawnTracker.
+
+Arma temporizadores de respawn sintéticos (mortes espalhadas ao longo de uma hora,
+tempos de 1 a 30 minutos) e avança o relógio de segundo em segundo até todos
+vencerem. Compara a TimerWheel com um heap (heapq) no mesmo roteiro e mede o custo
+de armar um threading.Timer por entrada.
+
+Uso: python scripts/bench_respawn.py [temporizadores]
+"""
+
+import os
+import sys
+import time
+import heapq
+import random
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.respawn import TimerWheel
+
+def make_timers(count):
+    random.seed(42)
+    timers = sorted(
+        (random.randrange(3600), random.randrange(60, 1800))
+        for _ in range(count)
+    )
+    return [(start, start + respawn) for start, respawn in timers]
+
+def run_wheel(timers, end):
+    wheel = TimerWheel()
+    fired = 0
+    index = 0
+    started = time.perf_counter()
+    for tick in range(end):
+        while index < len(timers) and timers[index][0] <= tick:
+            wheel.schedule(timers[index][1], index)
+            index += 1
+        fired += len(wheel.advance(tick))
+    return time.perf_counter() - started, fired
+
+def run_heap(timers, end):
+    heap = []
+    fired = 0
+    index = 0
+    started = time.perf_counter()
+    for tick in range(end):
+        while index < len(timers) and timers[index][0] <= tick:
+            heapq.heappush(heap, (timers[index][1], index))
+            index += 1
+        while heap and heap[0][0] <= tick:
+            heapq.heappop(heap)
+            fired += 1
+    return time.perf_counter() - started, fired
+
+def run_threads(count):
+    timers = [threading.Timer(3600.0, lambda: None) for _ in range(count)]
+    started = time.perf_counter()
+    for timer in timers:
+        timer.daemon = True
+        timer.start()
+    elapsed = time.perf_counter() - started
+    for timer in timers:
+        timer.cancel()
+    return elapsed
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    timers = make_timers(count)
+    end = max(deadline for _, deadline in timers) + 1
+
+    # Pico de temporizadores pendentes ao mesmo tempo
+    events = sorted([(start, 1) for start, _ in timers] + [(deadline, -1) for _, deadline in timers])
+    pending = peak = 0
+    for _, delta in events:
+        pending += delta
+        peak = max(peak, pending)
+
+    wheel_time, wheel_fired = run_wheel(timers, end)
+    heap_time, heap_fired = run_heap(timers, end)
+    threads = min(count, 2000)
+    thread_time = run_threads(threads)
+
+    print(f"temporizadores:      {count} ({peak} pendentes no pico), {end} ticks de 1 s")
+    print(f"TimerWheel:          {wheel_time * 1e3:,.0f} ms ({wheel_time / count * 1e6:.2f} us/temporizador, {wheel_fired} disparos)")
+    print(f"heapq:               {heap_time * 1e3:,.0f} ms ({heap_time / count * 1e6:.2f} us/temporizador, {heap_fired} disparos)")
+    print(f"threading.Timer:     {thread_time / threads * 1e6:,.0f} us/temporizador para armar ({threads} threads)")
+
+if __name__ == "__main__":
+    main()
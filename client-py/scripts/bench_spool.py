@@ -0,0 +1,104 @@
+"""
+Teste de queda do servidor com o spool de upload.
+
+Publica detecções em ritmo constante no Uploader com spool enquanto o servidor local
+substituto (o de bench_uploader.py) é derrubado no meio da execução. Com o servidor
+fora do ar, o cliente também é reiniciado: um novo Uploader abre o mesmo spool. Depois
+o servidor volta e o teste espera o spool esvaziar, conferindo que todas as detecções
+chegaram exatamente uma vez (os reenvios de lotes já confirmados são contados à parte).
+
+Uso: python scripts/bench_spool.py [detecções por segundo] [segundos]
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from network.uploader import Uploader
+from bench_uploader import StandInServer, make_detection
+
+def start_server(port=0, batch_ids=None):
+    server = StandInServer(port=port, batch_ids=batch_ids)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def make_uploader(base, directory):
+    uploader = Uploader(
+        base, batch_size=1000, flush_interval=0.2, max_in_flight=4,
+        max_retries=2, backoff=0.05, max_backoff=1.0, timeout=2.0,
+        spool_path=directory, spool_bytes=64 * 1024 * 1024
+    )
+    uploader.start()
+    return uploader
+
+def main():
+    rate = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    duration = float(sys.argv[2]) if len(sys.argv) > 2 else 8.0
+    directory = tempfile.mkdtemp(prefix="tanakai-spool-")
+
+    server = start_server()
+    port = server.server_address[1]
+    base = f"http://127.0.0.1:{port}"
+    delivered = duplicates = 0
+    uploader = make_uploader(base, directory)
+
+    total = int(rate * duration)
+    kill_at, restart_at, recover_at = int(total * 0.25), int(total * 0.5), int(total * 0.75)
+    peak_events = peak_segments = 0
+    started = time.perf_counter()
+    down_since = recovered = None
+
+    for i in range(total):
+        if i == kill_at:
+            delivered, duplicates = server.detections, server.duplicates
+            server.kill()
+            down_since = time.perf_counter()
+        elif i == restart_at:
+            # Reinício do cliente com o servidor fora do ar: o spool fica no disco
+            stats = uploader.get_stats()["spool"]
+            uploader.stop()
+            print(f"cliente reiniciado com {stats['events']} detecções em {stats['segments']} segmentos no spool")
+            uploader = make_uploader(base, directory)
+        elif i == recover_at:
+            server = start_server(port, batch_ids=server.batch_ids)
+            server.detections, server.duplicates = delivered, duplicates
+            recovered = time.perf_counter()
+
+        uploader.append(make_detection(i))
+        if i % 1000 == 0:
+            spool = uploader.spool
+            peak_events = max(peak_events, spool.events)
+            peak_segments = max(peak_segments, len(spool._segments))
+            # Mantém o ritmo de publicação
+            delay = started + i / rate - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+    # Espera o spool esvaziar
+    deadline = time.perf_counter() + 60.0
+    while time.perf_counter() < deadline:
+        if not len(uploader.spool) and not uploader.get_stats()["pending"] and server.detections >= total:
+            break
+        time.sleep(0.05)
+    drained = time.perf_counter()
+    uploader.stop()
+    stats = uploader.get_stats()
+    leftover = sorted(os.listdir(directory))
+    shutil.rmtree(directory, ignore_errors=True)
+    server.kill()
+
+    print(f"detecções:           {total} publicadas a {rate}/s")
+    print(f"servidor fora do ar: {recovered - down_since:.1f} s (reinício do cliente no meio)")
+    print(f"pico do spool:       {peak_events} detecções em {peak_segments} segmentos")
+    print(f"recebidas:           {server.detections} únicas, {server.duplicates} em reenvios de lotes já confirmados")
+    print(f"perdidas:            {total - server.detections} (descartadas pelo limite do spool: {stats['spool']['dropped_events']})")
+    print(f"esvaziamento:        {drained - recovered:.1f} s após a volta do servidor; {stats['replayed']} lotes reenviados do spool")
+    print(f"segmentos restantes: {len(leftover)}")
+
+if __name__ == "__main__":
+    main()
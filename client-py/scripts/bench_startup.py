@@ -0,0 +1,83 @@
+"""
+Benchmark da inicialização do cliente.
+
+Importa o tanakai.py em processos novos com "python -X importtime" e mostra a mediana do
+tempo total de importação e os módulos mais caros. Depois mede a verificação das
+bibliotecas de captura (check_and_prompt_npcap) sem cache (primeira execução) e com o
+cache de capacidades (demais execuções).
+
+Para comparar com outra versão, passe o diretório do cliente dessa versão (ex.: um
+"git worktree" do commit anterior).
+
+Uso: python scripts/bench_startup.py [rodadas] [diretório do cliente]
+"""
+
+import os
+import sys
+import tempfile
+import statistics
+import subprocess
+
+CLIENT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def import_times(client_dir):
+    """
+    Importa o tanakai em um processo novo e retorna {módulo: (próprio, acumulado)} em microssegundos.
+    """
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import tanakai"],
+        cwd=client_dir, capture_output=True, text=True, check=True
+    ).stderr
+
+    times = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(own), int(cumulative))
+    return times
+
+def capability_check(client_dir, cache_path):
+    """
+    Mede check_and_prompt_npcap em um processo novo (o módulo já importado).
+    """
+    code = (
+        "import time, logging; logging.disable(logging.INFO)\n"
+        "from core.system import check_and_prompt_npcap\n"
+        "import inspect\n"
+        "args = (%r,) if 'cache_path' in inspect.signature(check_and_prompt_npcap).parameters else ()\n"
+        "started = time.perf_counter(); ok = check_and_prompt_npcap(*args)\n"
+        "print(ok, time.perf_counter() - started)\n"
+    ) % cache_path
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=client_dir, capture_output=True, text=True, check=True
+    ).stdout.split()
+    return output[-2] == "True", float(output[-1])
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    client_dir = os.path.abspath(sys.argv[2]) if len(sys.argv) > 2 else CLIENT_DIR
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        runs = [import_times(client_dir) for _ in range(rounds)]
+
+        total = statistics.median(run["tanakai"][1] for run in runs)
+        print(f"importação do tanakai (mediana de {rounds}): {total / 1000:.1f} ms")
+
+        median = {
+            name: statistics.median(run[name][1] for run in runs if name in run)
+            for name in runs[-1] if name != "tanakai"
+        }
+        print("módulos mais caros (acumulado, mediana):")
+        for name, cumulative in sorted(median.items(), key=lambda item: item[1], reverse=True)[:12]:
+            print(f"  {cumulative / 1000:7.1f} ms  {name}")
+
+        cache_path = os.path.join(cache_dir, "capabilities.json")
+        checks = [capability_check(client_dir, cache_path) for _ in range(rounds)]
+        available = checks[0][0]
+        print(f"\nbiblioteca de captura disponível: {available}")
+        print(f"check_and_prompt_npcap: primeira execução {checks[0][1] * 1000:.2f} ms, "
+              f"demais (mediana) {statistics.median(elapsed for _, elapsed in checks[1:]) * 1000:.2f} ms")
+
+if __name__ == "__main__":
+    main()
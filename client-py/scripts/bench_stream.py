@@ -0,0 +1,201 @@
+"""
+Benchmark da sessão de streaming contra o uploader em lotes.
+
+Sobe, em outro processo, um servidor local substituto que implementa a rota de lotes
+(/v1/client/detections) e a sessão de streaming (/v1/client/session: POST chunked de
+lotes e GET em streaming de créditos/ACKs). O servidor mede a latência fim a fim de
+cada detecção (chegada no servidor - momento em que foi publicada no cliente) e o
+próprio uso de CPU. Cada modo publica o mesmo fluxo constante de detecções; o
+cliente mede o próprio uso de CPU.
+
+Uso: python scripts/bench_stream.py [detecções por segundo] [segundos]
+"""
+
+import os
+import sys
+import gzip
+import json
+import time
+import queue
+import random
+import resource
+import threading
+import multiprocessing
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from network.uploader import Uploader
+from network.stream import (
+    StreamSession, FrameDecoder, encode_frame,
+    FRAME_BATCH, FRAME_HELLO, FRAME_ACK, FRAME_CREDIT, FRAME_HEARTBEAT, FLAG_GZIP
+)
+from bench_uploader import make_detection
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StandInHandler)
+        self.lock = threading.Lock()
+        self.sessions = {}
+        self.latencies = []
+        self.requests = 0
+
+    def record(self, body, gzipped):
+        now = time.time()
+        if gzipped:
+            body = gzip.decompress(body)
+        latencies = [now - json.loads(line)["ts"] for line in body.splitlines() if line]
+        with self.lock:
+            self.latencies.extend(latencies)
+        return len(latencies)
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        if self.path == "/stats":
+            with server.lock:
+                latencies, server.latencies = sorted(server.latencies), []
+                requests_count, server.requests = server.requests, 0
+            stats = {"count": len(latencies), "requests": requests_count, "cpu": time.process_time()}
+            if latencies:
+                stats.update({
+                    "avg": sum(latencies) / len(latencies),
+                    "p50": latencies[len(latencies) // 2],
+                    "p99": latencies[int(len(latencies) * 0.99)],
+                    "max": latencies[-1]
+                })
+            return self._reply(200, stats)
+
+        outbox = server.sessions.get(self.path.split("/")[-2])
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        self._write_chunk(encode_frame(FRAME_HELLO))
+        while True:
+            try:
+                frames = [outbox.get(timeout=5.0)]
+            except queue.Empty:
+                frames = [encode_frame(FRAME_HEARTBEAT)]
+            while not outbox.empty():
+                frames.append(outbox.get_nowait())
+            try:
+                self._write_chunk(b"".join(frames))
+            except OSError:
+                return
+
+    def do_POST(self):
+        server = self.server
+        with server.lock:
+            server.requests += 1
+
+        if self.path.endswith("/session"):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            session_id = f"s{len(server.sessions) + 1}"
+            server.sessions[session_id] = queue.Queue()
+            return self._reply(200, {"session": session_id, "credits": 16, "catalog_version": "bench"})
+
+        if self.path.endswith("/batches"):
+            outbox = server.sessions[self.path.split("/")[-2]]
+            decoder = FrameDecoder()
+            for chunk in self._read_chunks():
+                for kind, flags, seq, payload in decoder.feed(chunk):
+                    if kind == FRAME_BATCH:
+                        server.record(payload, flags & FLAG_GZIP)
+                        outbox.put(encode_frame(FRAME_ACK, seq))
+                        outbox.put(encode_frame(FRAME_CREDIT, 1))
+            return self._reply(200, {})
+
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        count = server.record(body, self.headers.get("Content-Encoding") == "gzip")
+        self._reply(200, {"accepted": count})
+
+    def do_DELETE(self):
+        self._reply(200, {"closed": True})
+
+    def _read_chunks(self):
+        while True:
+            size = int(self.rfile.readline().split(b";")[0], 16)
+            if size == 0:
+                self.rfile.readline()
+                return
+            data = self.rfile.read(size)
+            self.rfile.readline()
+            yield data
+
+    def _write_chunk(self, data):
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def _reply(self, status, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+def serve(port_queue):
+    server = StandInServer()
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+def cpu_time():
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+def run(name, sink, base, rate, duration):
+    random.seed(42)
+    total = int(rate * duration)
+    requests.get(base + "/stats")
+    cpu_started = cpu_time()
+    sink.start()
+    started = time.perf_counter()
+    for i in range(total):
+        sink.append(make_detection(i))
+        if i % 50 == 0:
+            delay = started + i / rate - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+    sink.stop()
+    cpu = cpu_time() - cpu_started
+    stats = requests.get(base + "/stats").json()
+    print(f"{name:<22} p50 {stats['p50'] * 1000:7.1f} ms  p99 {stats['p99'] * 1000:7.1f} ms  "
+          f"máx {stats['max'] * 1000:7.1f} ms  requisições {stats['requests']:5d}  "
+          f"CPU cliente {cpu / total * 1e6:5.1f} us/detecção  (recebidas {stats['count']}/{total})")
+    return stats["cpu"]
+
+def main():
+    rate = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    duration = float(sys.argv[2]) if len(sys.argv) > 2 else 5.0
+
+    port_queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=serve, args=(port_queue,), daemon=True)
+    process.start()
+    base = f"http://127.0.0.1:{port_queue.get()}"
+
+    print(f"{rate} detecções/s por {duration:.0f} s")
+    server_cpu = requests.get(base + "/stats").json()["cpu"]
+    modes = [
+        ("uploader (lotes 1 s)", Uploader(base, flush_interval=1.0)),
+        ("uploader (lotes 50 ms)", Uploader(base, flush_interval=0.05)),
+        ("streaming (50 ms)", StreamSession(base, flush_interval=0.05)),
+    ]
+    for name, sink in modes:
+        cpu = run(name, sink, base, rate, duration)
+        print(f"{'':<22} CPU servidor {(cpu - server_cpu) * 1000:6.0f} ms")
+        server_cpu = cpu
+    process.terminate()
+
+if __name__ == "__main__":
+    main()
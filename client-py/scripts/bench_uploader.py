@@ -0,0 +1,148 @@
+"""
+Benchmark do uploader de detecções contra um servidor local substituto.
+
+Sobe um servidor HTTP/1.1 mínimo (keep-alive) que imita a rota /v1/client/detections
+do servidor Tanakai: descompacta o lote, conta as detecções e ignora lotes reenviados.
+Publica detecções sintéticas no Uploader e mede a vazão e os bytes enviados por
+detecção. Para comparação, envia uma amostra com uma requisição por detecção.
+Com fail_rate > 0 o servidor responde 503 a essa fração dos lotes, exercitando os reenvios.
+
+Uso: python scripts/bench_uploader.py [detecções] [fail_rate]
+"""
+
+import os
+import sys
+import gzip
+import json
+import time
+import random
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from network.uploader import Uploader, UPLOAD_ROUTE
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, fail_rate=0.0, port=0, batch_ids=None):
+        super().__init__(("127.0.0.1", port), StandInHandler)
+        self.fail_rate = fail_rate
+        self.lock = threading.Lock()
+        self.sockets = set()
+        self.batch_ids = set() if batch_ids is None else batch_ids
+        self.detections = 0
+        self.duplicates = 0
+        self.requests = 0
+        self.body_bytes = 0
+        self.connections = 0
+
+    def kill(self):
+        """
+        Derruba o servidor como uma queda real: para de aceitar e fecha as conexões abertas.
+        """
+        self.shutdown()
+        self.server_close()
+        with self.lock:
+            for sock in self.sockets:
+                try:
+                    sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+            self.server.sockets.add(self.connection)
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            server.body_bytes += len(body)
+
+        if random.random() < server.fail_rate:
+            return self._reply(503, {"detail": "indisponível"})
+
+        if self.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        count = sum(1 for line in body.splitlines() if line.strip())
+
+        batch_id = self.headers.get("X-Batch-Id")
+        with server.lock:
+            if batch_id in server.batch_ids:
+                server.duplicates += count
+            else:
+                if batch_id:
+                    server.batch_ids.add(batch_id)
+                server.detections += count
+        self._reply(200, {"accepted": count})
+
+    def _reply(self, status, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+def make_detection(i):
+    kind = i % 10
+    if kind < 6:
+        return {"type": "player", "id": 1000 + i % 300, "x": random.uniform(-500, 500), "y": random.uniform(-500, 500)}
+    if kind < 9:
+        return {"type": "combat", "attacker_id": 1000 + i % 300, "target_id": 1000 + (i * 7) % 300, "damage": round(random.uniform(10, 900), 1)}
+    return {"type": "item", "id": i, "item_type": i % 40, "tier": 4 + i % 5}
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    fail_rate = float(sys.argv[2]) if len(sys.argv) > 2 else 0.0
+    random.seed(42)
+    detections = [make_detection(i) for i in range(count)]
+
+    server = StandInServer(fail_rate)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    uploader = Uploader(base, batch_size=2000, flush_interval=0.5, max_in_flight=4, backoff=0.05)
+    uploader.start()
+    started = time.perf_counter()
+    for detection in detections:
+        uploader.append(detection)
+    uploader.stop()
+    elapsed = time.perf_counter() - started
+    stats = uploader.get_stats()
+    received, connections = server.detections, server.connections
+
+    # Referência: uma requisição por detecção (amostra)
+    sample = detections[:2000]
+    session = requests.Session()
+    single_started = time.perf_counter()
+    for detection in sample:
+        session.post(base + UPLOAD_ROUTE, data=json.dumps(detection), headers={"Content-Type": "application/json"})
+    single_elapsed = time.perf_counter() - single_started
+    single_bytes = sum(len(json.dumps(detection)) for detection in sample)
+
+    print(f"detecções:           {count} (recebidas pelo servidor: {received})")
+    print(f"lotes:               {stats['batches']} enviados, {stats['failed_batches']} com falha, {stats['retries']} reenvios")
+    print(f"conexões abertas:    {connections}")
+    print(f"uploader:            {count / elapsed:,.0f} detecções/s, {stats['bytes_per_event']:.1f} bytes/detecção "
+          f"(compressão {stats['compression_ratio']:.1f}x, {stats['avg_send_ms']:.1f} ms/lote)")
+    print(f"1 req/detecção:      {len(sample) / single_elapsed:,.0f} detecções/s, {single_bytes / len(sample):.1f} bytes/detecção (só o corpo)")
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Treina o dicionário de compressão dos lotes de upload e compara com a compressão sem dicionário.
+
+Lê as detecções gravadas no journal (ou, sem journal, gera tráfego sintético), treina o
+dicionário com 70% delas e mede, nos 30% restantes, a razão de compressão e o custo de
+CPU (compressão e descompressão por lote) de lotes pequenos com gzip, zlib sem
+dicionário e zlib com o dicionário. O dicionário é salvo no arquivo de saída, que o
+cliente carrega pelo config.upload_dictionary_path.
+
+Uso: python scripts/train_dictionary.py [diretório do journal] [arquivo de saída] [tamanho do dicionário]
+"""
+
+import os
+import sys
+import json
+import zlib
+import gzip
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from storage.journal import JournalReader
+from network.codec import BatchCodec, train_dictionary
+from bench_uploader import make_detection
+
+# Tamanhos (bytes NDJSON) dos lotes medidos
+BATCH_SIZES = (512, 1024, 2048, 4096, 16384)
+
+def load_samples(directory):
+    """
+    Serializa as detecções como o uploader: {"ts": ..., **detecção} em JSON compacto.
+    """
+    if directory and os.path.isdir(directory):
+        records = JournalReader(directory).iter_records()
+        source = f"journal '{directory}'"
+    else:
+        random.seed(42)
+        started = time.time()
+        records = ((started + i * 0.0002, make_detection(i)) for i in range(100000))
+        source = "tráfego sintético"
+
+    lines = [
+        json.dumps({"ts": timestamp, **result}, separators=(",", ":"), default=str).encode()
+        for timestamp, result in records
+    ]
+    return lines, source
+
+def make_batches(lines, size):
+    batches, batch, total = [], [], 0
+    for line in lines:
+        batch.append(line)
+        total += len(line) + 1
+        if total >= size:
+            batches.append(b"\n".join(batch))
+            batch, total = [], 0
+    return batches[:2000]
+
+def measure(batches, compress, decompress):
+    started = time.process_time()
+    bodies = [compress(raw) for raw in batches]
+    compress_time = time.process_time() - started
+    started = time.process_time()
+    for body in bodies:
+        decompress(body)
+    decompress_time = time.process_time() - started
+    raw = sum(len(raw) for raw in batches)
+    sent = sum(len(body) for body in bodies)
+    return raw / sent, compress_time / len(batches) * 1e6, decompress_time / len(batches) * 1e6
+
+def zlib_raw(level):
+    def compress(raw):
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+        return compressor.compress(raw) + compressor.flush()
+    return compress, lambda body: zlib.decompress(body, -15)
+
+def main():
+    directory = sys.argv[1] if len(sys.argv) > 1 else None
+    output = sys.argv[2] if len(sys.argv) > 2 else os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "upload.zdict")
+    size = int(sys.argv[3]) if len(sys.argv) > 3 else 16 * 1024
+
+    lines, source = load_samples(directory)
+    if len(lines) < 100:
+        print(f"Poucas detecções em {source} para treinar um dicionário ({len(lines)})")
+        sys.exit(1)
+
+    split = len(lines) * 7 // 10
+    started = time.perf_counter()
+    dictionary = train_dictionary(lines[:split], size)
+    print(f"{len(lines)} detecções de {source}; dicionário de {len(dictionary)} bytes "
+          f"treinado em {time.perf_counter() - started:.2f} s")
+
+    with open(output, "wb") as file:
+        file.write(dictionary)
+    print(f"Dicionário salvo em '{output}'\n")
+
+    test = lines[split:]
+    for level in (1, 6):
+        codec = BatchCodec(dictionary, level)
+        modes = [
+            ("gzip", lambda raw: gzip.compress(raw, compresslevel=level), gzip.decompress),
+            ("zlib", *zlib_raw(level)),
+            ("zlib + dicionário", codec.encode, codec.decode),
+        ]
+        print(f"Nível {level}")
+        for batch_size in BATCH_SIZES:
+            batches = make_batches(test, batch_size)
+            for name, compress, decompress in modes:
+                ratio, compress_us, decompress_us = measure(batches, compress, decompress)
+                print(f"  lotes de {batch_size:5d} B  {name:<18} razão {ratio:5.2f}x  "
+                      f"compressão {compress_us:6.1f} us/lote  descompressão {decompress_us:5.1f} us/lote")
+        print()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,16 @@
+"""
+Módulo storage - Persistência local das detecções do cliente Tanakai.
+"""
+
+from .journal import JournalWriter, JournalReader, encode_record, list_segments
+from .database import DetectionDatabase
+from .spool import UploadSpool
+
+__all__ = [
+    "JournalWriter",
+    "JournalReader",
+    "encode_record",
+    "list_segments",
+    "DetectionDatabase",
+    "UploadSpool"
+]
@@ -0,0 +1,176 @@
+import os
+import mmap
+import struct
+from bisect import bisect_left
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+# Cabeçalho da tabela: assinatura, versão do formato, quantidade de entradas e tamanho da versão do catálogo
+TABLE_MAGIC = b"TKC1"
+TABLE_HEADER = struct.Struct("<4sHIH")
+TABLE_SUFFIX = ".tkc"
+
+
+def _align(size: int) -> int:
+    return (size + 3) & ~3
+
+
+class CatalogTable:
+    """
+    Tabela compacta id -> (nome, tier) de um catálogo (itens ou mobs), mapeada em memória.
+
+    O arquivo guarda os ids ordenados (uint32), os tiers (uint8), os offsets de cada
+    nome (uint32) e um blob com os nomes em UTF-8. A busca é binária sobre os ids
+    mapeados, sem carregar a tabela em objetos Python: o custo residente é apenas
+    o das páginas efetivamente acessadas.
+    """
+
+    def __init__(self, path: str):
+        """
+        Abre uma tabela gravada por CatalogTable.write.
+
+        Args:
+            path (str): Caminho do arquivo da tabela
+
+        Raises:
+            ValueError: Se o arquivo não for uma tabela de catálogo válida
+        """
+        self.path = path
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, _, count, version_size = TABLE_HEADER.unpack_from(self._mmap, 0)
+        if magic != TABLE_MAGIC:
+            self._mmap.close()
+            raise ValueError(f"'{path}' não é uma tabela de catálogo")
+
+        offset = TABLE_HEADER.size
+        self.version = self._mmap[offset:offset + version_size].decode("utf-8")
+        offset = _align(offset + version_size)
+
+        view = memoryview(self._mmap)
+        self._ids = view[offset:offset + 4 * count].cast("I")
+        offset += 4 * count
+        self._tiers = view[offset:offset + count]
+        offset = _align(offset + count)
+        self._offsets = view[offset:offset + 4 * (count + 1)].cast("I")
+        offset += 4 * (count + 1)
+        self._blob = view[offset:]
+        self._count = count
+
+    @staticmethod
+    def write(path: str, version: str, entries: Iterable[Sequence]) -> str:
+        """
+        Grava uma tabela a partir das entradas do catálogo.
+
+        Args:
+            path (str): Caminho do arquivo da tabela
+            version (str): Versão do catálogo (dos dumps do servidor)
+            entries (Iterable[Sequence]): Entradas [id, tier, nome]
+
+        Returns:
+            str: Caminho gravado
+        """
+        rows = sorted((int(entry[0]), int(entry[1] or 0), str(entry[2] or "")) for entry in entries)
+        count = len(rows)
+        version_bytes = version.encode("utf-8")
+
+        header = TABLE_HEADER.pack(TABLE_MAGIC, 1, count, len(version_bytes)) + version_bytes
+        names = [name.encode("utf-8") for _, _, name in rows]
+        offsets = [0]
+        for name in names:
+            offsets.append(offsets[-1] + len(name))
+
+        tiers = bytes(min(tier, 255) for _, tier, _ in rows)
+        parts = [
+            header, b"\0" * (_align(len(header)) - len(header)),
+            struct.pack(f"<{count}I", *(entity_id for entity_id, _, _ in rows)),
+            tiers, b"\0" * (_align(count) - count),
+            struct.pack(f"<{count + 1}I", *offsets),
+            b"".join(names)
+        ]
+
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as file:
+            file.write(b"".join(parts))
+        os.replace(temp_path, path)
+        return path
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, entity_id: int) -> bool:
+        return self._index(entity_id) >= 0
+
+    def lookup(self, entity_id: int) -> Optional[Tuple[str, int]]:
+        """
+        Resolve um id em O(log n).
+
+        Args:
+            entity_id (int): Id do item ou mob
+
+        Returns:
+            Optional[Tuple[str, int]]: (nome, tier) ou None se o id não existir
+        """
+        index = self._index(entity_id)
+        if index < 0:
+            return None
+        offsets = self._offsets
+        name = bytes(self._blob[offsets[index]:offsets[index + 1]]).decode("utf-8")
+        return name, self._tiers[index]
+
+    def name(self, entity_id: int) -> Optional[str]:
+        found = self.lookup(entity_id)
+        return found[0] if found else None
+
+    def tier(self, entity_id: int) -> Optional[int]:
+        index = self._index(entity_id)
+        return self._tiers[index] if index >= 0 else None
+
+    def ids(self) -> List[int]:
+        return self._ids.tolist()
+
+    def close(self) -> None:
+        """
+        Libera as visões e o mapeamento do arquivo.
+        """
+        for view in (self._ids, self._tiers, self._offsets, self._blob):
+            view.release()
+        self._mmap.close()
+
+    def _index(self, entity_id: int) -> int:
+        ids = self._ids
+        index = bisect_left(ids, entity_id)
+        if index < self._count and ids[index] == entity_id:
+            return index
+        return -1
+
+
+def table_path(directory: str, kind: str, version: str) -> str:
+    """
+    Caminho da tabela de um catálogo em uma versão.
+    O nome inclui a versão: uma tabela nova nunca sobrescreve a que está mapeada.
+    """
+    return os.path.join(directory, f"{kind}-{version}{TABLE_SUFFIX}")
+
+
+def find_table(directory: str, kind: str) -> Optional[str]:
+    """
+    Encontra a tabela mais recente de um catálogo no diretório.
+
+    Args:
+        directory (str): Diretório das tabelas
+        kind (str): Tipo do catálogo ("items" ou "mobs")
+
+    Returns:
+        Optional[str]: Caminho da tabela ou None
+    """
+    try:
+        names = [
+            name for name in os.listdir(directory)
+            if name.startswith(f"{kind}-") and name.endswith(TABLE_SUFFIX)
+        ]
+    except FileNotFoundError:
+        return None
+    if not names:
+        return None
+    return max((os.path.join(directory, name) for name in names), key=os.path.getmtime)
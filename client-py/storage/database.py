@@ -0,0 +1,381 @@
+import json
+import time
+import queue
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.base import BaseComponent
+from core.bus import EventBus
+
+# Campos do resultado usados como entidade da detecção, em ordem de preferência
+ENTITY_FIELDS = ("id", "attacker_id", "fight_id")
+
+SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS detections (
+        ts REAL NOT NULL,
+        kind TEXT NOT NULL,
+        entity INTEGER,
+        payload TEXT NOT NULL
+    )
+    """,
+    # Índices de cobertura: consultas por tempo, tipo ou entidade não precisam ler a tabela
+    "CREATE INDEX IF NOT EXISTS idx_detections_time ON detections (ts, kind, entity)",
+    "CREATE INDEX IF NOT EXISTS idx_detections_kind ON detections (kind, ts, entity)",
+    "CREATE INDEX IF NOT EXISTS idx_detections_entity ON detections (entity, ts, kind)",
+)
+
+INSERT_SQL = "INSERT INTO detections (ts, kind, entity, payload) VALUES (?, ?, ?, ?)"
+
+
+def _entity_of(result: Dict[str, Any]) -> Optional[int]:
+    for field in ENTITY_FIELDS:
+        value = result.get(field)
+        if value is not None:
+            return value
+    return None
+
+
+class DetectionDatabase(BaseComponent):
+    """
+    Sink do barramento de detecções que grava o histórico em um banco SQLite local (modo WAL).
+
+    A assinatura do barramento apenas enfileira a detecção (sem bloquear a captura;
+    com a fila cheia o evento é descartado e contado). Uma thread dedicada grava os
+    eventos em transações em lote, confirmadas a cada batch_interval segundos ou
+    batch_rows linhas, o que vier primeiro. As consultas usam conexões próprias,
+    que no modo WAL não esperam pelo escritor.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        batch_rows: int = 5000,
+        batch_interval: float = 0.25,
+        queue_size: int = 100000,
+        retention_seconds: float = 0.0
+    ):
+        """
+        Inicializa o banco de detecções.
+
+        Args:
+            path (str): Caminho do arquivo SQLite
+            batch_rows (int): Quantidade máxima de linhas por transação
+            batch_interval (float): Tempo máximo, em segundos, até a confirmação de um lote
+            queue_size (int): Tamanho máximo da fila de detecções pendentes
+            retention_seconds (float): Idade máxima das detecções mantidas (0 desativa)
+        """
+        super().__init__("DetectionDatabase")
+        self.path = path
+        self.batch_rows = batch_rows
+        self.batch_interval = batch_interval
+        self.retention_seconds = retention_seconds
+
+        self.inserted = 0
+        self.dropped = 0
+        self.commits = 0
+        self.commit_time = 0.0
+        self.max_batch = 0
+        self.queries = 0
+        self.query_time = 0.0
+        self.max_query_time = 0.0
+
+        self._queue: "queue.Queue[Tuple[float, Dict[str, Any]]]" = queue.Queue(maxsize=queue_size)
+        self._local = threading.local()
+        self._started_at = 0.0
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self) -> bool:
+        """
+        Cria o esquema e inicia a thread de gravação.
+
+        Returns:
+            bool: True se iniciado com sucesso
+        """
+        if self._running:
+            return True
+
+        try:
+            connection = self._connect()
+            try:
+                for statement in SCHEMA:
+                    connection.execute(statement)
+                connection.commit()
+            finally:
+                connection.close()
+        except Exception as e:
+            self.logger.error(f"Erro ao abrir o banco de detecções '{self.path}': {str(e)}")
+            return False
+
+        self._running = True
+        self._started_at = time.monotonic()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._writer_loop, name="DetectionDatabase", daemon=True)
+        self._thread.start()
+        self.logger.info(f"Banco de detecções iniciado em '{self.path}'")
+        return True
+
+    def stop(self) -> bool:
+        """
+        Grava o que ainda estiver na fila e encerra a thread de gravação.
+
+        Returns:
+            bool: True se parado com sucesso
+        """
+        if not self._running:
+            return True
+
+        self._running = False
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=10.0)
+            self._thread = None
+        return True
+
+    def attach(self, bus: EventBus, kind: str = EventBus.ALL) -> None:
+        """
+        Registra o banco como assinante do barramento de detecções.
+
+        Args:
+            bus (EventBus): Barramento de detecções
+            kind (str): Tipo de detecção gravado (padrão: todos)
+        """
+        bus.subscribe(kind, self.handle_detection, name="DetectionDatabase")
+
+    def handle_detection(self, processor_name: str, result: Dict[str, Any], data: bytes, addr: tuple) -> None:
+        """
+        Assinante do barramento: enfileira a detecção para gravação.
+
+        Args:
+            processor_name (str): Nome do processador que identificou o pacote
+            result (dict): Resultado do processamento
+            data (bytes): Dados brutos do pacote
+            addr (tuple): Endereço de origem (IP, porta)
+        """
+        self.append(result)
+
+    def append(self, result: Dict[str, Any], timestamp: Optional[float] = None) -> bool:
+        """
+        Enfileira uma detecção para gravação, sem bloquear.
+
+        Args:
+            result (dict): Resultado do processador
+            timestamp (float, optional): Momento da detecção (padrão: agora)
+
+        Returns:
+            bool: False se a detecção foi descartada por fila cheia
+        """
+        try:
+            self._queue.put_nowait((time.time() if timestamp is None else timestamp, result))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def query(
+        self,
+        kind: Optional[str] = None,
+        entity: Optional[int] = None,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        limit: int = 1000
+    ) -> List[Dict[str, Any]]:
+        """
+        Consulta as detecções gravadas, das mais recentes para as mais antigas.
+
+        Args:
+            kind (str, optional): Tipo de detecção
+            entity (int, optional): Entidade
+            start (float, optional): Início do intervalo (epoch em segundos)
+            end (float, optional): Fim do intervalo (epoch em segundos)
+            limit (int): Quantidade máxima de detecções
+
+        Returns:
+            List[Dict[str, Any]]: Detecções, com o momento da gravação no campo "ts"
+        """
+        where, params = self._filters(kind, entity, start, end)
+        rows = self._execute(
+            f"SELECT ts, payload FROM detections{where} ORDER BY ts DESC LIMIT ?",
+            params + [limit]
+        )
+        return [{"ts": ts, **json.loads(payload)} for ts, payload in rows]
+
+    def count(
+        self,
+        kind: Optional[str] = None,
+        entity: Optional[int] = None,
+        start: Optional[float] = None,
+        end: Optional[float] = None
+    ) -> int:
+        """
+        Conta as detecções gravadas (respondida apenas pelos índices).
+
+        Args:
+            kind (str, optional): Tipo de detecção
+            entity (int, optional): Entidade
+            start (float, optional): Início do intervalo (epoch em segundos)
+            end (float, optional): Fim do intervalo (epoch em segundos)
+
+        Returns:
+            int: Quantidade de detecções
+        """
+        where, params = self._filters(kind, entity, start, end)
+        return self._execute(f"SELECT COUNT(*) FROM detections{where}", params)[0][0]
+
+    def count_by_kind(self, start: Optional[float] = None, end: Optional[float] = None) -> Dict[str, int]:
+        """
+        Conta as detecções gravadas por tipo.
+
+        Args:
+            start (float, optional): Início do intervalo (epoch em segundos)
+            end (float, optional): Fim do intervalo (epoch em segundos)
+
+        Returns:
+            Dict[str, int]: Tipo -> quantidade
+        """
+        where, params = self._filters(None, None, start, end)
+        rows = self._execute(f"SELECT kind, COUNT(*) FROM detections{where} GROUP BY kind", params)
+        return dict(rows)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retorna as estatísticas do banco.
+
+        Returns:
+            Dict[str, Any]: Linhas gravadas, descartadas, pendentes, taxa de inserção
+                            e latência das transações e das consultas
+        """
+        elapsed = time.monotonic() - self._started_at if self._started_at else 0.0
+        return {
+            "inserted": self.inserted,
+            "dropped": self.dropped,
+            "pending": self._queue.qsize(),
+            "commits": self.commits,
+            "avg_batch": self.inserted / self.commits if self.commits else 0.0,
+            "max_batch": self.max_batch,
+            "insert_rate": self.inserted / elapsed if elapsed else 0.0,
+            "commit_rate": self.inserted / self.commit_time if self.commit_time else 0.0,
+            "avg_commit_ms": self.commit_time / self.commits * 1000 if self.commits else 0.0,
+            "queries": self.queries,
+            "avg_query_ms": self.query_time / self.queries * 1000 if self.queries else 0.0,
+            "max_query_ms": self.max_query_time * 1000
+        }
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Abre uma conexão configurada para WAL.
+        """
+        connection = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def _execute(self, sql: str, params: List[Any]) -> List[Tuple]:
+        """
+        Executa uma consulta na conexão de leitura da thread atual, medindo a latência.
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = self._connect()
+
+        started = time.perf_counter()
+        rows = connection.execute(sql, params).fetchall()
+        elapsed = time.perf_counter() - started
+
+        self.queries += 1
+        self.query_time += elapsed
+        if elapsed > self.max_query_time:
+            self.max_query_time = elapsed
+        return rows
+
+    @staticmethod
+    def _filters(
+        kind: Optional[str],
+        entity: Optional[int],
+        start: Optional[float],
+        end: Optional[float]
+    ) -> Tuple[str, List[Any]]:
+        """
+        Monta a cláusula WHERE das consultas.
+        """
+        clauses = []
+        params: List[Any] = []
+        for clause, value in (("kind = ?", kind), ("entity = ?", entity), ("ts >= ?", start), ("ts <= ?", end)):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def _writer_loop(self) -> None:
+        """
+        Loop da thread de gravação: agrupa as detecções da fila em transações.
+        """
+        try:
+            connection = self._connect()
+        except Exception as e:
+            self.logger.error(f"Erro ao abrir o banco de detecções: {str(e)}")
+            return
+
+        last_retention = time.monotonic()
+        get = self._queue.get
+        while True:
+            batch = []
+            deadline = time.monotonic() + self.batch_interval
+            while len(batch) < self.batch_rows:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(get(timeout=timeout))
+                except queue.Empty:
+                    break
+
+            # Ao parar, grava o restante da fila antes de sair
+            stopping = self._stop_event.is_set()
+            if stopping:
+                while True:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+            if batch:
+                try:
+                    self._write_batch(connection, batch)
+                except Exception as e:
+                    self.logger.error(f"Erro ao gravar lote de detecções: {str(e)}")
+
+            if self.retention_seconds > 0 and time.monotonic() - last_retention >= 60.0:
+                last_retention = time.monotonic()
+                try:
+                    with connection:
+                        connection.execute("DELETE FROM detections WHERE ts < ?", (time.time() - self.retention_seconds,))
+                except Exception as e:
+                    self.logger.error(f"Erro ao aplicar a retenção do banco: {str(e)}")
+
+            if stopping:
+                break
+
+        connection.close()
+
+    def _write_batch(self, connection: sqlite3.Connection, batch: List[Tuple[float, Dict[str, Any]]]) -> None:
+        """
+        Grava um lote de detecções em uma única transação.
+        """
+        dumps = json.dumps
+        rows = [
+            (timestamp, result.get("type", "unknown"), _entity_of(result), dumps(result, separators=(",", ":"), default=str))
+            for timestamp, result in batch
+        ]
+
+        started = time.perf_counter()
+        with connection:
+            connection.executemany(INSERT_SQL, rows)
+        self.commit_time += time.perf_counter() - started
+
+        self.commits += 1
+        self.inserted += len(rows)
+        if len(rows) > self.max_batch:
+            self.max_batch = len(rows)
@@ -0,0 +1,483 @@
+import os
+import json
+import mmap
+import time
+import struct
+import threading
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from core.base import BaseComponent
+from core.bus import EventBus
+from photon.layout import Layout
+
+# Cabeçalho de cada segmento: assinatura + versão do formato
+SEGMENT_MAGIC = b"TKJ1"
+SEGMENT_HEADER = struct.Struct("<4sH")
+SEGMENT_SUFFIX = ".tkj"
+SEGMENT_VERSION = 2
+
+# Cabeçalho de cada registro: tamanho do corpo (após o campo de tamanho), timestamp e código do tipo
+RECORD_HEADER = struct.Struct("<IdB")
+RECORD_LENGTH_SIZE = 4
+RECORD_BODY_HEADER_SIZE = RECORD_HEADER.size - RECORD_LENGTH_SIZE
+
+# Cabeçalho dos registros por versão do formato (a versão 1 usava tamanho de 16 bits)
+RECORD_HEADERS: Dict[int, Tuple[struct.Struct, int]] = {
+    1: (struct.Struct("<HdB"), 2),
+    SEGMENT_VERSION: (RECORD_HEADER, RECORD_LENGTH_SIZE),
+}
+
+# Código usado para tipos sem esquema fixo (payload JSON)
+KIND_OTHER = 0
+
+
+class RecordSchema(NamedTuple):
+    """
+    Esquema binário fixo de um tipo de detecção no journal.
+    """
+    kind: str
+    code: int
+    layout: Layout
+    encode: Callable[[Dict[str, Any]], Tuple]
+    decode: Callable[[Tuple], Dict[str, Any]]
+
+
+SCHEMAS: Tuple[RecordSchema, ...] = (
+    RecordSchema(
+        "player", 1, Layout("<I f f", fields=("id", "x", "y")),
+        lambda r: (r["id"], r["position"]["x"], r["position"]["y"]),
+        lambda v: {"type": "player", "id": v[0], "position": {"x": v[1], "y": v[2]}}
+    ),
+    RecordSchema(
+        "item", 2, Layout("<I B B", fields=("id", "item_type", "tier")),
+        lambda r: (r["id"], r["item_type"], r["tier"]),
+        lambda v: {"type": "item", "id": v[0], "item_type": v[1], "tier": v[2]}
+    ),
+    RecordSchema(
+        "combat", 3, Layout("<I I f", fields=("attacker_id", "target_id", "damage")),
+        lambda r: (r["attacker_id"], r["target_id"], r["damage"]),
+        lambda v: {"type": "combat", "attacker_id": v[0], "target_id": v[1], "damage": v[2]}
+    ),
+)
+
+SCHEMAS_BY_KIND: Dict[str, RecordSchema] = {schema.kind: schema for schema in SCHEMAS}
+SCHEMAS_BY_CODE: Dict[int, RecordSchema] = {schema.code: schema for schema in SCHEMAS}
+
+
+def encode_record(result: Dict[str, Any], timestamp: float) -> bytes:
+    """
+    Empacota uma detecção como registro binário com prefixo de tamanho.
+
+    Args:
+        result (dict): Resultado do processador
+        timestamp (float): Momento da detecção (epoch em segundos)
+
+    Returns:
+        bytes: Registro pronto para ser anexado ao segmento
+    """
+    schema = SCHEMAS_BY_KIND.get(result.get("type"))
+    if schema is not None:
+        try:
+            payload = schema.layout.pack(*schema.encode(result))
+            return RECORD_HEADER.pack(RECORD_BODY_HEADER_SIZE + len(payload), timestamp, schema.code) + payload
+        except (KeyError, TypeError, struct.error):
+            # Resultado fora do esquema: grava como JSON
+            pass
+
+    payload = json.dumps(result, separators=(",", ":"), default=str).encode("utf-8")
+    return RECORD_HEADER.pack(RECORD_BODY_HEADER_SIZE + len(payload), timestamp, KIND_OTHER) + payload
+
+
+class JournalWriter(BaseComponent):
+    """
+    Sink do barramento de detecções que grava cada detecção em um journal binário
+    somente de anexação, dividido em segmentos.
+
+    A gravação no barramento só empacota o registro em um buffer em memória; uma
+    thread em segundo plano descarrega o buffer no segmento atual, rotaciona os
+    segmentos por tamanho/idade e aplica a retenção.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        segment_bytes: int = 64 * 1024 * 1024,
+        segment_seconds: float = 3600.0,
+        flush_interval: float = 0.5,
+        max_buffer_bytes: int = 16 * 1024 * 1024,
+        retention_bytes: int = 2 * 1024 * 1024 * 1024,
+        retention_seconds: float = 7 * 24 * 3600.0
+    ):
+        """
+        Inicializa o journal.
+
+        Args:
+            directory (str): Diretório dos segmentos
+            segment_bytes (int): Tamanho a partir do qual um novo segmento é iniciado
+            segment_seconds (float): Idade a partir da qual um novo segmento é iniciado
+            flush_interval (float): Intervalo, em segundos, entre descargas do buffer
+            max_buffer_bytes (int): Limite do buffer em memória; registros excedentes são descartados
+            retention_bytes (int): Tamanho total máximo dos segmentos (0 desativa)
+            retention_seconds (float): Idade máxima dos segmentos fechados (0 desativa)
+        """
+        super().__init__("JournalWriter")
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.segment_seconds = segment_seconds
+        self.flush_interval = flush_interval
+        self.max_buffer_bytes = max_buffer_bytes
+        self.retention_bytes = retention_bytes
+        self.retention_seconds = retention_seconds
+
+        self.records = 0
+        self.bytes_written = 0
+        self.dropped = 0
+        self.rejected = 0
+
+        self._lock = threading.Lock()
+        self._buffer = bytearray()
+        self._file = None
+        self._segment_path: Optional[str] = None
+        self._segment_size = 0
+        self._segment_started = 0.0
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self) -> bool:
+        """
+        Abre um novo segmento e inicia a thread de descarga.
+
+        Returns:
+            bool: True se iniciado com sucesso
+        """
+        if self._running:
+            return True
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            self._open_segment()
+        except Exception as e:
+            self.logger.error(f"Erro ao abrir o journal em '{self.directory}': {str(e)}")
+            return False
+
+        self._running = True
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._flush_loop, name="JournalWriter", daemon=True)
+        self._thread.start()
+        self.logger.info(f"Journal iniciado em '{self.directory}'")
+        return True
+
+    def stop(self) -> bool:
+        """
+        Descarrega o buffer e fecha o segmento atual.
+
+        Returns:
+            bool: True se parado com sucesso
+        """
+        if not self._running:
+            return True
+
+        self._running = False
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+            self._thread = None
+
+        try:
+            self.flush()
+            self._close_segment()
+        except Exception as e:
+            self.logger.error(f"Erro ao fechar o journal: {str(e)}")
+            return False
+        return True
+
+    def attach(self, bus: EventBus, kind: str = EventBus.ALL) -> None:
+        """
+        Registra o journal como assinante do barramento de detecções.
+
+        Args:
+            bus (EventBus): Barramento de detecções
+            kind (str): Tipo de detecção gravado (padrão: todos)
+        """
+        bus.subscribe(kind, self.handle_detection, name="JournalWriter")
+
+    def handle_detection(self, processor_name: str, result: Dict[str, Any], data: bytes, addr: tuple) -> None:
+        """
+        Assinante do barramento: grava a detecção no journal.
+
+        Args:
+            processor_name (str): Nome do processador que identificou o pacote
+            result (dict): Resultado do processamento
+            data (bytes): Dados brutos do pacote
+            addr (tuple): Endereço de origem (IP, porta)
+        """
+        self.append(result)
+
+    def append(self, result: Dict[str, Any], timestamp: Optional[float] = None) -> bool:
+        """
+        Adiciona uma detecção ao buffer do journal.
+
+        Args:
+            result (dict): Resultado do processador
+            timestamp (float, optional): Momento da detecção (padrão: agora)
+
+        Returns:
+            bool: False se o registro foi descartado (buffer cheio ou detecção que não pôde ser empacotada)
+        """
+        try:
+            record = encode_record(result, time.time() if timestamp is None else timestamp)
+        except (TypeError, ValueError, struct.error) as e:
+            with self._lock:
+                self.rejected += 1
+            self.logger.error(f"Detecção '{result.get('type')}' não gravada no journal: {str(e)}")
+            return False
+        with self._lock:
+            if len(self._buffer) + len(record) > self.max_buffer_bytes:
+                self.dropped += 1
+                return False
+            self._buffer += record
+            self.records += 1
+        return True
+
+    def flush(self) -> None:
+        """
+        Descarrega o buffer no segmento atual, rotacionando-o se necessário.
+        """
+        with self._lock:
+            if not self._buffer:
+                return
+            chunk = bytes(self._buffer)
+            self._buffer.clear()
+
+        if self._file is None:
+            return
+
+        # Registros nunca são divididos entre segmentos
+        self._file.write(chunk)
+        self._file.flush()
+        self._segment_size += len(chunk)
+        self.bytes_written += len(chunk)
+
+        if (self._segment_size >= self.segment_bytes
+                or time.time() - self._segment_started >= self.segment_seconds):
+            self._close_segment()
+            self._open_segment()
+            self._apply_retention()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retorna as estatísticas de gravação.
+
+        Returns:
+            Dict[str, Any]: Registros, bytes gravados, descartes, rejeições e bytes médios por registro
+        """
+        return {
+            "records": self.records,
+            "bytes_written": self.bytes_written,
+            "buffered": len(self._buffer),
+            "dropped": self.dropped,
+            "rejected": self.rejected,
+            "bytes_per_record": self.bytes_written / self.records if self.records else 0.0,
+            "segment": self._segment_path
+        }
+
+    def _flush_loop(self) -> None:
+        """
+        Loop da thread de descarga.
+        """
+        while not self._stop_event.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                self.logger.error(f"Erro ao descarregar o journal: {str(e)}")
+
+    def _open_segment(self) -> None:
+        """
+        Cria um novo segmento nomeado pelo instante de criação.
+        """
+        self._segment_started = time.time()
+        name = f"journal-{time.time_ns():020d}{SEGMENT_SUFFIX}"
+        self._segment_path = os.path.join(self.directory, name)
+        self._file = open(self._segment_path, "ab")
+        self._file.write(SEGMENT_HEADER.pack(SEGMENT_MAGIC, SEGMENT_VERSION))
+        self._file.flush()
+        self._segment_size = SEGMENT_HEADER.size
+
+    def _close_segment(self) -> None:
+        """
+        Fecha o segmento atual.
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _apply_retention(self) -> None:
+        """
+        Remove os segmentos fechados mais antigos que excedem a retenção.
+        """
+        segments = list_segments(self.directory)
+        closed = [path for path in segments if path != self._segment_path]
+        now = time.time()
+        total = sum(os.path.getsize(path) for path in segments)
+
+        for path in closed:
+            expired = self.retention_seconds and now - os.path.getmtime(path) > self.retention_seconds
+            oversized = self.retention_bytes and total > self.retention_bytes
+            if not expired and not oversized:
+                break
+            size = os.path.getsize(path)
+            os.remove(path)
+            total -= size
+            self.logger.info(f"Segmento removido pela retenção: {os.path.basename(path)}")
+
+
+def list_segments(directory: str) -> List[str]:
+    """
+    Lista os segmentos de um journal em ordem cronológica.
+
+    Args:
+        directory (str): Diretório do journal
+
+    Returns:
+        List[str]: Caminhos dos segmentos
+    """
+    if not os.path.isdir(directory):
+        return []
+    names = sorted(name for name in os.listdir(directory) if name.endswith(SEGMENT_SUFFIX))
+    return [os.path.join(directory, name) for name in names]
+
+
+class JournalReader:
+    """
+    Leitor do journal baseado em mmap.
+    Percorre os registros lendo apenas o cabeçalho (tamanho, timestamp e tipo) e
+    só decodifica o payload dos registros que passam pelos filtros.
+    """
+
+    def __init__(self, directory: str):
+        """
+        Inicializa o leitor.
+
+        Args:
+            directory (str): Diretório do journal
+        """
+        self.directory = directory
+
+    def segments(self) -> List[str]:
+        """
+        Lista os segmentos disponíveis.
+
+        Returns:
+            List[str]: Caminhos dos segmentos em ordem cronológica
+        """
+        return list_segments(self.directory)
+
+    def scan(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        kinds: Optional[Iterable[str]] = None
+    ) -> Iterator[Tuple[float, int, bytes]]:
+        """
+        Percorre os registros sem decodificá-los.
+
+        Args:
+            start (float, optional): Timestamp mínimo (inclusive)
+            end (float, optional): Timestamp máximo (exclusivo)
+            kinds (Iterable[str], optional): Tipos de detecção aceitos: os que têm esquema
+                                             ("player", "item", "combat") ou "other" para os
+                                             gravados em JSON
+
+        Yields:
+            Tuple[float, int, bytes]: Timestamp, código do tipo e payload bruto (copiado apenas
+                                      para os registros que passam pelos filtros)
+
+        Raises:
+            ValueError: Se algum tipo não tiver esquema (esses tipos são gravados como "other")
+        """
+        codes = None
+        if kinds is not None:
+            codes = set()
+            for kind in kinds:
+                if kind == "other":
+                    codes.add(KIND_OTHER)
+                elif kind in SCHEMAS_BY_KIND:
+                    codes.add(SCHEMAS_BY_KIND[kind].code)
+                else:
+                    raise ValueError(
+                        f"Tipo '{kind}' não tem esquema no journal; filtre por 'other' "
+                        f"(tipos com esquema: {', '.join(SCHEMAS_BY_KIND)})"
+                    )
+
+        for path in self.segments():
+            # Segmentos criados depois do fim do intervalo podem ser ignorados pelo nome
+            if end is not None and _segment_started(path) >= end:
+                break
+
+            with open(path, "rb") as file:
+                size = os.fstat(file.fileno()).st_size
+                if size <= SEGMENT_HEADER.size:
+                    continue
+                with mmap.mmap(file.fileno(), size, access=mmap.ACCESS_READ) as mapped:
+                    magic, version = SEGMENT_HEADER.unpack_from(mapped)
+                    if magic != SEGMENT_MAGIC or version not in RECORD_HEADERS:
+                        continue
+                    record_header, length_size = RECORD_HEADERS[version]
+                    unpack_header = record_header.unpack_from
+                    header_size = record_header.size
+                    offset = SEGMENT_HEADER.size
+                    while offset + header_size <= size:
+                        body_size, timestamp, code = unpack_header(mapped, offset)
+                        record_end = offset + length_size + body_size
+                        if record_end > size:
+                            # Registro parcial no fim de um segmento em gravação
+                            break
+                        if ((start is None or timestamp >= start)
+                                and (end is None or timestamp < end)
+                                and (codes is None or code in codes)):
+                            yield timestamp, code, mapped[offset + header_size:record_end]
+                        offset = record_end
+
+    def iter_records(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        kinds: Optional[Iterable[str]] = None
+    ) -> Iterator[Tuple[float, Dict[str, Any]]]:
+        """
+        Percorre os registros decodificados que passam pelos filtros.
+
+        Args:
+            start (float, optional): Timestamp mínimo (inclusive)
+            end (float, optional): Timestamp máximo (exclusivo)
+            kinds (Iterable[str], optional): Tipos de detecção aceitos
+
+        Yields:
+            Tuple[float, Dict[str, Any]]: Timestamp e detecção decodificada
+        """
+        for timestamp, code, payload in self.scan(start, end, kinds):
+            schema = SCHEMAS_BY_CODE.get(code)
+            if schema is not None:
+                result = schema.decode(schema.layout.unpack_from(payload))
+            else:
+                result = json.loads(payload)
+            yield timestamp, result
+
+    def count(self, start: Optional[float] = None, end: Optional[float] = None, kinds: Optional[Iterable[str]] = None) -> int:
+        """
+        Conta os registros que passam pelos filtros sem decodificar nenhum payload.
+
+        Returns:
+            int: Quantidade de registros
+        """
+        return sum(1 for _ in self.scan(start, end, kinds))
+
+
+def _segment_started(path: str) -> float:
+    """
+    Extrai o instante de criação (epoch em segundos) do nome de um segmento.
+    """
+    try:
+        return int(os.path.basename(path)[len("journal-"):-len(SEGMENT_SUFFIX)]) / 1e9
+    except ValueError:
+        return 0.0
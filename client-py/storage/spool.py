@@ -0,0 +1,310 @@
+import os
+import time
+import zlib
+import struct
+import threading
+from typing import Any, Dict, List, NamedTuple, Optional
+
+# Cabeçalho de cada segmento: assinatura + versão do formato
+SPOOL_MAGIC = b"TKS1"
+SPOOL_HEADER = struct.Struct("<4sH")
+SPOOL_SUFFIX = ".tks"
+
+# Cabeçalho de cada lote: CRC32 (id + corpo), tamanho do corpo, detecções no lote,
+# tamanho do lote descompactado e tamanho do id
+BATCH_HEADER = struct.Struct("<IIIIH")
+
+
+class SpooledBatch(NamedTuple):
+    """
+    Lote de upload guardado no spool.
+    """
+    batch_id: str
+    body: bytes
+    count: int
+    raw_size: int
+
+
+class SpoolSegment:
+    """
+    Metadados de um segmento do spool mantidos em memória.
+    """
+    __slots__ = ("path", "size", "batches", "events")
+
+    def __init__(self, path: str, size: int = SPOOL_HEADER.size, batches: int = 0, events: int = 0):
+        self.path = path
+        self.size = size
+        self.batches = batches
+        self.events = events
+
+
+class UploadSpool:
+    """
+    Spool em disco dos lotes de upload que não puderam ser enviados.
+
+    Os lotes (já compactados, com o id usado no X-Batch-Id) são anexados ao segmento
+    ativo; ao atingir segment_bytes o segmento é fechado e um novo é iniciado. Os
+    segmentos são lidos do mais antigo para o mais novo e removidos quando todos os
+    seus lotes forem confirmados pelo servidor. Acima de max_bytes os segmentos mais
+    antigos são descartados. Cada lote leva um CRC32: ao abrir o spool, um lote
+    incompleto no fim do último segmento (cliente encerrado no meio da gravação) é
+    truncado.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        segment_bytes: int = 4 * 1024 * 1024,
+        max_bytes: int = 256 * 1024 * 1024,
+        fsync: bool = False
+    ):
+        """
+        Inicializa o spool.
+
+        Args:
+            directory (str): Diretório dos segmentos
+            segment_bytes (int): Tamanho a partir do qual um novo segmento é iniciado
+            max_bytes (int): Tamanho total máximo do spool; acima dele os segmentos mais antigos são descartados
+            fsync (bool): Força a gravação em disco ao fechar cada segmento
+        """
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.max_bytes = max_bytes
+        self.fsync = fsync
+
+        self.appended = 0
+        self.removed = 0
+        self.dropped_batches = 0
+        self.dropped_events = 0
+        self.truncated = 0
+
+        self._segments: List[SpoolSegment] = []
+        self._file = None
+        self._last_name = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """
+        Quantidade de lotes guardados.
+        """
+        return sum(segment.batches for segment in self._segments)
+
+    @property
+    def events(self) -> int:
+        """
+        Quantidade de detecções guardadas.
+        """
+        return sum(segment.events for segment in self._segments)
+
+    @property
+    def size(self) -> int:
+        """
+        Tamanho total dos segmentos em bytes.
+        """
+        return sum(segment.size for segment in self._segments)
+
+    def open(self) -> None:
+        """
+        Abre o spool e recupera os segmentos deixados por execuções anteriores.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        with self._lock:
+            self._segments = []
+            names = sorted(name for name in os.listdir(self.directory) if name.endswith(SPOOL_SUFFIX))
+            for name in names:
+                segment = self._recover(os.path.join(self.directory, name))
+                if segment is not None:
+                    self._segments.append(segment)
+
+    def close(self) -> None:
+        """
+        Fecha o segmento ativo (os segmentos continuam no disco para a próxima execução).
+        """
+        with self._lock:
+            self._close_active()
+
+    def append(self, batch_id: str, body: bytes, count: int, raw_size: int = 0) -> None:
+        """
+        Anexa um lote ao segmento ativo.
+
+        Args:
+            batch_id (str): Id do lote
+            body (bytes): Corpo do lote já compactado
+            count (int): Quantidade de detecções no lote
+            raw_size (int): Tamanho do lote descompactado
+        """
+        encoded_id = batch_id.encode("utf-8")
+        record = BATCH_HEADER.pack(zlib.crc32(body, zlib.crc32(encoded_id)), len(body), count, raw_size, len(encoded_id))
+
+        with self._lock:
+            if self._file is None or self._segments[-1].size >= self.segment_bytes:
+                self._close_active()
+                self._open_active()
+
+            self._file.write(record + encoded_id)
+            self._file.write(body)
+            self._file.flush()
+
+            segment = self._segments[-1]
+            segment.size += len(record) + len(encoded_id) + len(body)
+            segment.batches += 1
+            segment.events += count
+            self.appended += 1
+            self._apply_limit()
+
+    def oldest(self) -> Optional[str]:
+        """
+        Retorna o segmento mais antigo com lotes, fechando o segmento ativo se ele for o único.
+
+        Returns:
+            Optional[str]: Caminho do segmento ou None se o spool estiver vazio
+        """
+        with self._lock:
+            for segment in self._segments:
+                if segment.batches:
+                    if self._file is not None and segment is self._segments[-1]:
+                        self._close_active()
+                    return segment.path
+            return None
+
+    def read(self, path: str) -> List[SpooledBatch]:
+        """
+        Lê os lotes de um segmento fechado, na ordem em que foram anexados.
+
+        Args:
+            path (str): Caminho do segmento
+
+        Returns:
+            List[SpooledBatch]: Lotes do segmento
+        """
+        with open(path, "rb") as file:
+            data = file.read()
+        return [batch for batch, _ in _iter_batches(data)]
+
+    def remove(self, path: str) -> None:
+        """
+        Remove um segmento cujos lotes foram todos confirmados.
+
+        Args:
+            path (str): Caminho do segmento
+        """
+        with self._lock:
+            for index, segment in enumerate(self._segments):
+                if segment.path == path:
+                    if self._file is not None and index == len(self._segments) - 1:
+                        self._close_active()
+                    del self._segments[index]
+                    break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self.removed += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retorna as estatísticas do spool.
+
+        Returns:
+            Dict[str, Any]: Segmentos, lotes, detecções e bytes guardados, lotes anexados,
+                            removidos e descartados pelo limite de tamanho
+        """
+        with self._lock:
+            return {
+                "segments": len(self._segments),
+                "batches": len(self),
+                "events": self.events,
+                "bytes": self.size,
+                "appended": self.appended,
+                "removed": self.removed,
+                "dropped_batches": self.dropped_batches,
+                "dropped_events": self.dropped_events,
+                "truncated": self.truncated
+            }
+
+    def _open_active(self) -> None:
+        """
+        Cria um novo segmento nomeado pelo instante de criação (sempre crescente).
+        """
+        self._last_name = max(time.time_ns(), self._last_name + 1)
+        path = os.path.join(self.directory, f"spool-{self._last_name:020d}{SPOOL_SUFFIX}")
+        self._file = open(path, "ab")
+        self._file.write(SPOOL_HEADER.pack(SPOOL_MAGIC, 1))
+        self._file.flush()
+        self._segments.append(SpoolSegment(path))
+
+    def _close_active(self) -> None:
+        """
+        Fecha o segmento ativo.
+        """
+        if self._file is not None:
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self._file.close()
+            self._file = None
+
+    def _apply_limit(self) -> None:
+        """
+        Descarta os segmentos fechados mais antigos enquanto o spool exceder max_bytes.
+        """
+        total = self.size
+        while self.max_bytes and total > self.max_bytes and len(self._segments) > 1:
+            segment = self._segments.pop(0)
+            total -= segment.size
+            self.dropped_batches += segment.batches
+            self.dropped_events += segment.events
+            try:
+                os.remove(segment.path)
+            except FileNotFoundError:
+                pass
+
+    def _recover(self, path: str) -> Optional[SpoolSegment]:
+        """
+        Lê os metadados de um segmento existente, truncando um lote incompleto no fim.
+        """
+        with open(path, "rb") as file:
+            data = file.read()
+        if len(data) < SPOOL_HEADER.size or data[:4] != SPOOL_MAGIC:
+            os.remove(path)
+            return None
+
+        segment = SpoolSegment(path)
+        for batch, end in _iter_batches(data):
+            segment.size = end
+            segment.batches += 1
+            segment.events += batch.count
+
+        if segment.size < len(data):
+            with open(path, "r+b") as file:
+                file.truncate(segment.size)
+            self.truncated += 1
+        if not segment.batches:
+            os.remove(path)
+            return None
+
+        name = os.path.basename(path)[len("spool-"):-len(SPOOL_SUFFIX)]
+        if name.isdigit():
+            self._last_name = max(self._last_name, int(name))
+        return segment
+
+
+def _iter_batches(data: bytes):
+    """
+    Percorre os lotes válidos de um segmento, parando no primeiro lote incompleto ou corrompido.
+    """
+    view = memoryview(data)
+    offset = SPOOL_HEADER.size
+    header_size = BATCH_HEADER.size
+    while offset + header_size <= len(data):
+        crc, body_size, count, raw_size, id_size = BATCH_HEADER.unpack_from(data, offset)
+        id_start = offset + header_size
+        body_start = id_start + id_size
+        end = body_start + body_size
+        if end > len(data):
+            break
+        encoded_id = bytes(view[id_start:body_start])
+        body = bytes(view[body_start:end])
+        if zlib.crc32(body, zlib.crc32(encoded_id)) != crc:
+            break
+        yield SpooledBatch(encoded_id.decode("utf-8"), body, count, raw_size), end
+        offset = end
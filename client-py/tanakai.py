@@ -14,14 +14,20 @@ os.environ["TANAKAI_PY_CLIENT"] = os.path.dirname(os.path.abspath(__file__))
 
 # Importações
 from config import Config
-from core.logger import Logger
+from core.logger import Logger, configure_logging
 from core.manager import ComponentManager
 from core.handlers import SignalHandler
+from core.bus import EventBus
+from core.metrics import MetricsRegistry, MetricsReporter
+from core.profiler import Profiler
 from core.system import check_and_prompt_npcap
+from storage import JournalWriter, DetectionDatabase
+from network import CatalogCache, Uploader, StreamSession, load_dictionary
+from game import EntityStore, CombatAggregator, FightTracker, PositionCoalescer, MarketAggregator, RespawnTracker
 from photon import (
     PhotonSniffer, 
-    get_default_processors, 
-    handle_detection
+    PhotonCallback,
+    get_default_processors
 )
 
 # Inicializa o logger principal
@@ -31,13 +37,16 @@ def main():
     # Carrega configurações
     config = Config()
     
+    # Ativa o log em segundo plano para não limitar a captura
+    configure_logging(async_mode=config.log_async, json_path=config.log_json_path)
+    
     # Exibe a versão do cliente
     logger.info(f"Tanakai Client v{config.version}")
 
     # Verifica se o Npcap está instalado
     logger.info("Verificando instalação do Npcap...")
 
-    if not check_and_prompt_npcap():
+    if not check_and_prompt_npcap(config.capability_cache_path):
         logger.error("O Npcap é necessário para a funcionalidade de captura de pacotes.")
         logger.error("Por favor, instale o Npcap e reinicie o Tanakai.")
         sys.exit(1)
@@ -45,18 +54,119 @@ def main():
     # Inicializa o gerenciador de componentes
     manager = ComponentManager()
     
+    # Catálogos de itens e mobs para resolver nomes sem consultar o servidor
+    catalog = None
+    if config.catalog_path:
+        catalog = CatalogCache(config.server, config.catalog_path)
+    
+    # Inicializa o barramento de detecções com o callback padrão
+    bus = EventBus()
+    PhotonCallback(log_rate=config.log_detection_rate, catalog=catalog).attach(bus)
+    
+    # Barramento dos consumidores de estado: recebe as posições agrupadas por tick.
+    # É publicado pela thread de captura, pela thread de ticks e pelos estágios de estado,
+    # então entrega tudo em uma única thread de trabalho (os assinantes não rodam em paralelo)
+    world_bus = EventBus(async_dispatch=True, queue_size=config.world_queue_size, name="WorldBus")
+    coalescer = PositionCoalescer(world_bus, tick=config.coalesce_tick)
+    coalescer.attach(bus)
+    
+    # Mantém a última posição de cada jogador com índice espacial
+    entities = EntityStore()
+    entities.attach(world_bus)
+    
+    # Estatísticas de combate (DPS/HPS) em janelas deslizantes
+    combat = CombatAggregator()
+    combat.attach(world_bus)
+    
+    # Separa o combate em lutas; os resumos voltam ao barramento como detecções "fight"
+    fights = FightTracker(world_bus, gap=config.fight_gap)
+    fights.attach(world_bus)
+    
+    # Agrega as ordens de mercado e publica apenas as alterações em lotes delta
+    market = MarketAggregator(world_bus, window=config.market_window, flush_interval=config.market_flush_interval)
+    market.attach(world_bus)
+    
+    # Avisa quando mobs mortos e recursos esgotados vão reaparecer (tempos vindos do catálogo)
+    respawns = None
+    if catalog:
+        respawns = RespawnTracker(world_bus, respawn_time=catalog.respawn_time, warn_before=config.respawn_warn_before)
+        respawns.attach(world_bus)
+    
+    # Grava as detecções no journal binário, se configurado
+    journal = None
+    if config.journal_path:
+        journal = JournalWriter(config.journal_path)
+        journal.attach(world_bus)
+    
+    # Grava o histórico consultável em SQLite, se configurado
+    database = None
+    if config.database_path:
+        database = DetectionDatabase(config.database_path)
+        database.attach(world_bus)
+    
+    # Envia as detecções ao servidor pela sessão de streaming ou em lotes compactados, se configurado
+    uploader = None
+    dictionary = load_dictionary(config.upload_dictionary_path) if config.upload_dictionary_path else None
+    if config.stream_interval:
+        uploader = StreamSession(
+            config.server,
+            flush_interval=config.stream_interval,
+            on_catalog_version=(lambda version: catalog.refresh()) if catalog else None,
+            dictionary=dictionary
+        )
+        uploader.attach(world_bus, exclude=config.upload_exclude_kinds)
+    elif config.upload_interval:
+        uploader = Uploader(
+            config.server,
+            batch_size=config.upload_batch_size,
+            flush_interval=config.upload_interval,
+            max_in_flight=config.upload_concurrency,
+            spool_path=config.upload_spool_path,
+            spool_bytes=config.upload_spool_bytes,
+            dictionary=dictionary
+        )
+        uploader.attach(world_bus, exclude=config.upload_exclude_kinds)
+    
     # Inicializa o sniffer
     logger.info("Iniciando sniffer na porta UDP 5056...")
-    sniffer = PhotonSniffer(port=5056, callback=handle_detection)
+    sniffer = PhotonSniffer(port=5056, callback=bus.publish, stats_interval=config.photon_stats_interval)
     
     # Registra os processadores de pacotes
     processors = get_default_processors()
     for name, processor_func in processors.items():
         sniffer.register_processor(name, processor_func)
     
-    # Registra os componentes no gerenciador
-    manager.register_component(sniffer)
-    manager.register_component(SignalHandler(sniffer))
+    # Métricas de captura, decodificação, processadores e callbacks, se configuradas
+    metrics = None
+    if config.metrics_interval or config.metrics_address:
+        registry = MetricsRegistry()
+        sniffer.instrument(registry)
+        metrics = MetricsReporter(registry, interval=config.metrics_interval, address=config.metrics_address)
+    
+    # Registra os componentes no gerenciador. Cada estágio depende dos estágios para onde
+    # publica: os destinos iniciam primeiro e param por último, depois que os produtores
+    # publicaram o que estava pendente; componentes independentes iniciam e param em paralelo
+    sinks = [journal, database, uploader]
+    producers = [fights, market, respawns]
+    if catalog:
+        manager.register_component(catalog)
+    for sink in sinks:
+        if sink:
+            manager.register_component(sink)
+    manager.register_component(entities)
+    manager.register_component(combat)
+    manager.register_component(fights, depends_on=sinks)
+    manager.register_component(market, depends_on=sinks)
+    if respawns:
+        manager.register_component(respawns, depends_on=sinks + [catalog])
+    manager.register_component(world_bus, depends_on=[entities, combat] + producers + sinks)
+    manager.register_component(coalescer, depends_on=[world_bus])
+    manager.register_component(bus, depends_on=[coalescer, catalog])
+    manager.register_component(sniffer, depends_on=[bus])
+    if metrics:
+        manager.register_component(metrics)
+    profiler = Profiler(config.profile_path) if config.profile_path else None
+    manager.register_component(SignalHandler(sniffer, profiler=profiler))
     
     try:
         # Inicia todos os componentes
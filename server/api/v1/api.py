@@ -1,6 +1,6 @@
 from fastapi import APIRouter
-from server.api.v1.info import clients, mobs, items, harvestables, regions
-from server.api.v1.client import hardware_id
+from server.api.v1.info import clients, mobs, items, harvestables, regions, catalog
+from server.api.v1.client import hardware_id, detections, new_session
 
 api_router = APIRouter()
 
@@ -10,6 +10,9 @@ api_router.include_router(harvestables.router, prefix="/harvestables", tags=["ha
 api_router.include_router(items.router, prefix="/items", tags=["items"])
 api_router.include_router(mobs.router, prefix="/mobs", tags=["mobs"])
 api_router.include_router(regions.router, prefix="/regions", tags=["regions"])
+api_router.include_router(catalog.router, prefix="/catalog", tags=["catalog"])
 
 # Rotas de informação dos clientes tanakai
-api_router.include_router(hardware_id.router, prefix="/client", tags=["client"])
\ No newline at end of file
+api_router.include_router(hardware_id.router, prefix="/client", tags=["client"])
+api_router.include_router(detections.router, prefix="/client", tags=["client"])
+api_router.include_router(new_session.router, prefix="/client", tags=["client"])
\ No newline at end of file
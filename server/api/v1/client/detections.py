@@ -0,0 +1,59 @@
+"""
+Endpoints para receber as detecções enviadas pelos clientes.
+"""
+
+from fastapi import APIRouter, HTTPException, Request
+from typing import Dict, Any
+from server.utils.detections import decode_batch, record_batch, get_received, save_dictionary
+
+router = APIRouter()
+
+@router.post("/detections", response_model=Dict[str, Any])
+async def post_detections(request: Request):
+    """
+    Recebe um lote de detecções em NDJSON (uma detecção JSON por linha), opcionalmente
+    compactado com gzip (Content-Encoding: gzip) ou com zlib e um dicionário enviado antes
+    para /dictionaries (Content-Encoding: x-tanakai-zdict). O cabeçalho X-Batch-Id
+    identifica o lote para que reenvios após falhas não sejam contados duas vezes.
+    
+    Returns:
+        Dict[str, Any]: Quantidade de detecções aceitas e se o lote já havia sido recebido
+    """
+    body = await request.body()
+    detections = decode_batch(body, request.headers.get("content-encoding"))
+
+    # Dicionário desconhecido: o cliente deve reenviá-lo e repetir o lote
+    if isinstance(detections, dict) and "dictionary" in detections:
+        raise HTTPException(status_code=409, detail=detections["message"])
+
+    # Verifica se retornou uma mensagem de erro
+    if isinstance(detections, dict) and "message" in detections:
+        raise HTTPException(status_code=400, detail=detections["message"])
+
+    return record_batch(request.headers.get("x-batch-id"), detections, len(body))
+
+@router.post("/dictionaries", response_model=Dict[str, str])
+async def post_dictionary(request: Request):
+    """
+    Recebe um dicionário de compressão (zdict) treinado pelo cliente.
+
+    Returns:
+        Dict[str, str]: Id do dicionário (CRC32 em hexadecimal)
+    """
+    result = save_dictionary(await request.body())
+
+    # Verifica se retornou uma mensagem de erro
+    if "message" in result:
+        raise HTTPException(status_code=400, detail=result["message"])
+
+    return result
+
+@router.get("/detections/stats", response_model=Dict[str, Any])
+async def get_detections_stats():
+    """
+    Retorna os totais de lotes e detecções recebidos desde o início do servidor.
+    
+    Returns:
+        Dict[str, Any]: Lotes, detecções por tipo, bytes recebidos e taxas
+    """
+    return get_received()
@@ -0,0 +1,85 @@
+"""
+Endpoints da sessão de streaming entre o cliente e o servidor.
+
+O cliente cria a sessão e abre duas conexões HTTP de longa duração:
+- GET /session/{id}/events: resposta em streaming com os quadros do servidor
+  (créditos, ACKs, novas versões dos catálogos e heartbeats);
+- POST /session/{id}/batches: corpo em streaming (chunked) com os lotes de detecções.
+"""
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from typing import Dict, Any, Optional
+from server.utils.stream import (
+    INITIAL_CREDITS,
+    create_session,
+    get_session,
+    close_session,
+    session_events,
+    consume_batches
+)
+
+router = APIRouter()
+
+@router.post("/session", response_model=Dict[str, Any])
+async def new_session(data: Optional[Dict[str, Any]] = None):
+    """
+    Cria uma sessão de streaming.
+
+    Args:
+        data: Dicionário opcional com o prefixo dos lotes do cliente ("prefix")
+
+    Returns:
+        Dict[str, Any]: Id da sessão, créditos iniciais e versão atual dos catálogos
+    """
+    session = create_session((data or {}).get("prefix"), INITIAL_CREDITS)
+    return session.summary()
+
+@router.get("/session/{session_id}/events")
+async def get_session_events(session_id: str):
+    """
+    Abre o fluxo de quadros do servidor para o cliente.
+    """
+    session = get_session(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Sessão não encontrada")
+
+    return StreamingResponse(session_events(session), media_type="application/octet-stream")
+
+@router.post("/session/{session_id}/batches", response_model=Dict[str, Any])
+async def post_session_batches(session_id: str, request: Request):
+    """
+    Recebe os lotes de detecções da sessão enquanto o cliente mantiver a conexão aberta.
+
+    Returns:
+        Dict[str, Any]: Lotes e detecções recebidos pela conexão
+    """
+    session = get_session(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Sessão não encontrada")
+
+    result = await consume_batches(session, request.stream())
+
+    # Verifica se retornou uma mensagem de erro
+    if "message" in result:
+        raise HTTPException(status_code=400, detail=result["message"])
+
+    return result
+
+@router.get("/session/{session_id}", response_model=Dict[str, Any])
+async def get_session_info(session_id: str):
+    """
+    Retorna os totais da sessão.
+    """
+    session = get_session(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Sessão não encontrada")
+
+    return session.summary()
+
+@router.delete("/session/{session_id}", response_model=Dict[str, bool])
+async def delete_session(session_id: str):
+    """
+    Encerra a sessão.
+    """
+    return {"closed": close_session(session_id)}
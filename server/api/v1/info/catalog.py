@@ -0,0 +1,43 @@
+from typing import Dict, Any
+from fastapi import APIRouter, HTTPException
+
+from server.utils.catalog import CATALOG_DUMPS, get_catalog_version, read_catalog, read_respawns
+
+router = APIRouter()
+
+@router.get("/version", response_model=Dict[str, Any])
+def get_version():
+    """
+    Retorna a versão atual dos catálogos.
+    Os clientes só baixam os catálogos novamente quando a versão muda.
+    """
+    return {
+        "version": get_catalog_version(),
+        "kinds": sorted(CATALOG_DUMPS)
+    }
+
+@router.get("/respawns", response_model=Dict[str, Any])
+def get_respawns():
+    """
+    Retorna os tempos de respawn de mobs ([id, mínimo, máximo]) e recursos coletáveis ([id, tempo]), em segundos.
+    """
+    result = read_respawns()
+
+    # Verifica se retornou uma mensagem de erro
+    if "message" in result:
+        raise HTTPException(status_code=404, detail=result["message"])
+
+    return result
+
+@router.get("/{kind}", response_model=Dict[str, Any])
+def get_catalog(kind: str):
+    """
+    Retorna o catálogo compacto de itens, mobs ou recursos coletáveis: [id, tier, nome] de cada entrada, ordenado pelo id.
+    """
+    result = read_catalog(kind)
+
+    # Verifica se retornou uma mensagem de erro
+    if "message" in result:
+        raise HTTPException(status_code=404, detail=result["message"])
+
+    return result
@@ -0,0 +1,101 @@
+import os
+import hashlib
+
+from server.utils.read_items import read_items
+from server.utils.read_mobs import read_mobs
+from server.utils.read_harvestables import read_harvestables
+
+# Dumps que compõem cada catálogo
+CATALOG_DUMPS = {
+    "items": "items.xml",
+    "mobs": "mobs.xml",
+    "harvestables": "harvestables.xml"
+}
+
+# Catálogos já montados: tipo -> (versão, entradas)
+_catalog_cache = {}
+
+# Tempos de respawn já montados: (versão, tempos)
+_respawn_cache = None
+
+def get_catalog_version():
+    """
+    Calcula a versão dos catálogos a partir do tamanho e da data de modificação dos dumps.
+    A versão muda sempre que um dump é baixado novamente com conteúdo diferente.
+    """
+    digest = hashlib.sha1()
+    for kind, file_name in sorted(CATALOG_DUMPS.items()):
+        file_path = os.path.join(os.environ.get("TANAKAI_DUMPS", "dumps"), file_name)
+        try:
+            stat = os.stat(file_path)
+            digest.update(f"{kind}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+        except OSError:
+            digest.update(f"{kind}:missing;".encode())
+    return digest.hexdigest()[:16]
+
+def read_catalog(kind):
+    """
+    Retorna o catálogo compacto de um tipo (id, tier e nome de cada entrada), ordenado pelo id.
+    O catálogo é montado uma vez por versão dos dumps e reaproveitado nas chamadas seguintes.
+    """
+    if kind not in CATALOG_DUMPS:
+        return {"message": f"Catálogo '{kind}' não existe"}
+
+    version = get_catalog_version()
+    cached = _catalog_cache.get(kind)
+    if cached is not None and cached[0] == version:
+        return {"version": version, "kind": kind, "entries": cached[1]}
+
+    if kind == "items":
+        result = read_items()
+        records = [getattr(item, "item", None) for item in result] if isinstance(result, list) else result
+    elif kind == "mobs":
+        records = read_mobs()
+    else:
+        records = read_harvestables()
+
+    # Verifica se retornou uma mensagem de erro
+    if isinstance(records, dict) and "message" in records:
+        return records
+
+    entries = sorted(
+        [record.id, record.tier or 0, record.name or record.uniquename]
+        for record in records
+        if record is not None and record.id is not None
+    )
+    _catalog_cache[kind] = (version, entries)
+    return {"version": version, "kind": kind, "entries": entries}
+
+def read_respawns():
+    """
+    Retorna os tempos de respawn, em segundos, de mobs ([id, mínimo, máximo]) e de
+    recursos coletáveis ([id, tempo]), montados uma vez por versão dos dumps.
+    """
+    global _respawn_cache
+
+    version = get_catalog_version()
+    if _respawn_cache is not None and _respawn_cache[0] == version:
+        return _respawn_cache[1]
+
+    mobs = read_mobs()
+    harvestables = read_harvestables()
+    for records in (mobs, harvestables):
+        # Verifica se retornou uma mensagem de erro
+        if isinstance(records, dict) and "message" in records:
+            return records
+
+    respawns = {
+        "version": version,
+        "mobs": sorted(
+            [mob.id, mob.respawntimesecondsmin, mob.respawntimesecondsmax or mob.respawntimesecondsmin]
+            for mob in mobs
+            if mob.id is not None and mob.respawntimesecondsmin
+        ),
+        "harvestables": sorted(
+            [harvestable.id, harvestable.respawntimeseconds]
+            for harvestable in harvestables
+            if harvestable.id is not None and harvestable.respawntimeseconds
+        )
+    }
+    _respawn_cache = (version, respawns)
+    return respawns
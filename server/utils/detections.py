@@ -0,0 +1,208 @@
+import io
+import os
+import gzip
+import json
+import time
+import zlib
+import struct
+import threading
+from collections import OrderedDict
+
+# Quantidade de ids de lote lembrados para descartar reenvios
+RECENT_BATCHES = 10000
+
+# Tamanho máximo de um lote descompactado (protege contra bombas de compressão)
+MAX_BATCH_BYTES = 64 * 1024 * 1024
+
+# Content-Encoding dos lotes compactados com dicionário pré-definido (zdict)
+ZDICT_ENCODING = "x-tanakai-zdict"
+
+# Cabeçalho dos lotes com dicionário: assinatura + id do dicionário (CRC32 do conteúdo)
+ZDICT_MAGIC = b"TZ"
+ZDICT_HEADER = struct.Struct("<2sI")
+
+# Tamanho máximo de um dicionário do zlib
+MAX_DICTIONARY_BYTES = 32 * 1024
+
+# Quantidade máxima de dicionários guardados, em disco e em memória (os usados há mais
+# tempo são removidos; um cliente cujo dicionário foi removido recebe "dicionário
+# desconhecido" e o reenvia)
+MAX_DICTIONARIES = int(os.environ.get("TANAKAI_MAX_DICTIONARIES", "64"))
+
+# Dicionários já carregados, do usado há mais tempo ao mais recente: id -> conteúdo
+_dictionaries = OrderedDict()
+_dictionaries_lock = threading.Lock()
+
+# Lotes já recebidos: id do lote -> quantidade de detecções
+_recent_batches = OrderedDict()
+
+# Totais recebidos desde o início do servidor
+_received = {"batches": 0, "duplicates": 0, "detections": 0, "bytes": 0, "kinds": {}, "since": time.time()}
+
+_lock = threading.Lock()
+
+def _dictionary_path(dictionary_id):
+    return os.path.join(os.environ.get("TANAKAI_DICTIONARIES", "dictionaries"), f"{dictionary_id:08x}.zdict")
+
+def save_dictionary(dictionary):
+    """
+    Guarda um dicionário enviado por um cliente. O id é o CRC32 do conteúdo, então
+    clientes com o mesmo dicionário compartilham o arquivo. Só os MAX_DICTIONARIES
+    dicionários usados mais recentemente são mantidos.
+    Retorna {"id": ...} ou {"message": ...} se o dicionário for inválido.
+    """
+    if not dictionary or len(dictionary) > MAX_DICTIONARY_BYTES:
+        return {"message": "Dicionário vazio ou maior que o tamanho máximo"}
+
+    dictionary_id = zlib.crc32(dictionary)
+    with _dictionaries_lock:
+        if dictionary_id in _dictionaries:
+            _touch_dictionary(dictionary_id)
+        else:
+            file_path = _dictionary_path(dictionary_id)
+            try:
+                os.makedirs(os.path.dirname(file_path), exist_ok=True)
+                with open(file_path, "wb") as file:
+                    file.write(dictionary)
+                _evict_dictionary_files(os.path.dirname(file_path))
+            except OSError as e:
+                return {"message": f"Erro ao salvar o dicionário: {str(e)}"}
+            _cache_dictionary(dictionary_id, dictionary)
+
+    return {"id": f"{dictionary_id:08x}"}
+
+def load_dictionary(dictionary_id):
+    """
+    Retorna o conteúdo de um dicionário ou None se ele não tiver sido enviado
+    (ou já tiver sido removido).
+    """
+    with _dictionaries_lock:
+        dictionary = _dictionaries.get(dictionary_id)
+        if dictionary is not None:
+            _touch_dictionary(dictionary_id)
+            return dictionary
+
+        try:
+            with open(_dictionary_path(dictionary_id), "rb") as file:
+                dictionary = file.read()
+        except OSError:
+            return None
+        if zlib.crc32(dictionary) != dictionary_id:
+            return None
+        _touch_dictionary(dictionary_id)
+        _cache_dictionary(dictionary_id, dictionary)
+    return dictionary
+
+def _cache_dictionary(dictionary_id, dictionary):
+    """
+    Guarda um dicionário em memória, removendo o usado há mais tempo se o limite for atingido.
+    """
+    _dictionaries[dictionary_id] = dictionary
+    while len(_dictionaries) > MAX_DICTIONARIES:
+        _dictionaries.popitem(last=False)
+
+def _touch_dictionary(dictionary_id):
+    """
+    Marca um dicionário como usado agora: na memória e na data de modificação do arquivo,
+    que ordena a remoção em disco.
+    """
+    if dictionary_id in _dictionaries:
+        _dictionaries.move_to_end(dictionary_id)
+    try:
+        os.utime(_dictionary_path(dictionary_id))
+    except OSError:
+        pass
+
+def _evict_dictionary_files(directory):
+    """
+    Remove do disco os dicionários usados há mais tempo que excedem MAX_DICTIONARIES.
+    """
+    paths = [os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(".zdict")]
+    if len(paths) <= MAX_DICTIONARIES:
+        return
+    paths.sort(key=os.path.getmtime)
+    for path in paths[:len(paths) - MAX_DICTIONARIES]:
+        os.remove(path)
+        try:
+            _dictionaries.pop(int(os.path.basename(path)[:-len(".zdict")], 16), None)
+        except ValueError:
+            pass
+
+def _inflate_zdict(body):
+    magic, dictionary_id = ZDICT_HEADER.unpack_from(body)
+    if magic != ZDICT_MAGIC:
+        raise ValueError("Assinatura do lote com dicionário inválida")
+
+    dictionary = load_dictionary(dictionary_id)
+    if dictionary is None:
+        return None, dictionary_id
+
+    decompressor = zlib.decompressobj(-15, dictionary)
+    data = decompressor.decompress(body[ZDICT_HEADER.size:], MAX_BATCH_BYTES + 1)
+    if not decompressor.eof:
+        raise ValueError("Lote incompleto ou maior que o tamanho máximo")
+    return data, dictionary_id
+
+def decode_batch(body, content_encoding=None):
+    """
+    Decodifica um lote NDJSON (uma detecção JSON por linha), compactado com gzip, com
+    zlib e dicionário pré-definido (x-tanakai-zdict) ou não.
+    Retorna a lista de detecções ou {"message": ...} se o lote for inválido; lotes com
+    um dicionário desconhecido trazem também {"dictionary": id} para o cliente reenviá-lo.
+    """
+    try:
+        if content_encoding == "gzip":
+            with gzip.GzipFile(fileobj=io.BytesIO(body)) as file:
+                body = file.read(MAX_BATCH_BYTES + 1)
+            if len(body) > MAX_BATCH_BYTES:
+                return {"message": "Lote excede o tamanho máximo"}
+        elif content_encoding == ZDICT_ENCODING:
+            body, dictionary_id = _inflate_zdict(body)
+            if body is None:
+                return {"message": f"Dicionário {dictionary_id:08x} desconhecido", "dictionary": f"{dictionary_id:08x}"}
+        elif content_encoding not in (None, "", "identity"):
+            return {"message": f"Codificação '{content_encoding}' não suportada"}
+
+        return [json.loads(line) for line in body.splitlines() if line.strip()]
+    except (OSError, EOFError, ValueError, zlib.error, struct.error) as e:
+        return {"message": f"Lote inválido: {str(e)}"}
+
+def record_batch(batch_id, detections, size):
+    """
+    Contabiliza um lote recebido. Lotes reenviados (mesmo batch_id) são aceitos
+    novamente, mas contados apenas uma vez.
+    Retorna {"accepted": quantidade, "duplicate": bool}.
+    """
+    with _lock:
+        if batch_id and batch_id in _recent_batches:
+            _recent_batches.move_to_end(batch_id)
+            _received["duplicates"] += 1
+            return {"accepted": _recent_batches[batch_id], "duplicate": True}
+
+        if batch_id:
+            _recent_batches[batch_id] = len(detections)
+            if len(_recent_batches) > RECENT_BATCHES:
+                _recent_batches.popitem(last=False)
+
+        _received["batches"] += 1
+        _received["detections"] += len(detections)
+        _received["bytes"] += size
+        kinds = _received["kinds"]
+        for detection in detections:
+            kind = detection.get("type", "unknown") if isinstance(detection, dict) else "unknown"
+            kinds[kind] = kinds.get(kind, 0) + 1
+
+    return {"accepted": len(detections), "duplicate": False}
+
+def get_received():
+    """
+    Retorna os totais de lotes e detecções recebidos desde o início do servidor.
+    """
+    with _lock:
+        elapsed = time.time() - _received["since"]
+        return {
+            **_received,
+            "kinds": dict(_received["kinds"]),
+            "detections_per_second": _received["detections"] / elapsed if elapsed else 0.0,
+            "bytes_per_detection": _received["bytes"] / _received["detections"] if _received["detections"] else 0.0
+        }
@@ -0,0 +1,208 @@
+import json
+import time
+import uuid
+import struct
+import asyncio
+
+from server.utils.catalog import get_catalog_version
+from server.utils.detections import decode_batch, record_batch, ZDICT_ENCODING
+
+# Cabeçalho de cada quadro: tipo, flags, sequência e tamanho do payload
+FRAME_HEADER = struct.Struct("<BBII")
+
+# Quadros do cliente para o servidor
+FRAME_BATCH = 1          # Lote NDJSON de detecções (seq = número do lote)
+
+# Quadros do servidor para o cliente
+FRAME_HELLO = 16         # Início da sessão (payload JSON com créditos e versão do catálogo)
+FRAME_CREDIT = 17        # Novos créditos (seq = quantidade de lotes liberados)
+FRAME_ACK = 18           # Lote processado (seq = número do lote)
+FRAME_CATALOG = 19       # Nova versão dos catálogos (payload JSON)
+FRAME_HEARTBEAT = 20     # Mantém a conexão ativa
+
+# Flags dos quadros
+FLAG_GZIP = 1            # Payload do lote compactado com gzip
+FLAG_REJECTED = 2        # Lote recusado (ACK de um lote inválido)
+FLAG_ZDICT = 4           # Payload compactado com zlib e dicionário (id no início do payload)
+FLAG_UNKNOWN_DICT = 8    # Lote recusado por usar um dicionário ainda não enviado
+
+# Créditos iniciais de cada sessão: lotes que o cliente pode enviar sem esperar confirmação
+INITIAL_CREDITS = 16
+
+# Tamanho máximo do payload de um quadro
+MAX_FRAME_BYTES = 16 * 1024 * 1024
+
+# Intervalo, em segundos, entre heartbeats e entre verificações da versão dos catálogos
+HEARTBEAT_INTERVAL = 5.0
+CATALOG_CHECK_INTERVAL = 30.0
+
+# Tempo, em segundos, sem nenhuma das conexões até uma sessão ser descartada
+SESSION_TIMEOUT = 120.0
+
+# Sessões ativas: id -> StreamSession
+_sessions = {}
+
+def encode_frame(kind, seq=0, payload=b"", flags=0):
+    """
+    Monta um quadro binário.
+    """
+    return FRAME_HEADER.pack(kind, flags, seq, len(payload)) + payload
+
+class FrameDecoder:
+    """
+    Separa os quadros de um fluxo de bytes recebido em pedaços arbitrários.
+    """
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def feed(self, data):
+        """
+        Acrescenta bytes recebidos e retorna os quadros completos: (tipo, flags, seq, payload).
+        """
+        self._buffer += data
+        frames = []
+        offset = 0
+        size = len(self._buffer)
+        while offset + FRAME_HEADER.size <= size:
+            kind, flags, seq, length = FRAME_HEADER.unpack_from(self._buffer, offset)
+            if length > MAX_FRAME_BYTES:
+                raise ValueError(f"Quadro de {length} bytes excede o tamanho máximo")
+            end = offset + FRAME_HEADER.size + length
+            if end > size:
+                break
+            frames.append((kind, flags, seq, bytes(self._buffer[offset + FRAME_HEADER.size:end])))
+            offset = end
+        del self._buffer[:offset]
+        return frames
+
+class StreamSession:
+    """
+    Sessão de streaming de um cliente: os quadros para o cliente ficam em uma fila
+    consumida pela conexão de eventos; os lotes chegam pela conexão de lotes.
+    """
+    def __init__(self, prefix, credits):
+        self.id = uuid.uuid4().hex
+        self.prefix = prefix or self.id
+        self.credits = credits
+        self.catalog_version = get_catalog_version()
+        self.outbox = asyncio.Queue()
+        self.batches = 0
+        self.detections = 0
+        self.rejected = 0
+        self.created_at = time.time()
+        self.last_seen = time.monotonic()
+
+    def push(self, frame):
+        self.outbox.put_nowait(frame)
+
+    def summary(self):
+        return {
+            "session": self.id,
+            "prefix": self.prefix,
+            "credits": self.credits,
+            "catalog_version": self.catalog_version,
+            "batches": self.batches,
+            "detections": self.detections,
+            "rejected": self.rejected,
+            "created_at": self.created_at
+        }
+
+def create_session(prefix=None, credits=INITIAL_CREDITS):
+    """
+    Cria uma sessão de streaming. O prefixo identifica o cliente entre reconexões:
+    os lotes são contabilizados como "<prefixo>-<seq>", então lotes reenviados após
+    uma reconexão não são contados duas vezes.
+    """
+    expire_sessions()
+    session = StreamSession(prefix, credits)
+    _sessions[session.id] = session
+    return session
+
+def get_session(session_id):
+    """
+    Retorna a sessão ou None se ela não existir.
+    """
+    session = _sessions.get(session_id)
+    if session is not None:
+        session.last_seen = time.monotonic()
+    return session
+
+def close_session(session_id):
+    """
+    Encerra uma sessão.
+    """
+    return _sessions.pop(session_id, None) is not None
+
+def expire_sessions():
+    """
+    Descarta as sessões sem atividade há mais de SESSION_TIMEOUT segundos.
+    """
+    now = time.monotonic()
+    for session_id in [key for key, session in _sessions.items() if now - session.last_seen > SESSION_TIMEOUT]:
+        del _sessions[session_id]
+
+async def session_events(session):
+    """
+    Gera os quadros enviados ao cliente: HELLO, depois ACKs, créditos, novas versões
+    dos catálogos e heartbeats. Quadros pendentes são agrupados em uma única escrita.
+    """
+    yield encode_frame(FRAME_HELLO, payload=json.dumps(session.summary()).encode())
+
+    last_check = time.monotonic()
+    while session.id in _sessions:
+        try:
+            frames = [await asyncio.wait_for(session.outbox.get(), timeout=HEARTBEAT_INTERVAL)]
+        except asyncio.TimeoutError:
+            frames = [encode_frame(FRAME_HEARTBEAT)]
+        while not session.outbox.empty():
+            frames.append(session.outbox.get_nowait())
+        session.last_seen = time.monotonic()
+
+        # Avisa o cliente quando os dumps mudam para que ele baixe os catálogos novamente
+        if session.last_seen - last_check >= CATALOG_CHECK_INTERVAL:
+            last_check = session.last_seen
+            version = get_catalog_version()
+            if version != session.catalog_version:
+                session.catalog_version = version
+                frames.append(encode_frame(FRAME_CATALOG, payload=json.dumps({"version": version}).encode()))
+
+        yield b"".join(frames)
+
+async def consume_batches(session, chunks):
+    """
+    Processa os lotes recebidos pela conexão de lotes. Cada lote processado gera um ACK
+    e devolve um crédito ao cliente, o que limita os lotes em trânsito ao que o servidor
+    já consegue processar.
+    Retorna {"batches", "detections"} da conexão ou {"message": ...} em caso de quadro inválido.
+    """
+    decoder = FrameDecoder()
+    batches = detections = 0
+    try:
+        async for chunk in chunks:
+            session.last_seen = time.monotonic()
+            for kind, flags, seq, payload in decoder.feed(chunk):
+                if kind != FRAME_BATCH:
+                    continue
+
+                if flags & FLAG_ZDICT:
+                    encoding = ZDICT_ENCODING
+                else:
+                    encoding = "gzip" if flags & FLAG_GZIP else None
+                result = decode_batch(payload, encoding)
+                if isinstance(result, dict) and "dictionary" in result:
+                    session.push(encode_frame(FRAME_ACK, seq, flags=FLAG_REJECTED | FLAG_UNKNOWN_DICT))
+                elif isinstance(result, dict) and "message" in result:
+                    session.rejected += 1
+                    session.push(encode_frame(FRAME_ACK, seq, flags=FLAG_REJECTED))
+                else:
+                    record_batch(f"{session.prefix}-{seq}", result, len(payload))
+                    session.push(encode_frame(FRAME_ACK, seq))
+                    batches += 1
+                    detections += len(result)
+                session.push(encode_frame(FRAME_CREDIT, 1))
+    except ValueError as e:
+        return {"message": str(e)}
+
+    session.batches += batches
+    session.detections += detections
+    return {"batches": batches, "detections": detections}